@@ -0,0 +1,71 @@
+"""
+Alembic environment.
+
+Migrations run against settings.DATABASE_URL (or a connection passed in
+through config.attributes["connection"], as the tests do).
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401  - registers every model on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Created by raw DDL in 0009_task_search (FTS5 shadow tables on SQLite), not by models
+UNMANAGED_TABLE_PREFIXES = ("task_search",)
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    return not (type_ == "table" and name.startswith(UNMANAGED_TABLE_PREFIXES))
+
+
+def _configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        # SQLite cannot ALTER most things in place; batch mode rebuilds tables instead
+        render_as_batch=True,
+        compare_type=True,
+        include_name=_include_name,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of running it (alembic upgrade --sql)."""
+    _configure(url=settings.DATABASE_URL, literal_binds=True, dialect_opts={"paramstyle": "named"})
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations on a live connection."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
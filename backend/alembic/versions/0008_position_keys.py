@@ -0,0 +1,108 @@
+"""position keys
+
+Replaces groups.order with a fractional position key (app.core.ranking) and
+gives tasks one within their group. Existing lists keep their order (groups
+by order then id, a group's tasks oldest first) and get consecutive keys.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 05:40:23.843067
+
+"""
+from typing import Sequence, Union
+
+from itertools import groupby
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_POSITION = sa.String(length=255).with_variant(sa.String(length=255, collation='C'), 'postgresql')
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _keys(count: int) -> list:
+    """The first `count` integer keys of app.core.ranking: a0 ... az, b00 ... bzz, c000 ..."""
+    keys = []
+    for n in range(count):
+        length, first = 1, 0
+        while n - first >= 36 ** length:
+            first += 36 ** length
+            length += 1
+        value, digits = n - first, []
+        for _ in range(length):
+            value, digit = divmod(value, 36)
+            digits.append(_DIGITS[digit])
+        keys.append(chr(ord("a") + length - 1) + "".join(reversed(digits)))
+    return keys
+
+
+def _backfill(table: str, scope: str, order: str) -> None:
+    """Number each list's rows (sharing `scope`, sorted by `order`) with consecutive keys."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        f'SELECT id, {scope} FROM {table} WHERE {scope} IS NOT NULL ORDER BY {scope}, {order}, id'
+    )).all()
+    positions = []
+    for _, members in groupby(rows, key=lambda row: row[1]):
+        members = list(members)
+        positions += [{"row_id": row[0], "position": key} for row, key in zip(members, _keys(len(members)))]
+    if positions:
+        bind.execute(sa.text(f"UPDATE {table} SET position = :position WHERE id = :row_id"), positions)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('position', _POSITION, nullable=True))
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('position', _POSITION, nullable=True))
+
+    _backfill("groups", "board_id", '"order"')
+    _backfill("tasks", "group_id", "created_at")
+
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.alter_column('position', existing_type=_POSITION, nullable=False)
+        batch_op.drop_index(batch_op.f('ix_groups_board_id'))
+        batch_op.create_index('ix_groups_board_id_position', ['board_id', 'position'], unique=False)
+        batch_op.drop_column('order')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tasks_group_id'))
+        batch_op.create_index('ix_tasks_group_id_position', ['group_id', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_group_id_position')
+        batch_op.create_index(batch_op.f('ix_tasks_group_id'), ['group_id'], unique=False)
+        batch_op.drop_column('position')
+
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('order', sa.INTEGER(), server_default='0', nullable=False))
+
+    # Back to 0, 1, 2, ... in position order within each board
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, board_id FROM groups ORDER BY board_id, position, id")).all()
+    orders = [
+        {"row_id": row[0], "order": n}
+        for _, members in groupby(rows, key=lambda row: row[1]) for n, row in enumerate(members)
+    ]
+    if orders:
+        bind.execute(sa.text('UPDATE groups SET "order" = :order WHERE id = :row_id'), orders)
+
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.drop_index('ix_groups_board_id_position')
+        batch_op.create_index(batch_op.f('ix_groups_board_id'), ['board_id'], unique=False)
+        batch_op.drop_column('position')
+
+    # ### end Alembic commands ###
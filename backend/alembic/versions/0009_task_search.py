@@ -0,0 +1,151 @@
+"""task search
+
+Full-text index of tasks for GET /tasks/search (app.core.search): each
+task's name, description and subtask names, kept in sync by triggers so that
+Core bulk writes are covered as well as the ORM.
+
+- SQLite: an FTS5 table whose rowid is the task ID, with the owner as a
+  "~<id>" token so a user's matches are found within the index. "~" is a
+  token character so that no search word (letters and digits) can match an
+  owner token; it also keeps e.g. "~5" together in task text.
+- PostgreSQL: a task_search table with a weighted tsvector (name A, subtask
+  names B, description C) under a GIN index.
+
+On SQLite, a later batch migration that rebuilds tasks or subtasks drops
+their triggers and has to create them again.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 05:48:03.990695
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_SQLITE_SUBTASK_NAMES = "coalesce((SELECT group_concat(name, ' ') FROM subtasks WHERE task_id = {}), '')"
+
+_SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE task_search USING fts5("
+    "owner, name, description, subtasks, "
+    "tokenize = \"unicode61 remove_diacritics 2 tokenchars '~'\", prefix = '2 3')",
+    "CREATE TRIGGER task_search_task_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO task_search (rowid, owner, name, description, subtasks) "
+    "VALUES (new.id, '~' || new.user_id, new.name, coalesce(new.description, ''), ''); END",
+    "CREATE TRIGGER task_search_task_update AFTER UPDATE OF name, description, user_id ON tasks BEGIN "
+    "UPDATE task_search SET owner = '~' || new.user_id, name = new.name, "
+    "description = coalesce(new.description, '') WHERE rowid = new.id; END",
+    "CREATE TRIGGER task_search_task_delete AFTER DELETE ON tasks BEGIN "
+    "DELETE FROM task_search WHERE rowid = old.id; END",
+    "CREATE TRIGGER task_search_subtask_insert AFTER INSERT ON subtasks BEGIN "
+    f"UPDATE task_search SET subtasks = {_SQLITE_SUBTASK_NAMES.format('new.task_id')} "
+    "WHERE rowid = new.task_id; END",
+    "CREATE TRIGGER task_search_subtask_update AFTER UPDATE OF name, task_id ON subtasks BEGIN "
+    f"UPDATE task_search SET subtasks = {_SQLITE_SUBTASK_NAMES.format('old.task_id')} "
+    "WHERE rowid = old.task_id; "
+    f"UPDATE task_search SET subtasks = {_SQLITE_SUBTASK_NAMES.format('new.task_id')} "
+    "WHERE rowid = new.task_id; END",
+    "CREATE TRIGGER task_search_subtask_delete AFTER DELETE ON subtasks BEGIN "
+    f"UPDATE task_search SET subtasks = {_SQLITE_SUBTASK_NAMES.format('old.task_id')} "
+    "WHERE rowid = old.task_id; END",
+    "INSERT INTO task_search (rowid, owner, name, description, subtasks) "
+    "SELECT id, '~' || user_id, name, coalesce(description, ''), "
+    f"{_SQLITE_SUBTASK_NAMES.format('tasks.id')} FROM tasks",
+]
+
+_SQLITE_DOWNGRADE = [
+    *(
+        f"DROP TRIGGER task_search_{name}"
+        for name in ("task_insert", "task_update", "task_delete", "subtask_insert", "subtask_update", "subtask_delete")
+    ),
+    "DROP TABLE task_search",
+]
+
+_POSTGRES_UPGRADE = [
+    "CREATE TABLE task_search ("
+    "task_id INTEGER PRIMARY KEY REFERENCES tasks (id) ON DELETE CASCADE, "
+    "user_id INTEGER NOT NULL, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX ix_task_search_document ON task_search USING GIN (document)",
+    "CREATE INDEX ix_task_search_user_id ON task_search (user_id)",
+    """
+    CREATE FUNCTION task_search_refresh(target INTEGER) RETURNS VOID AS $$
+        INSERT INTO task_search (task_id, user_id, document)
+        SELECT tasks.id, tasks.user_id,
+            setweight(to_tsvector('simple', tasks.name), 'A')
+            || setweight(to_tsvector('simple', coalesce(
+                (SELECT string_agg(subtasks.name, ' ') FROM subtasks WHERE subtasks.task_id = tasks.id), ''
+            )), 'B')
+            || setweight(to_tsvector('simple', coalesce(tasks.description, '')), 'C')
+        FROM tasks WHERE tasks.id = target
+        ON CONFLICT (task_id) DO UPDATE SET user_id = excluded.user_id, document = excluded.document
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE FUNCTION task_search_on_task() RETURNS trigger AS $$
+    BEGIN
+        PERFORM task_search_refresh(NEW.id);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE FUNCTION task_search_on_subtask() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM task_search_refresh(OLD.task_id);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM task_search_refresh(NEW.task_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE TRIGGER task_search_on_task AFTER INSERT OR UPDATE OF name, description, user_id ON tasks "
+    "FOR EACH ROW EXECUTE FUNCTION task_search_on_task()",
+    "CREATE TRIGGER task_search_on_subtask AFTER INSERT OR UPDATE OF name, task_id OR DELETE ON subtasks "
+    "FOR EACH ROW EXECUTE FUNCTION task_search_on_subtask()",
+    "SELECT task_search_refresh(id) FROM tasks",
+]
+
+_POSTGRES_DOWNGRADE = [
+    "DROP TRIGGER task_search_on_subtask ON subtasks",
+    "DROP TRIGGER task_search_on_task ON tasks",
+    "DROP FUNCTION task_search_on_subtask()",
+    "DROP FUNCTION task_search_on_task()",
+    "DROP FUNCTION task_search_refresh(INTEGER)",
+    "DROP TABLE task_search",
+]
+
+
+def _run(statements) -> None:
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        _run(_SQLITE_UPGRADE)
+    elif dialect == "postgresql":
+        _run(_POSTGRES_UPGRADE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        _run(_SQLITE_DOWNGRADE)
+    elif dialect == "postgresql":
+        _run(_POSTGRES_DOWNGRADE)
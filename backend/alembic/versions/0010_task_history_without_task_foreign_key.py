@@ -0,0 +1,48 @@
+"""task history without task foreign key
+
+task_history rows are written for every task event, deletion included
+(app.core.history), and are kept after the task is gone, so task_id no longer
+references tasks.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 06:02:50.722684
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The baseline created the constraint unnamed: PostgreSQL named it itself,
+# and batch mode on SQLite can find it by this convention
+_SQLITE_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _constraint_name() -> str:
+    if op.get_bind().dialect.name == "sqlite":
+        return "fk_task_history_task_id_tasks"
+    return "task_history_task_id_fkey"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    name = _constraint_name()
+    with op.batch_alter_table('task_history', schema=None, naming_convention=_SQLITE_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # History of deleted tasks cannot reference them
+    op.execute("DELETE FROM task_history WHERE task_id NOT IN (SELECT id FROM tasks)")
+    name = _constraint_name()
+    with op.batch_alter_table('task_history', schema=None, naming_convention=_SQLITE_CONVENTION) as batch_op:
+        batch_op.create_foreign_key(name, 'tasks', ['task_id'], ['id'])
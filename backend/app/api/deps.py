@@ -1,55 +1,221 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+import hmac
+from typing import AsyncGenerator, Generator, Optional
+from fastapi import Depends, HTTPException, Request, Response, WebSocket, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import verify_token
+from app.core.config import settings
+from app.core.database import get_db, get_async_db
+from app.core.principals import Principal, principal_cache
+from app.core.replicas import PIN_COOKIE, PIN_HEADER, replica_router, SESSION_RESPONSE_KEY
+from app.core.security import decode_token
 from app.models.user import User
 
 # OAuth2 scheme for JWT tokens
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Bearer credentials of a metrics scraper (settings.METRICS_TOKEN) or a superuser
+metrics_scheme = HTTPBearer(auto_error=False)
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    """
-    Dependency to get the current authenticated user from JWT token.
-    
-    Raises:
-        HTTPException: If token is invalid or user not found
-    """
-    credentials_exception = HTTPException(
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _ensure_active(principal: Optional[Principal]) -> Principal:
+    """Reject missing or deactivated users."""
+    if principal is None:
+        raise _credentials_exception()
     
-    # Verify token and get user ID
-    user_id = verify_token(token)
-    if user_id is None:
-        raise credentials_exception
-    
-    # Get user from database
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
-        raise credentials_exception
-    
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
     
-    return user
+    return principal
+
+
+def _claims_principal(token: str) -> tuple[int, Optional[Principal]]:
+    """User id of an access token, and its Principal if the token carries claims."""
+    payload = decode_token(token)
+    if payload is None:
+        raise _credentials_exception()
+    return int(payload["sub"]), Principal.from_claims(payload)
+
+
+def _claims_rejected(principal: Optional[Principal]) -> bool:
+    # Inactive per the token itself: no need to look further
+    return principal is not None and not principal.is_active
+
+
+def _load_profile(db: Session, user_id: int) -> Optional[Principal]:
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is not None:
+            principal = Principal.from_user(user)
+            principal_cache.put(principal)
+    return principal
+
+
+async def _async_load_profile(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is not None:
+            principal = Principal.from_user(user)
+            principal_cache.put(principal)
+    return principal
+
+
+def get_current_user(
+    response: Response,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Dependency to get the current authenticated user from JWT token.
+    
+    Authorizes from the token's claims, checked against the cached user
+    profile so that deactivation and password resets revoke the token
+    (Principal.checked_against). Tokens issued without claims use the
+    profile alone. The users table is only queried on a cache miss.
+    
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    user_id, principal = _claims_principal(token)
+    if not _claims_rejected(principal):
+        stored = _load_profile(db, user_id)
+        principal = principal.checked_against(stored) if principal is not None else stored
+    principal = _ensure_active(principal)
+    db.info[SESSION_RESPONSE_KEY] = response
+    return principal
 
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Dependency to get current active user.
     Wrapper around get_current_user for explicit active check.
     """
     return current_user
+
+
+def require_metrics_access(
+    response: Response,
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_scheme)
+) -> None:
+    """
+    Dependency guarding /metrics: the configured METRICS_TOKEN, or else the
+    access token of a superuser.
+    """
+    if credentials is None:
+        raise _credentials_exception()
+    token = credentials.credentials
+    if settings.METRICS_TOKEN and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return
+    if not get_current_user(response, db, token).is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+
+def get_current_user_profile(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
+    """
+    Dependency for endpoints that read profile fields (email, name, ...).
+    
+    Principals built from token claims only carry ids and roles; this loads
+    the full snapshot through the principal cache.
+    """
+    if current_user.has_profile:
+        return current_user
+    return _ensure_active(_load_profile(db, current_user.id))
+
+
+async def get_async_current_user(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Async counterpart of get_current_user for endpoints using get_async_db.
+    """
+    user_id, principal = _claims_principal(token)
+    if not _claims_rejected(principal):
+        stored = await _async_load_profile(db, user_id)
+        principal = principal.checked_against(stored) if principal is not None else stored
+    principal = _ensure_active(principal)
+    db.info[SESSION_RESPONSE_KEY] = response
+    return principal
+
+
+async def get_async_current_active_user(
+    current_user: Principal = Depends(get_async_current_user)
+) -> Principal:
+    """Async counterpart of get_current_active_user."""
+    return current_user
+
+
+async def authenticate_websocket(websocket: WebSocket, db: AsyncSession) -> Optional[Principal]:
+    """
+    Active user of a WebSocket's access token, or None.
+    
+    Browsers cannot set headers on WebSocket requests, so the token is read
+    from the `token` query parameter, or else from an Authorization header.
+    """
+    token = websocket.query_params.get("token")
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    if not token:
+        return None
+    try:
+        user_id, principal = _claims_principal(token)
+        if not _claims_rejected(principal):
+            stored = await _async_load_profile(db, user_id)
+            principal = principal.checked_against(stored) if principal is not None else stored
+        return _ensure_active(principal)
+    except HTTPException:
+        return None
+
+
+def _read_pin(request: Request) -> Optional[str]:
+    return request.headers.get(PIN_HEADER) or request.cookies.get(PIN_COOKIE)
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency for read-only endpoints: a session on a read replica.
+    
+    Falls back to the primary when no replica is configured or healthy, and
+    for clients that wrote within the read-your-writes window (the pin they
+    send back, see app.core.replicas).
+    """
+    db = replica_router.read_session(_read_pin(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of get_read_db."""
+    db = await replica_router.async_read_session(_read_pin(request))
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -3,24 +3,33 @@ Enhanced authentication endpoints with email verification, password reset, and O
 """
 
 from datetime import timedelta, datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from authlib.integrations.starlette_client import OAuth
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.hashing import password_hasher
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    REFRESH_TOKEN_TYPE,
+    build_user_claims,
     create_access_token,
+    create_refresh_token,
     create_verification_token,
     create_reset_token,
+    decode_token,
+    password_version,
 )
 from app.core.config import settings
-from app.core.email import send_verification_email, send_password_reset_email
+from app.core.email import queue_verification_email, queue_password_reset_email
+from app.core.email_sender import email_sender
 from app.models.user import User, AuthProvider
+from app.models.team import TeamMember
+from app.core.principals import Principal, principal_cache
 from app.schemas.user import (
     UserCreate,
     UserResponse,
@@ -29,31 +38,66 @@ from app.schemas.user import (
     ResendVerificationRequest,
     PasswordResetRequest,
     PasswordResetConfirm,
+    RefreshTokenRequest,
 )
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user_profile
 
 router = APIRouter()
 
-# OAuth setup
-oauth = OAuth()
 
-if settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET:
-    oauth.register(
-        name='google',
-        client_id=settings.GOOGLE_CLIENT_ID,
-        client_secret=settings.GOOGLE_CLIENT_SECRET,
-        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-        client_kwargs={'scope': 'openid email profile'},
+@lru_cache()
+def get_oauth():
+    """
+    OAuth client registry, built on the first OAuth request.
+    
+    authlib (and its HTTP client stack) is imported here rather than at module
+    level so that workers which never see an OAuth login start faster.
+    """
+    from authlib.integrations.starlette_client import OAuth
+    
+    oauth = OAuth()
+    
+    if settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET:
+        oauth.register(
+            name='google',
+            client_id=settings.GOOGLE_CLIENT_ID,
+            client_secret=settings.GOOGLE_CLIENT_SECRET,
+            server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+            client_kwargs={'scope': 'openid email profile'},
+        )
+    
+    if settings.APPLE_CLIENT_ID:
+        # Apple OAuth configuration would go here
+        # More complex setup required for Apple
+        pass
+    
+    return oauth
+
+
+def _token_response(user: User, team_roles: Dict[int, str]) -> dict:
+    """Short-lived access token carrying authorization claims, plus a refresh token."""
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data=build_user_claims(user, team_roles),
+        expires_delta=access_token_expires
     )
+    return {
+        "access_token": access_token,
+        "refresh_token": create_refresh_token(user),
+        "token_type": "bearer",
+        "expires_in": int(access_token_expires.total_seconds()),
+    }
 
-if settings.APPLE_CLIENT_ID:
-    # Apple OAuth configuration would go here
-    # More complex setup required for Apple
-    pass
+
+async def _issue_tokens(db: AsyncSession, user: User) -> dict:
+    result = await db.execute(
+        select(TeamMember.team_id, TeamMember.role).where(TeamMember.user_id == user.id)
+    )
+    return _token_response(user, dict(result.all()))
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user account with email verification.
     
@@ -62,10 +106,10 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     - **username**: Optional unique username
     - **full_name**: Optional full name
     
-    Sends verification email after successful registration.
+    Queues the verification email after successful registration.
     """
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -74,7 +118,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     
     # Check if username already exists (if provided)
     if user_data.username:
-        existing_username = db.query(User).filter(User.username == user_data.username).first()
+        existing_username = await db.scalar(select(User.id).where(User.username == user_data.username))
         if existing_username:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -93,7 +137,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     token_expiry = datetime.utcnow() + timedelta(hours=settings.EMAIL_VERIFICATION_EXPIRE_HOURS)
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     new_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -108,22 +152,18 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    # Send verification email (async, don't wait)
-    try:
-        await send_verification_email(new_user.email, verification_token, new_user.full_name)
-    except Exception as e:
-        # Log error but don't fail registration
-        print(f"Failed to send verification email: {e}")
+    # Queued in the same transaction; the background sender delivers it
+    queue_verification_email(db, new_user.email, verification_token, new_user.full_name)
+    await db.commit()
+    await db.refresh(new_user)
+    email_sender.wake()
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """
@@ -136,11 +176,11 @@ def login(
     Returns JWT access token for authentication.
     """
     # Try to find user by email or username
-    user = db.query(User).filter(
-        (User.email == form_data.username) | (User.username == form_data.username)
-    ).first()
+    user = await db.scalar(select(User).where(
+        or_(User.email == form_data.username, User.username == form_data.username)
+    ))
     
-    if not user or not user.hashed_password or not verify_password(form_data.password, user.hashed_password):
+    if not user or not user.hashed_password or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email/username or password",
@@ -160,18 +200,11 @@ def login(
     #         detail="Please verify your email address before logging in"
     #     )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    return await _issue_tokens(db, user)
 
 
 @router.post("/login/json", response_model=Token)
-def login_json(user_data: dict, db: Session = Depends(get_db)):
+async def login_json(user_data: dict, db: AsyncSession = Depends(get_async_db)):
     """
     Alternative login endpoint that accepts JSON instead of form data.
     
@@ -187,11 +220,11 @@ def login_json(user_data: dict, db: Session = Depends(get_db)):
             detail="Email/username and password required"
         )
     
-    user = db.query(User).filter(
-        (User.email == email_or_username) | (User.username == email_or_username)
-    ).first()
+    user = await db.scalar(select(User).where(
+        or_(User.email == email_or_username, User.username == email_or_username)
+    ))
     
-    if not user or not user.hashed_password or not verify_password(password, user.hashed_password):
+    if not user or not user.hashed_password or not await password_hasher.verify(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email/username or password"
@@ -203,17 +236,44 @@ def login_json(user_data: dict, db: Session = Depends(get_db)):
             detail="Your account has been deactivated"
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
+    return await _issue_tokens(db, user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_tokens(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Exchange a refresh token for a new access token (and a new refresh token).
+    
+    Access tokens are short-lived and carry the user's status and team roles,
+    so refreshing is also how role changes reach the client's token.
+    - **refresh_token**: Refresh token from login or a previous refresh
+    """
+    invalid_token = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    payload = decode_token(request.refresh_token, REFRESH_TOKEN_TYPE)
+    if payload is None:
+        raise invalid_token
+    
+    user = await db.get(User, int(payload["sub"]))
+    # A password change revokes refresh tokens issued before it
+    if not user or payload.get("pv") != password_version(user.hashed_password):
+        raise invalid_token
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Your account has been deactivated"
+        )
+    
+    return await _issue_tokens(db, user)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: Principal = Depends(get_current_user_profile)):
     """
     Get current authenticated user profile.
     
@@ -253,12 +313,13 @@ def verify_email(request: EmailVerifyRequest, db: Session = Depends(get_db)):
     user.verification_token_expiry = None
     
     db.commit()
+    principal_cache.invalidate(user.id)
     
     return {"message": "Email verified successfully! You can now log in."}
 
 
 @router.post("/resend-verification", response_model=dict)
-async def resend_verification(request: ResendVerificationRequest, db: Session = Depends(get_db)):
+def resend_verification(request: ResendVerificationRequest, db: Session = Depends(get_db)):
     """
     Resend verification email to user.
     
@@ -282,20 +343,16 @@ async def resend_verification(request: ResendVerificationRequest, db: Session =
     
     user.email_verification_token = verification_token
     user.verification_token_expiry = token_expiry
+    queue_verification_email(db, user.email, verification_token, user.full_name)
     
     db.commit()
-    
-    # Send verification email
-    try:
-        await send_verification_email(user.email, verification_token, user.full_name)
-    except Exception as e:
-        print(f"Failed to send verification email: {e}")
+    email_sender.wake()
     
     return {"message": "If that email is registered, a verification email has been sent"}
 
 
 @router.post("/forgot-password", response_model=dict)
-async def forgot_password(request: PasswordResetRequest, db: Session = Depends(get_db)):
+def forgot_password(request: PasswordResetRequest, db: Session = Depends(get_db)):
     """
     Request password reset email.
     
@@ -317,27 +374,23 @@ async def forgot_password(request: PasswordResetRequest, db: Session = Depends(g
     
     user.reset_token = reset_token
     user.reset_token_expiry = token_expiry
+    queue_password_reset_email(db, user.email, reset_token, user.full_name)
     
     db.commit()
-    
-    # Send password reset email
-    try:
-        await send_password_reset_email(user.email, reset_token, user.full_name)
-    except Exception as e:
-        print(f"Failed to send password reset email: {e}")
+    email_sender.wake()
     
     return {"message": "If that email is registered, a password reset link has been sent"}
 
 
 @router.post("/reset-password", response_model=dict)
-def reset_password(request: PasswordResetConfirm, db: Session = Depends(get_db)):
+async def reset_password(request: PasswordResetConfirm, db: AsyncSession = Depends(get_async_db)):
     """
     Reset password using token from email.
     
     - **token**: Reset token from email
     - **new_password**: New password (min 6 characters)
     """
-    user = db.query(User).filter(User.reset_token == request.token).first()
+    user = await db.scalar(select(User).where(User.reset_token == request.token))
     
     if not user:
         raise HTTPException(
@@ -360,11 +413,12 @@ def reset_password(request: PasswordResetConfirm, db: Session = Depends(get_db))
         )
     
     # Update password
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await password_hasher.hash(request.new_password)
     user.reset_token = None
     user.reset_token_expiry = None
     
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.id)
     
     return {"message": "Password reset successfully! You can now log in with your new password."}
 
@@ -384,7 +438,7 @@ async def google_login(request: Request):
         )
     
     redirect_uri = f"{settings.FRONTEND_URL}/auth/google/callback"
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 
 @router.get("/google/callback")
@@ -400,7 +454,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
         )
     
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         user_info = token.get('userinfo')
         
         if not user_info:
@@ -439,17 +493,20 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
                 user.oauth_id = oauth_id
             user.email_verified = True
             db.commit()
+            principal_cache.invalidate(user.id)
         
-        # Create access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": str(user.id)},
-            expires_delta=access_token_expires
+        # Create access and refresh tokens
+        team_roles = dict(
+            db.query(TeamMember.team_id, TeamMember.role).filter(TeamMember.user_id == user.id).all()
         )
+        tokens = _token_response(user, team_roles)
         
-        # Redirect to frontend with token
+        # Redirect to frontend with tokens
         return RedirectResponse(
-            url=f"{settings.FRONTEND_URL}/auth/oauth-success?token={access_token}"
+            url=(
+                f"{settings.FRONTEND_URL}/auth/oauth-success?token={tokens['access_token']}"
+                f"&refresh_token={tokens['refresh_token']}"
+            )
         )
         
     except Exception as e:
@@ -1,58 +1,188 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.core.database import get_async_db
+from app.api.deps import get_async_current_active_user, get_async_read_db
+from app.core.changes import CACHE_CONTROL, check_not_modified, etag_headers, etag_matches, not_modified
+from app.core.pagination import Keyset
+from app.core.principals import Principal
+from app.core.ranking import needs_rebalance, place_between, rebalance
+from app.core.responses import encode, list_response, row_serializer, wants_msgpack
+from app.core.snapshots import board_snapshots, snapshot_etag
 from app.models.board import Board, Group
-from app.schemas.board import BoardCreate, BoardUpdate, BoardResponse, GroupCreate, GroupUpdate, GroupResponse
+from app.models.subscription import Subscription
+from app.models.task import Task
+from app.schemas.board import (
+    BoardCreate, BoardUpdate, BoardResponse, BoardSnapshot, GroupCreate, GroupUpdate, GroupMove, GroupResponse
+)
 
 router = APIRouter()
 
+# Everything deleting a task cascades to. Loaded up front, deleting a board or
+# group takes one SELECT per relationship instead of three per task.
+_TASK_CASCADE = (selectinload(Task.subtasks), selectinload(Task.focus_sessions))
+
+# Newest first; served by ix_boards_user_id_created_at_id
+_pages = Keyset("boards", Board.created_at, Board.id)
+
+
+async def _get_user_board(db: AsyncSession, board_id: int, user_id: int, cascade: bool = False) -> Board:
+    """Load a board owned by the user with its groups (and, with cascade, their tasks), or raise 404."""
+    groups = selectinload(Board.groups)
+    if cascade:
+        groups = groups.selectinload(Group.tasks).options(*_TASK_CASCADE)
+    result = await db.execute(
+        select(Board)
+        .options(groups)
+        .where(Board.id == board_id, Board.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    board = result.scalar_one_or_none()
+    
+    if not board:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Board not found"
+        )
+    
+    return board
+
+
+async def _get_user_group(db: AsyncSession, group_id: int, user_id: int, cascade: bool = False) -> Group:
+    """Load a group whose board is owned by the user (with, for cascade, its tasks), or raise 404."""
+    query = select(Group).join(Board).where(
+        Group.id == group_id,
+        Board.user_id == user_id
+    )
+    if cascade:
+        query = query.options(selectinload(Group.tasks).options(*_TASK_CASCADE))
+    result = await db.execute(query)
+    group = result.scalar_one_or_none()
+    
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Group not found"
+        )
+    
+    return group
+
+
+async def _position_at(db: AsyncSession, board_id: int, group_id: Optional[int], order: int) -> str:
+    """Position putting a group at index `order` of its board (the deprecated `order` field)."""
+    query = select(Group.id).where(Group.board_id == board_id).order_by(Group.position, Group.id)
+    if group_id is not None:
+        query = query.where(Group.id != group_id)
+    others = (await db.scalars(query)).all()
+    order = min(order, len(others))
+    after = others[order - 1] if order > 0 else None
+    before = others[order] if order < len(others) else None
+    return await place_between(db, Group, board_id, group_id, after, before)
+
 
 # --- Board endpoints ---
 
 @router.get("/", response_model=List[BoardResponse])
-def get_boards(
+async def get_boards(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
-    """Get all boards for the current user."""
-    boards = db.query(Board).filter(Board.user_id == current_user.id)\
-        .order_by(Board.created_at.desc())\
-        .offset(skip).limit(limit).all()
+    """Get all boards for the current user, newest first, by offset or by cursor."""
+    etag, unchanged = await check_not_modified(db, request, current_user.id)
+    if unchanged:
+        return unchanged
     
-    return boards
+    query = select(Board).options(selectinload(Board.groups)).where(Board.user_id == current_user.id)
+    result = await db.execute(_pages.apply(query, db, cursor=cursor, skip=skip, limit=limit))
+    boards, page_headers = _pages.page(result.scalars().all(), limit)
+    
+    return list_response(request, boards, BoardResponse, headers={**etag_headers(etag), **page_headers})
 
 
 @router.get("/{board_id}", response_model=BoardResponse)
-def get_board(
+async def get_board(
     board_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Get a specific board by ID with all its groups."""
-    board = db.query(Board).filter(
-        Board.id == board_id,
-        Board.user_id == current_user.id
-    ).first()
+    etag, unchanged = await check_not_modified(db, request, current_user.id)
+    if unchanged:
+        return unchanged
     
-    if not board:
+    response.headers.update(etag_headers(etag))
+    return await _get_user_board(db, board_id, current_user.id)
+
+
+@router.get("/{board_id}/snapshot", response_model=BoardSnapshot)
+async def get_board_snapshot(
+    board_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """
+    Get everything needed to render a board in one call: the board, its groups
+    in display order, each group's tasks (in display order) and their subtasks.
+    
+    Takes five queries however large the board is, and only the first one
+    (the board's version) when the client's If-None-Match is current or this
+    worker has the snapshot cached.
+    """
+    version = await db.scalar(
+        select(Board.version).where(Board.id == board_id, Board.user_id == current_user.id)
+    )
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Board not found"
         )
     
-    return board
+    representation = "msgpack" if wants_msgpack(request) else "json"
+    etag = snapshot_etag(board_id, version, representation)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    cached = board_snapshots.get(board_id, representation, version)
+    if cached:
+        body, media_type = cached
+    else:
+        result = await db.execute(
+            select(Board)
+            .options(
+                selectinload(Board.groups)
+                .selectinload(Group.tasks.and_(Task.user_id == current_user.id))
+                .selectinload(Task.subtasks)
+            )
+            .where(Board.id == board_id)
+            .execution_options(populate_existing=True)
+        )
+        board = result.scalar_one()
+        body, media_type = encode(request, row_serializer(BoardSnapshot)(board))
+        # Tagged with the version read up front: if the board changed in
+        # between, the body is newer than its tag and is rebuilt next time
+        board_snapshots.put(board_id, representation, version, body, media_type)
+    
+    return Response(
+        body,
+        media_type=media_type,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept"}
+    )
 
 
 @router.post("/", response_model=BoardResponse, status_code=status.HTTP_201_CREATED)
-def create_board(
+async def create_board(
     board_data: BoardCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Create a new Kanban board.
@@ -61,17 +191,22 @@ def create_board(
     - **description**: Optional description
     """
     # Check subscription limits
-    board_count = db.query(Board).filter(Board.user_id == current_user.id).count()
+    board_count = await db.scalar(
+        select(func.count()).select_from(Board).where(Board.user_id == current_user.id)
+    )
     
     # Free tier limit: 3 boards
     if board_count >= 3:
         # Check if user has active subscription
-        if not current_user.subscription or current_user.subscription.plan_id == "free":
+        plan_id = await db.scalar(
+            select(Subscription.plan_id).where(Subscription.user_id == current_user.id)
+        )
+        if plan_id is None or plan_id == "free":
              raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Free plan is limited to 3 boards. Please upgrade to Pro."
             )
-
+    
     board = Board(
         name=board_data.name,
         description=board_data.description,
@@ -79,72 +214,51 @@ def create_board(
     )
     
     db.add(board)
-    db.commit()
-    db.refresh(board)
+    await db.commit()
     
     # Audit Log
     from app.core.audit import create_audit_log
     create_audit_log(
-        db=db,
         user_id=current_user.id,
         action="BOARD_CREATED",
         target_type="BOARD",
         target_id=board.id,
         details={"name": board.name}
     )
-
-    return board
+    
+    return await _get_user_board(db, board.id, current_user.id)
 
 
 @router.patch("/{board_id}", response_model=BoardResponse)
-def update_board(
+async def update_board(
     board_id: int,
     board_data: BoardUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Update a board."""
-    board = db.query(Board).filter(
-        Board.id == board_id,
-        Board.user_id == current_user.id
-    ).first()
-    
-    if not board:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Board not found"
-        )
+    board = await _get_user_board(db, board_id, current_user.id)
     
     update_data = board_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(board, field, value)
     
-    db.commit()
-    db.refresh(board)
+    await db.commit()
     
-    return board
+    return await _get_user_board(db, board_id, current_user.id)
 
 
 @router.delete("/{board_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_board(
+async def delete_board(
     board_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Delete a board and all its groups and tasks."""
-    board = db.query(Board).filter(
-        Board.id == board_id,
-        Board.user_id == current_user.id
-    ).first()
-    
-    if not board:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Board not found"
-        )
+    board = await _get_user_board(db, board_id, current_user.id, cascade=True)
     
-    db.delete(board)
-    db.commit()
+    await db.delete(board)
+    await db.commit()
     
     return None
 
@@ -152,118 +266,123 @@ def delete_board(
 # --- Group endpoints ---
 
 @router.get("/{board_id}/groups", response_model=List[GroupResponse])
-def get_groups(
+async def get_groups(
     board_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Get all groups (columns) for a board."""
     # Verify board belongs to user
-    board = db.query(Board).filter(
-        Board.id == board_id,
-        Board.user_id == current_user.id
-    ).first()
+    await _get_user_board(db, board_id, current_user.id)
     
-    if not board:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Board not found"
-        )
-    
-    groups = db.query(Group).filter(Group.board_id == board_id)\
-        .order_by(Group.order).all()
+    result = await db.execute(
+        select(Group).where(Group.board_id == board_id).order_by(Group.position, Group.id)
+    )
     
-    return groups
+    return result.scalars().all()
 
 
 @router.post("/{board_id}/groups", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
-def create_group(
+async def create_group(
     board_id: int,
     group_data: GroupCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
-    Create a new group (column) in a board.
+    Create a new group (column) at the end of a board.
     
     - **name**: Group name (e.g., "To Do", "In Progress", "Done")
     - **color**: Hex color code (default: #579bfc)
-    - **order**: Display order
+    - **order**: Deprecated; put the group at this index instead of last
     """
     # Verify board belongs to user
-    board = db.query(Board).filter(
-        Board.id == board_id,
-        Board.user_id == current_user.id
-    ).first()
-    
-    if not board:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Board not found"
-        )
+    await _get_user_board(db, board_id, current_user.id)
     
     group = Group(
         name=group_data.name,
         color=group_data.color,
-        order=group_data.order,
         board_id=board_id
     )
+    if group_data.order is not None:
+        group.position = await _position_at(db, board_id, None, group_data.order)
     
     db.add(group)
-    db.commit()
-    db.refresh(group)
+    await db.commit()
+    await db.refresh(group)
     
     return group
 
 
 @router.patch("/groups/{group_id}", response_model=GroupResponse)
-def update_group(
+async def update_group(
     group_id: int,
     group_data: GroupUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Update a group."""
-    group = db.query(Group).join(Board).filter(
-        Group.id == group_id,
-        Board.user_id == current_user.id
-    ).first()
-    
-    if not group:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Group not found"
-        )
+    group = await _get_user_group(db, group_id, current_user.id)
     
     update_data = group_data.model_dump(exclude_unset=True)
+    order = update_data.pop("order", None)
+    if order is not None:
+        group.position = await _position_at(db, group.board_id, group.id, order)
     for field, value in update_data.items():
         setattr(group, field, value)
     
-    db.commit()
-    db.refresh(group)
+    await db.commit()
+    await db.refresh(group)
     
     return group
 
 
-@router.delete("/groups/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_group(
+@router.post("/groups/{group_id}/move", response_model=GroupResponse)
+async def move_group(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    move: GroupMove,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
-    """Delete a group."""
-    group = db.query(Group).join(Board).filter(
-        Group.id == group_id,
-        Board.user_id == current_user.id
-    ).first()
+    """
+    Move a group to another place on its board.
     
-    if not group:
+    - **after_id**: Put it right after this group
+    - **before_id**: Put it right before this group
+    
+    With neither neighbour the group goes last. Only the moved group's row is
+    written; the other groups keep their positions.
+    """
+    group = await _get_user_group(db, group_id, current_user.id)
+    
+    try:
+        position = await place_between(db, Group, group.board_id, group.id, move.after_id, move.before_id)
+    except ValueError as error:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Group not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid neighbours: {error}"
         )
+    group.position = position
+    await db.commit()
+    await db.refresh(group)
+    
+    if needs_rebalance(position):
+        background_tasks.add_task(rebalance, Group, group.board_id)
+    
+    return group
+
+
+@router.delete("/groups/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_group(
+    group_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """Delete a group and its tasks."""
+    group = await _get_user_group(db, group_id, current_user.id, cascade=True)
     
-    db.delete(group)
-    db.commit()
+    await db.delete(group)
+    await db.commit()
     
     return None
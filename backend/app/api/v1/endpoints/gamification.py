@@ -1,12 +1,14 @@
 from typing import List, Optional
 from datetime import datetime, date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-
-from app.core.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.database import get_async_db
+from app.core.gamification import bump_daily_stats
+from app.api.deps import get_async_current_active_user, get_async_read_db
+from app.core.principals import Principal
 from app.models.gamification import UserStats, Achievement, UserAchievement, FocusSession
 from app.models.task_history import DailyStats
 from app.schemas.gamification import (
@@ -16,7 +18,8 @@ from app.schemas.gamification import (
     FocusSessionCreate,
     FocusSessionUpdate,
     FocusSessionResponse,
-    GamificationSummary
+    GamificationSummary,
+    DailyStatsResponse
 )
 
 router = APIRouter()
@@ -32,32 +35,34 @@ def xp_to_next_level(current_level: int) -> int:
     return (current_level ** 2) * 500
 
 
-def get_or_create_user_stats(db: Session, user_id: int) -> UserStats:
+async def get_or_create_user_stats(db: AsyncSession, user_id: int) -> UserStats:
     """Get or create user stats record"""
-    stats = db.query(UserStats).filter(UserStats.user_id == user_id).first()
+    result = await db.execute(select(UserStats).where(UserStats.user_id == user_id))
+    stats = result.scalar_one_or_none()
     if not stats:
         stats = UserStats(user_id=user_id)
         db.add(stats)
-        db.commit()
-        db.refresh(stats)
+        await db.commit()
+        await db.refresh(stats)
     return stats
 
 
 @router.get("/stats", response_model=UserStatsResponse)
-def get_user_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_user_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Get current user's gamification statistics.
     
     Returns XP, level, streaks, and other gamification metrics.
     """
-    stats = get_or_create_user_stats(db, current_user.id)
+    stats = await get_or_create_user_stats(db, current_user.id)
     
     # Calculate level from XP
     stats.level = calculate_level(stats.total_xp)
-    db.commit()
+    await db.commit()
+    await db.refresh(stats)
     
     # Prepare response with computed fields
     response_data = UserStatsResponse.model_validate(stats)
@@ -67,49 +72,33 @@ def get_user_stats(
 
 
 @router.get("/achievements", response_model=List[UserAchievementResponse])
-def get_user_achievements(
+async def get_user_achievements(
     include_locked: bool = Query(True, description="Include locked achievements"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Get all achievements with unlock status for current user.
     
     - **include_locked**: If true, returns all achievements. If false, only unlocked ones.
     """
+    query = select(UserAchievement).options(
+        selectinload(UserAchievement.achievement)
+    ).where(UserAchievement.user_id == current_user.id)
+    
     if include_locked:
-        # Get all achievements
-        all_achievements = db.query(Achievement).filter(Achievement.is_active == True).all()
-        
-        # Get user's unlocked achievements
-        unlocked_ids = {ua.achievement_id for ua in db.query(UserAchievement).filter(
-            UserAchievement.user_id == current_user.id
-        ).all()}
-        
-        # Return with unlock status
-        result = []
-        for achievement in all_achievements:
-            if achievement.id in unlocked_ids:
-                user_achievement = db.query(UserAchievement).filter(
-                    UserAchievement.user_id == current_user.id,
-                    UserAchievement.achievement_id == achievement.id
-                ).first()
-                result.append(UserAchievementResponse.model_validate(user_achievement))
-        
-        return result
-    else:
-        # Only unlocked
-        unlocked = db.query(UserAchievement).filter(
-            UserAchievement.user_id == current_user.id
-        ).all()
-        return [UserAchievementResponse.model_validate(ua) for ua in unlocked]
+        # Unlocked achievements that are still active, in achievement order
+        query = query.join(Achievement).where(Achievement.is_active == True).order_by(Achievement.id)
+    
+    result = await db.execute(query)
+    return [UserAchievementResponse.model_validate(ua) for ua in result.scalars().all()]
 
 
 @router.post("/sessions", response_model=FocusSessionResponse, status_code=status.HTTP_201_CREATED)
-def start_focus_session(
+async def start_focus_session(
     session_data: FocusSessionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Start a new focus session.
@@ -125,28 +114,31 @@ def start_focus_session(
     )
     
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await db.refresh(session)
     
     return session
 
 
 @router.patch("/sessions/{session_id}", response_model=FocusSessionResponse)
-def complete_focus_session(
+async def complete_focus_session(
     session_id: int,
     session_update: FocusSessionUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Complete or update a focus session.
     
     Updates session with completion data and awards XP.
     """
-    session = db.query(FocusSession).filter(
-        FocusSession.id == session_id,
-        FocusSession.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(FocusSession).where(
+            FocusSession.id == session_id,
+            FocusSession.user_id == current_user.id
+        )
+    )
+    session = result.scalar_one_or_none()
     
     if not session:
         raise HTTPException(
@@ -171,56 +163,58 @@ def complete_focus_session(
         session.xp_earned = base_xp + task_bonus + flow_bonus
         
         # Update user stats
-        stats = get_or_create_user_stats(db, current_user.id)
+        stats = await get_or_create_user_stats(db, current_user.id)
         stats.total_xp += session.xp_earned
         stats.total_focus_time += session.duration_minutes
         stats.level = calculate_level(stats.total_xp)
         
-        # Update today's daily stats
-        today = datetime.utcnow().date()
-        daily_stats = db.query(DailyStats).filter(
-            DailyStats.user_id == current_user.id,
-            DailyStats.date == today
-        ).first()
-        
-        if not daily_stats:
-            daily_stats = DailyStats(user_id=current_user.id, date=today)
-            db.add(daily_stats)
-        
-        daily_stats.focus_sessions_count += 1
-        daily_stats.total_focus_minutes += session.duration_minutes
-        if session.was_completed:
-            daily_stats.completed_focus_sessions += 1
-        daily_stats.xp_earned += session.xp_earned
-    
-    db.commit()
-    db.refresh(session)
+        # Add to today's daily stats in one upsert
+        connection = await db.connection()
+        await connection.run_sync(bump_daily_stats, {current_user.id: {
+            "focus_sessions_count": 1,
+            "total_focus_minutes": session.duration_minutes,
+            "completed_focus_sessions": 1,
+            "xp_earned": session.xp_earned,
+        }})
+    
+    await db.commit()
+    await db.refresh(session)
     
     return session
 
 
 @router.get("/summary", response_model=GamificationSummary)
-def get_gamification_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_gamification_summary(
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Get comprehensive gamification summary for dashboard.
     
     Includes stats, recent achievements, streak data, and daily progress.
+    Reads are served from a replica; only a first visit writes to the primary.
     """
     # Get user stats
-    stats = get_or_create_user_stats(db, current_user.id)
-    stats.level = calculate_level(stats.total_xp)
-    db.commit()
+    result = await db.execute(select(UserStats).where(UserStats.user_id == current_user.id))
+    stats = result.scalar_one_or_none()
+    if not stats:
+        stats = await get_or_create_user_stats(primary_db, current_user.id)
     
+    # Level is derived from XP, so compute it rather than writing it back from a GET
     stats_response = UserStatsResponse.model_validate(stats)
-    stats_response.xp_to_next_level = xp_to_next_level(stats.level)
+    stats_response.level = calculate_level(stats.total_xp)
+    stats_response.xp_to_next_level = xp_to_next_level(stats_response.level)
     
     # Get recent achievements (last 5)
-    recent_achievements = db.query(UserAchievement).filter(
-        UserAchievement.user_id == current_user.id
-    ).order_by(UserAchievement.unlocked_at.desc()).limit(5).all()
+    result = await db.execute(
+        select(UserAchievement)
+        .options(selectinload(UserAchievement.achievement))
+        .where(UserAchievement.user_id == current_user.id)
+        .order_by(UserAchievement.unlocked_at.desc())
+        .limit(5)
+    )
+    recent_achievements = result.scalars().all()
     
     # Streak data
     streak_data = {
@@ -231,10 +225,13 @@ def get_gamification_summary(
     
     # Today's stats
     today = datetime.utcnow().date()
-    daily_progress = db.query(DailyStats).filter(
-        DailyStats.user_id == current_user.id,
-        DailyStats.date == today
-    ).first()
+    result = await db.execute(
+        select(DailyStats).where(
+            DailyStats.user_id == current_user.id,
+            DailyStats.date == today
+        )
+    )
+    daily_progress = result.scalar_one_or_none()
     
     return GamificationSummary(
         user_stats=stats_response,
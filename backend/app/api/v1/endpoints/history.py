@@ -1,31 +1,39 @@
 from typing import List, Optional
 from datetime import datetime, date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
-from app.core.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
+from app.api.deps import get_current_active_user, get_read_db
+from app.core.pagination import Keyset
+from app.core.principals import Principal
+from app.core.responses import list_response
 from app.models.task_history import TaskHistory, DailyStats
 from app.schemas.gamification import TaskHistoryResponse, DailyStatsResponse
 
 router = APIRouter()
 
+# Newest first; served by ix_task_history_user_id_created_at_id
+_history_pages = Keyset("task_history", TaskHistory.created_at, TaskHistory.id)
+
 
 @router.get("/tasks", response_model=List[TaskHistoryResponse])
 def get_task_history(
+    request: Request,
     task_id: Optional[int] = Query(None, description="Filter by specific task ID"),
     start_date: Optional[date] = Query(None, description="Start date for history"),
     end_date: Optional[date] = Query(None, description="End date for history"),
     limit: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Get task completion history with optional filters.
     
-    Returns historical records of task changes and completions.
+    Returns historical records of task changes and completions, newest
+    first. Pass the X-Next-Cursor header of a page as `cursor` to get the
+    next one.
     """
     query = db.query(TaskHistory).filter(TaskHistory.user_id == current_user.id)
     
@@ -40,18 +48,20 @@ def get_task_history(
         end_datetime = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
         query = query.filter(TaskHistory.created_at < end_datetime)
     
-    history = query.order_by(TaskHistory.created_at.desc()).limit(limit).all()
+    rows = _history_pages.apply(query, db, cursor=cursor, skip=0, limit=limit).all()
+    history, page_headers = _history_pages.page(rows, limit)
     
-    return [TaskHistoryResponse.model_validate(h) for h in history]
+    return list_response(request, history, TaskHistoryResponse, headers=page_headers)
 
 
 @router.get("/daily-stats", response_model=List[DailyStatsResponse])
 def get_daily_stats(
+    request: Request,
     start_date: Optional[date] = Query(None, description="Start date"),
     end_date: Optional[date] = Query(None, description="End date"),
     limit: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Get daily statistics for a date range.
@@ -72,13 +82,13 @@ def get_daily_stats(
         )
     ).order_by(DailyStats.date.desc()).limit(limit).all()
     
-    return [DailyStatsResponse.model_validate(ds) for ds in daily_stats]
+    return list_response(request, daily_stats, DailyStatsResponse)
 
 
 @router.get("/streak", response_model=dict)
 def get_streak_details(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Get detailed streak information including calendar data.
@@ -1,36 +1,49 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import Any
-import stripe
 import os
 from app.core.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
+from app.api.deps import get_current_user_profile
+from app.core.principals import Principal
 from app.models.subscription import Subscription
 
 router = APIRouter()
 
-# Initialize Stripe
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
+STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 
+
+def get_stripe():
+    """
+    Import and configure the Stripe SDK on first use.
+    
+    Imported lazily so workers that never take a payment don't pay for it at startup.
+    """
+    import stripe
+    
+    stripe.api_key = STRIPE_SECRET_KEY
+    return stripe
+
+
 @router.post("/create-checkout-session")
 async def create_checkout_session(
     plan_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_user_profile),
 ) -> Any:
     """
     Create a Stripe Checkout Session for subscription.
     """
-    if not stripe.api_key:
+    if not STRIPE_SECRET_KEY:
         raise HTTPException(status_code=500, detail="Stripe not configured")
+    stripe = get_stripe()
 
     try:
         # Get or create Stripe Customer
         customer_id = None
-        if current_user.subscription and current_user.subscription.stripe_customer_id:
-            customer_id = current_user.subscription.stripe_customer_id
+        subscription = db.query(Subscription).filter(Subscription.user_id == current_user.id).first()
+        if subscription and subscription.stripe_customer_id:
+            customer_id = subscription.stripe_customer_id
         else:
             customer = stripe.Customer.create(
                 email=current_user.email,
@@ -39,12 +52,12 @@ async def create_checkout_session(
             customer_id = customer.id
             
             # Create subscription record if not exists
-            if not current_user.subscription:
+            if not subscription:
                 sub = Subscription(user_id=current_user.id, stripe_customer_id=customer_id)
                 db.add(sub)
                 db.commit()
             else:
-                current_user.subscription.stripe_customer_id = customer_id
+                subscription.stripe_customer_id = customer_id
                 db.commit()
 
         # Define price IDs (replace with your actual Stripe Price IDs)
@@ -75,6 +88,7 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     """
     payload = await request.body()
     sig_header = request.headers.get('stripe-signature')
+    stripe = get_stripe()
 
     try:
         event = stripe.Webhook.construct_event(
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.models.task import Task
-from app.models.user import User
+from app.core.principals import Principal
 from app.api import deps
 
 router = APIRouter()
@@ -12,7 +12,7 @@ router = APIRouter()
 @router.post("/reschedule-overdue")
 def reschedule_overdue_tasks(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ):
     """
     Smart Reschedule: Move all overdue tasks to today/tomorrow.
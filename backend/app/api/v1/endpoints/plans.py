@@ -1,70 +1,108 @@
 from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.api.deps import get_async_current_active_user, get_async_read_db
+from app.core.changes import check_not_modified, etag_headers
+from app.core.pagination import Keyset
+from app.core.principals import Principal
+from app.core.responses import list_response
 from app.models.plan import Plan
 from app.schemas.plan import PlanCreate, PlanUpdate, PlanResponse
 
 router = APIRouter()
 
+# Latest date first; served by uq_plans_user_id_date
+_pages = Keyset("plans", Plan.date, Plan.id)
+
+
+async def _find_user_plan(db: AsyncSession, plan_date: date, user_id: int) -> Optional[Plan]:
+    """Return the user's plan for a date, if any."""
+    result = await db.execute(
+        select(Plan).where(
+            Plan.date == plan_date,
+            Plan.user_id == user_id
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def _get_user_plan(db: AsyncSession, plan_date: date, user_id: int) -> Plan:
+    """Return the user's plan for a date, or raise 404."""
+    plan = await _find_user_plan(db, plan_date, user_id)
+    
+    if not plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Plan not found for date {plan_date}"
+        )
+    
+    return plan
+
 
 @router.get("/", response_model=List[PlanResponse])
-def get_plans(
+async def get_plans(
+    request: Request,
     start_date: Optional[date] = Query(None, description="Filter plans from this date"),
     end_date: Optional[date] = Query(None, description="Filter plans until this date"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
-    Get all plans for the current user.
+    Get all plans for the current user, latest date first.
     
     - **start_date**: Optional start date filter
     - **end_date**: Optional end date filter
+    - **cursor**: Continue after the previous page, from its X-Next-Cursor header
+    
+    Answers 304 when If-None-Match still matches the user's data.
     """
-    query = db.query(Plan).filter(Plan.user_id == current_user.id)
+    etag, unchanged = await check_not_modified(db, request, current_user.id)
+    if unchanged:
+        return unchanged
+    
+    query = select(Plan).where(Plan.user_id == current_user.id)
     
     if start_date:
-        query = query.filter(Plan.date >= start_date)
+        query = query.where(Plan.date >= start_date)
     
     if end_date:
-        query = query.filter(Plan.date <= end_date)
+        query = query.where(Plan.date <= end_date)
     
-    plans = query.order_by(Plan.date.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(_pages.apply(query, db, cursor=cursor, skip=skip, limit=limit))
+    plans, page_headers = _pages.page(result.scalars().all(), limit)
     
-    return plans
+    return list_response(request, plans, PlanResponse, headers={**etag_headers(etag), **page_headers})
 
 
 @router.get("/{plan_date}", response_model=PlanResponse)
-def get_plan_by_date(
+async def get_plan_by_date(
     plan_date: date,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Get a plan for a specific date."""
-    plan = db.query(Plan).filter(
-        Plan.date == plan_date,
-        Plan.user_id == current_user.id
-    ).first()
-    
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Plan not found for date {plan_date}"
-        )
+    etag, unchanged = await check_not_modified(db, request, current_user.id)
+    if unchanged:
+        return unchanged
     
-    return plan
+    response.headers.update(etag_headers(etag))
+    return await _get_user_plan(db, plan_date, current_user.id)
 
 
 @router.post("/", response_model=PlanResponse, status_code=status.HTTP_201_CREATED)
-def create_plan(
+async def create_plan(
     plan_data: PlanCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Create a new daily plan.
@@ -74,17 +112,16 @@ def create_plan(
     - **commute_time**: Hours spent commuting
     - **work_time**: Hours spent working
     """
+    already_exists = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Plan already exists for date {plan_data.date}"
+    )
+    
     # Check if plan already exists for this date
-    existing_plan = db.query(Plan).filter(
-        Plan.date == plan_data.date,
-        Plan.user_id == current_user.id
-    ).first()
+    existing_plan = await _find_user_plan(db, plan_data.date, current_user.id)
     
     if existing_plan:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Plan already exists for date {plan_data.date}"
-        )
+        raise already_exists
     
     plan = Plan(
         date=plan_data.date,
@@ -95,60 +132,47 @@ def create_plan(
     )
     
     db.add(plan)
-    db.commit()
-    db.refresh(plan)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request created it first (uq_plans_user_id_date)
+        await db.rollback()
+        raise already_exists
+    await db.refresh(plan)
     
     return plan
 
 
 @router.patch("/{plan_date}", response_model=PlanResponse)
-def update_plan(
+async def update_plan(
     plan_date: date,
     plan_data: PlanUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Update a plan for a specific date."""
-    plan = db.query(Plan).filter(
-        Plan.date == plan_date,
-        Plan.user_id == current_user.id
-    ).first()
-    
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Plan not found for date {plan_date}"
-        )
+    plan = await _get_user_plan(db, plan_date, current_user.id)
     
     update_data = plan_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(plan, field, value)
     
-    db.commit()
-    db.refresh(plan)
+    await db.commit()
+    await db.refresh(plan)
     
     return plan
 
 
 @router.delete("/{plan_date}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_plan(
+async def delete_plan(
     plan_date: date,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Delete a plan for a specific date."""
-    plan = db.query(Plan).filter(
-        Plan.date == plan_date,
-        Plan.user_id == current_user.id
-    ).first()
-    
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Plan not found for date {plan_date}"
-        )
+    plan = await _get_user_plan(db, plan_date, current_user.id)
     
-    db.delete(plan)
-    db.commit()
+    await db.delete(plan)
+    await db.commit()
     
     return None
@@ -0,0 +1,83 @@
+import asyncio
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import authenticate_websocket
+from app.core.database import AsyncSessionLocal
+from app.core.principals import Principal
+from app.core.realtime import board_events
+from app.models.board import Board
+from app.models.team import TeamMember
+
+router = APIRouter()
+
+
+async def _can_watch(db: AsyncSession, board: Board, principal: Principal) -> bool:
+    """
+    The board's owner and the members of its team may subscribe.
+    
+    Membership is read from team_members rather than the token's team
+    claims, which a removed member keeps until the token expires.
+    """
+    if board.user_id == principal.id:
+        return True
+    if board.team_id is None:
+        return False
+    role = await db.scalar(
+        select(TeamMember.role).where(TeamMember.team_id == board.team_id, TeamMember.user_id == principal.id)
+    )
+    return role is not None
+
+
+async def _until_disconnect(websocket: WebSocket) -> None:
+    """Read (and ignore) client messages until the client goes away."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/boards/{board_id}")
+async def board_events_socket(websocket: WebSocket, board_id: int):
+    """
+    Push the board's change events to the client.
+    
+    Authenticate with an access token in the `token` query parameter. The
+    first message is {"type": "subscribed", "board_id", "version"}; each
+    committed change to the board, its groups, tasks or subtasks then arrives
+    as {"type": "board.changed", "board_id", "version", "changes": [...]},
+    or {"type": "resync", ...} when the client should reload the snapshot.
+    The connection closes after the board is deleted.
+    """
+    # A short-lived session for the checks; none is held while subscribed
+    async with AsyncSessionLocal() as db:
+        principal = await authenticate_websocket(websocket, db)
+        board = await db.get(Board, board_id) if principal is not None else None
+        allowed = board is not None and await _can_watch(db, board, principal)
+        version = board.version if allowed else None
+    
+    if not allowed:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    async with board_events.subscribe(board_id) as queue:
+        await websocket.accept()
+        await websocket.send_json({"type": "subscribed", "board_id": board_id, "version": version})
+        
+        disconnected = asyncio.ensure_future(_until_disconnect(websocket))
+        try:
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if disconnected.done():
+                    next_event.cancel()
+                    return
+                event = next_event.result()
+                await websocket.send_json(event)
+                if any(change["entity"] == "board" and change["op"] == "deleted" for change in event.get("changes", ())):
+                    await websocket.close()
+                    return
+        finally:
+            disconnected.cancel()
@@ -0,0 +1,81 @@
+from collections import defaultdict
+from typing import Dict, List
+from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_current_active_user, get_async_read_db
+from app.core.changes import SYNCED
+from app.core.principals import Principal
+from app.core.responses import encode, serialize_rows
+from app.models.change import ChangeLogEntry
+from app.schemas.plan import PlanResponse
+from app.schemas.board import GroupResponse
+from app.schemas.sync import SyncBoard, SyncResponse, SyncTask
+from app.schemas.task import SubtaskResponse
+
+router = APIRouter()
+
+# change_log entity -> (response key, schema)
+_SCHEMAS = {
+    "task": ("tasks", SyncTask),
+    "subtask": ("subtasks", SubtaskResponse),
+    "board": ("boards", SyncBoard),
+    "group": ("groups", GroupResponse),
+    "plan": ("plans", PlanResponse),
+}
+
+
+@router.get("/", response_model=SyncResponse)
+async def sync(
+    request: Request,
+    since: int = Query(0, ge=0, description="cursor of the previous sync; 0 for everything"),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum number of changed rows"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """
+    Tasks, subtasks, boards, groups and plans created, updated or deleted after `since`.
+    
+    Changed rows are returned in full and deleted ones as IDs under `deleted`.
+    Pass the returned `cursor` as `since` on the next call; while `has_more`
+    is true, call again straight away. A row changed several times appears
+    once, in its latest state.
+    """
+    user_entries = select(
+        ChangeLogEntry.seq, ChangeLogEntry.entity, ChangeLogEntry.entity_id, ChangeLogEntry.deleted
+    ).where(ChangeLogEntry.user_id == current_user.id)
+    entries = (await db.execute(
+        user_entries.where(ChangeLogEntry.seq > since).order_by(ChangeLogEntry.seq).limit(limit + 1)
+    )).all()
+    
+    has_more = len(entries) > limit
+    if has_more:
+        # A cursor is a whole sequence number: never split one write across pages
+        boundary = entries[limit].seq
+        entries = [entry for entry in entries if entry.seq < boundary]
+        if not entries:
+            # One write changed more rows than a page holds; send all of them
+            entries = (await db.execute(user_entries.where(ChangeLogEntry.seq == boundary))).all()
+            has_more = (await db.execute(user_entries.where(ChangeLogEntry.seq > boundary).limit(1))).first() is not None
+    
+    changed: Dict[str, List[int]] = defaultdict(list)
+    data = {"cursor": entries[-1].seq if entries else since, "has_more": has_more, "deleted": {}}
+    for entity, (key, _) in _SCHEMAS.items():
+        data[key] = []
+        data["deleted"][key] = []
+    for entry in entries:
+        if entry.deleted:
+            data["deleted"][_SCHEMAS[entry.entity][0]].append(entry.entity_id)
+        else:
+            changed[entry.entity].append(entry.entity_id)
+    
+    for entity, ids in changed.items():
+        model = SYNCED[entity]
+        key, schema = _SCHEMAS[entity]
+        rows = await db.scalars(select(model).where(model.id.in_(ids)).order_by(model.id))
+        data[key] = serialize_rows(rows, schema)
+    
+    body, media_type = encode(request, data)
+    return Response(body, headers={"Vary": "Accept"}, media_type=media_type)
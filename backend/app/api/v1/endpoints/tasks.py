@@ -1,73 +1,517 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.history import TRACKED, created_event, deleted_event, record_history, status_event
+from app.api.deps import get_async_current_active_user, get_async_read_db
+from app.core.changes import (
+    bump_board_versions, bump_change_seq, check_not_modified, etag_headers, log_changes, queue_board_events,
+)
+from app.core.pagination import Keyset
+from app.core.principals import Principal
+from app.core.ranking import key_between, keys_between, last_positions, needs_rebalance, place_between, rebalance
+from app.core.responses import list_response
+from app.core.search import hits, search_terms
+from app.models.board import Board, Group
+from app.models.gamification import FocusSession
 from app.models.task import Task, Subtask
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, SubtaskCreate, SubtaskUpdate, SubtaskResponse
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, SubtaskCreate, SubtaskUpdate, SubtaskResponse,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkItemResult, TaskBulkResult, TaskMove,
+)
 
 router = APIRouter()
 
+# Newest first; served by ix_tasks_user_id_created_at_id
+_pages = Keyset("tasks", Task.created_at, Task.id)
+
+
+async def _get_user_task(db: AsyncSession, task_id: int, user_id: int) -> Task:
+    """Load a task owned by the user with its subtasks, or raise 404."""
+    result = await db.execute(
+        select(Task)
+        .options(selectinload(Task.subtasks))
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    task = result.scalar_one_or_none()
+    
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    return task
+
+
+async def _get_user_subtask(db: AsyncSession, subtask_id: int, user_id: int) -> Subtask:
+    """Load a subtask whose parent task is owned by the user, or raise 404."""
+    result = await db.execute(
+        select(Subtask).join(Task).where(
+            Subtask.id == subtask_id,
+            Task.user_id == user_id
+        )
+    )
+    subtask = result.scalar_one_or_none()
+    
+    if not subtask:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Subtask not found"
+        )
+    
+    return subtask
+
 
 @router.get("/", response_model=List[TaskResponse])
-def get_tasks(
+async def get_tasks(
+    request: Request,
     date_filter: Optional[date] = Query(None, description="Filter tasks by date"),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
+    group_id: Optional[int] = Query(None, description="Filter by Kanban group"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
-    Get all tasks for the current user with optional filters.
+    Get all tasks for the current user with optional filters, newest first.
     
     - **date_filter**: Filter by specific date
     - **status_filter**: Filter by status (not_started, in_progress, done, postponed)
-    - **skip**: Number of records to skip (pagination)
+    - **group_id**: Filter by Kanban group
+    - **skip**: Number of records to skip (offset pagination)
     - **limit**: Maximum number of records to return
+    - **cursor**: Continue after the previous page (keyset pagination)
+    
+    The X-Next-Cursor response header holds the cursor of the next page and
+    is absent on the last one.
+    
+    Answers 304 when If-None-Match still matches the user's data.
     """
-    query = db.query(Task).filter(Task.user_id == current_user.id)
+    etag, unchanged = await check_not_modified(db, request, current_user.id)
+    if unchanged:
+        return unchanged
+    
+    query = select(Task).options(selectinload(Task.subtasks)).where(Task.user_id == current_user.id)
     
     if date_filter:
-        query = query.filter(Task.date == date_filter)
+        query = query.where(Task.date == date_filter)
     
     if status_filter:
-        query = query.filter(Task.status == status_filter)
+        query = query.where(Task.status == status_filter)
+    
+    if group_id is not None:
+        query = query.where(Task.group_id == group_id)
     
-    tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(_pages.apply(query, db, cursor=cursor, skip=skip, limit=limit))
+    tasks, page_headers = _pages.page(result.scalars().all(), limit)
     
-    return tasks
+    return list_response(request, tasks, TaskResponse, headers={**etag_headers(etag), **page_headers})
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
-def get_task(
-    task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+
+@router.get("/search", response_model=List[TaskResponse])
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
-    """Get a specific task by ID."""
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
+    """
+    Search the current user's tasks by name, description and subtask names,
+    best matches first.
     
-    if not task:
+    - **q**: Every word must match the start of a word in the task
+    - **limit**: Maximum number of records to return
+    - **cursor**: Continue after the previous page (keyset pagination)
+    
+    Served by a full-text index on SQLite and PostgreSQL (app.core.search).
+    The X-Next-Cursor response header holds the cursor of the next page and
+    is absent on the last one. Answers 304 when If-None-Match still matches
+    the user's data.
+    """
+    etag, unchanged = await check_not_modified(db, request, current_user.id)
+    if unchanged:
+        return unchanged
+    
+    terms = search_terms(q)
+    if not terms:
+        return list_response(request, [], TaskResponse, headers=etag_headers(etag))
+    
+    matches = hits(db.get_bind().dialect.name, terms, current_user.id)
+    pages = Keyset("task_search", matches.c.rank, matches.c.id)
+    query = (
+        select(Task, matches.c.rank, matches.c.id)
+        .join(matches, matches.c.id == Task.id)
+        .where(Task.user_id == current_user.id)
+        .options(selectinload(Task.subtasks))
+    )
+    result = await db.execute(pages.apply(query, db, cursor=cursor, skip=0, limit=limit))
+    rows, page_headers = pages.page(result.all(), limit)
+    
+    return list_response(
+        request, [row.Task for row in rows], TaskResponse, headers={**etag_headers(etag), **page_headers}
+    )
+
+
+# --- Bulk endpoints ---
+#
+# Declared before /{task_id} so "bulk" is not taken for a task ID. Each request
+# checks ownership with one IN query and applies every valid item with
+# set-based statements in a single transaction; invalid items are reported
+# per item and do not stop the others. These Core statements bypass the
+# unit of work, so the change counter, change log, board versions, board
+# events and task history are updated here.
+
+def _check_bulk_size(count: int) -> None:
+    if count > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.TASK_BULK_MAX_ITEMS} tasks per request"
+        )
+
+
+def _null_required_fields(change: dict) -> List[str]:
+    """Fields of an update set to null although their column is NOT NULL."""
+    return [field for field, value in change.items() if value is None and not Task.__table__.c[field].nullable]
+
+
+async def _owned_tasks(db: AsyncSession, task_ids: Iterable[int], user_id: int) -> Dict[int, Optional[int]]:
+    """Group ID of each of the tasks owned by the user, by task ID."""
+    result = await db.execute(
+        select(Task.id, Task.group_id).where(Task.id.in_(set(task_ids)), Task.user_id == user_id)
+    )
+    return dict(result.all())
+
+
+async def _group_boards(db: AsyncSession, group_ids: Set[int]) -> Dict[int, Tuple[int, int]]:
+    """(board ID, board owner) of each group, by group ID."""
+    if not group_ids:
+        return {}
+    result = await db.execute(
+        select(Group.id, Group.board_id, Board.user_id).join(Board).where(Group.id.in_(group_ids))
+    )
+    return {group_id: (board_id, owner) for group_id, board_id, owner in result.all()}
+
+
+async def _check_group(db: AsyncSession, group_id: int, user_id: int) -> None:
+    """Raise 404 unless the group is on one of the user's boards."""
+    groups = await _group_boards(db, {group_id})
+    if groups.get(group_id, (None, None))[1] != user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
+            detail="Group not found"
         )
+
+
+async def _insert_tasks(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """INSERT the rows in multi-row batches; their new IDs in row order."""
+    # render_nulls: otherwise rows are split into batches by which fields are None
+    statement = insert(Task).execution_options(render_nulls=True)
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLAlchemy has no sentinel to order RETURNING on SQLite and would
+        # insert row by row; SQLite numbers rowids in VALUES order and
+        # serializes writers, so sorting the IDs restores row order
+        return sorted(await db.scalars(statement.returning(Task.id), rows))
+    return list(await db.scalars(statement.returning(Task.id, sort_by_parameter_order=True), rows))
+
+
+async def _bump(
+    db: AsyncSession, user_id: int, changes: List[Tuple[str, int, Set[int]]], op: str, history: List[dict] = ()
+) -> None:
+    """
+    Record written (entity, row ID, its boards) rows as the unit of work would
+    have; `op` is created/updated/deleted, `history` the task_history rows.
+    """
+    connection = await db.connection()
+    if history:
+        await connection.run_sync(record_history, list(history))
+    seqs = await connection.run_sync(bump_change_seq, [user_id])
+    await connection.run_sync(
+        log_changes, seqs, [(user_id, entity, entity_id, op == "deleted") for entity, entity_id, _ in changes]
+    )
+    versions = await connection.run_sync(bump_board_versions, set().union(*(boards for _, _, boards in changes)))
+    queue_board_events(db.sync_session, versions, [
+        (board_id, entity, entity_id, op) for entity, entity_id, boards in changes for board_id in boards
+    ])
+
+
+async def _load_tasks(db: AsyncSession, task_ids: List[int]) -> Dict[int, Task]:
+    """Tasks with their subtasks, by ID, refreshed from the database."""
+    if not task_ids:
+        return {}
+    result = await db.execute(
+        select(Task)
+        .options(selectinload(Task.subtasks))
+        .where(Task.id.in_(task_ids))
+        .execution_options(populate_existing=True)
+    )
+    return {task.id: task for task in result.scalars()}
+
+
+def _bulk_result(results: List[TaskBulkItemResult], tasks: Optional[Dict[int, Task]] = None) -> TaskBulkResult:
+    for result in results:
+        if result.ok and tasks is not None:
+            result.task = TaskResponse.model_validate(tasks[result.id])
+    succeeded = sum(result.ok for result in results)
+    return TaskBulkResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def create_tasks_bulk(
+    bulk_data: TaskBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """
+    Create many tasks (with their subtasks) in one transaction.
     
-    return task
+    Items whose group is not on one of the user's boards fail; the others are
+    created. Results are in request order.
+    """
+    items = bulk_data.tasks
+    _check_bulk_size(len(items))
+    
+    groups = await _group_boards(db, {item.group_id for item in items if item.group_id is not None})
+    results: List[TaskBulkItemResult] = []
+    rows, boards = [], []
+    for index, item in enumerate(items):
+        if item.group_id is not None:
+            board = groups.get(item.group_id)
+            if board is None or board[1] != current_user.id:
+                results.append(TaskBulkItemResult(index=index, ok=False, error="Group not found"))
+                continue
+        boards.append({groups[item.group_id][0]} if item.group_id is not None else set())
+        results.append(TaskBulkItemResult(index=index, ok=True))
+        rows.append({**item.model_dump(exclude={"subtasks"}), "user_id": current_user.id, "position": None})
+    
+    grouped = [row for row in rows if row["group_id"] is not None]
+    if grouped:
+        # Appended to their groups in request order
+        connection = await db.connection()
+        lasts = await connection.run_sync(last_positions, Task, {row["group_id"] for row in grouped})
+        for row in grouped:
+            row["position"] = lasts[row["group_id"]] = key_between(lasts.get(row["group_id"]), None)
+    
+    if rows:
+        task_ids = await _insert_tasks(db, rows)
+        created = [result for result in results if result.ok]
+        subtasks = []
+        task_boards = dict(zip(task_ids, boards))
+        for result, task_id in zip(created, task_ids):
+            result.id = task_id
+            subtasks += [{**subtask.model_dump(), "task_id": task_id} for subtask in items[result.index].subtasks or []]
+        changes = [("task", task_id, task_boards[task_id]) for task_id in task_ids]
+        history = [
+            created_event(task_id, current_user.id, row["name"], row["status"]) for task_id, row in zip(task_ids, rows)
+        ]
+        if subtasks:
+            inserted = await db.execute(insert(Subtask).returning(Subtask.id, Subtask.task_id), subtasks)
+            changes += [("subtask", subtask_id, task_boards[task_id]) for subtask_id, task_id in inserted]
+        await _bump(db, current_user.id, changes, "created", history)
+        await db.commit()
+    
+    return _bulk_result(results, await _load_tasks(db, [result.id for result in results if result.ok]))
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def update_tasks_bulk(
+    bulk_data: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """
+    Update many tasks in one transaction.
+    
+    Each item carries a task ID and only the fields to change. Items that
+    share the same changes (e.g. moving many tasks to one group) are applied
+    with a single UPDATE; tasks moved to another group go to its end.
+    Unknown or repeated task IDs, nulls for required fields and groups
+    outside the user's boards fail per item.
+    """
+    items = bulk_data.tasks
+    _check_bulk_size(len(items))
+    
+    owned = await _owned_tasks(db, [item.id for item in items], current_user.id)
+    changes = [item.model_dump(exclude_unset=True, exclude={"id"}) for item in items]
+    targets = {change["group_id"] for change in changes if change.get("group_id") is not None}
+    groups = await _group_boards(db, targets | {group_id for group_id in owned.values() if group_id is not None})
+    
+    results: List[TaskBulkItemResult] = []
+    batches: Dict[Tuple, List[int]] = defaultdict(list)
+    arrivals: Dict[int, List[int]] = defaultdict(list)
+    seen, boards, restatused = set(), defaultdict(set), {}
+    for index, (item, change) in enumerate(zip(items, changes)):
+        error = None
+        if item.id not in owned:
+            error = "Task not found"
+        elif item.id in seen:
+            error = "Task appears more than once"
+        elif _null_required_fields(change):
+            error = f"{', '.join(_null_required_fields(change))} cannot be null"
+        elif change.get("group_id") is not None and groups.get(change["group_id"], (None, None))[1] != current_user.id:
+            error = "Group not found"
+        results.append(TaskBulkItemResult(index=index, id=item.id, ok=error is None, error=error))
+        if error:
+            continue
+        seen.add(item.id)
+        if change:
+            batches[tuple(sorted(change.items()))].append(item.id)
+            # A moved task changes the board it left and the one it joined
+            for group_id in (owned[item.id], change.get("group_id")):
+                if group_id in groups:
+                    boards[item.id].add(groups[group_id][0])
+            if change.get("group_id") not in (None, owned[item.id]):
+                arrivals[change["group_id"]].append(item.id)
+            if "status" in change:
+                restatused[item.id] = change
+    
+    # Values before the update, for the history of status changes
+    before: Dict[int, dict] = {}
+    if restatused:
+        result = await db.execute(
+            select(Task.id, *(getattr(Task, field) for field in TRACKED)).where(Task.id.in_(restatused))
+        )
+        before = {row[0]: dict(zip(TRACKED, row[1:])) for row in result}
+    
+    # Tasks joining a group go to its end, in request order
+    positions: Dict[int, str] = {}
+    if arrivals:
+        connection = await db.connection()
+        lasts = await connection.run_sync(last_positions, Task, arrivals)
+        for group_id, task_ids in arrivals.items():
+            positions.update(zip(task_ids, keys_between(lasts.get(group_id), None, len(task_ids))))
+    
+    updated, applied = set(), {task_id for task_ids in batches.values() for task_id in task_ids}
+    for values, task_ids in batches.items():
+        values = dict(values)
+        moved = {task_id: positions[task_id] for task_id in task_ids if task_id in positions}
+        if moved:
+            # Still one UPDATE per batch: each moved row gets its own key
+            values["position"] = case(moved, value=Task.id, else_=Task.position)
+        elif "group_id" in values and values["group_id"] is None:
+            values["position"] = None
+        updated.update(await db.scalars(
+            update(Task)
+            .where(Task.id.in_(task_ids), Task.user_id == current_user.id)
+            .values(values)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        ))
+    # Deleted by a concurrent request since the ownership check
+    for result in results:
+        if result.ok and result.id in applied - updated:
+            result.ok, result.error = False, "Task not found"
+    
+    if updated:
+        history = [
+            status_event(task_id, current_user.id, before[task_id], change)
+            for task_id, change in restatused.items() if task_id in updated and task_id in before
+        ]
+        await _bump(
+            db, current_user.id, [("task", task_id, boards[task_id]) for task_id in updated], "updated",
+            [row for row in history if row is not None],
+        )
+        await db.commit()
+    
+    return _bulk_result(results, await _load_tasks(db, [result.id for result in results if result.ok]))
+
+
+@router.delete("/bulk", response_model=TaskBulkResult)
+async def delete_tasks_bulk(
+    bulk_data: TaskBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """
+    Delete many tasks, with their subtasks and focus sessions, in one transaction.
+    
+    Unknown or repeated task IDs fail per item.
+    """
+    ids = bulk_data.ids
+    _check_bulk_size(len(ids))
+    
+    owned = await _owned_tasks(db, ids, current_user.id)
+    groups = await _group_boards(db, {group_id for group_id in owned.values() if group_id is not None})
+    
+    results: List[TaskBulkItemResult] = []
+    doomed: Set[int] = set()
+    for index, task_id in enumerate(ids):
+        error = None
+        if task_id not in owned:
+            error = "Task not found"
+        elif task_id in doomed:
+            error = "Task appears more than once"
+        results.append(TaskBulkItemResult(index=index, id=task_id, ok=error is None, error=error))
+        doomed.add(task_id)
+    doomed &= owned.keys()
+    
+    if doomed:
+        # The rows the ORM would cascade to on a single delete
+        subtasks = (await db.execute(
+            delete(Subtask)
+            .where(Subtask.task_id.in_(doomed))
+            .returning(Subtask.id, Subtask.task_id)
+            .execution_options(synchronize_session=False)
+        )).all()
+        await db.execute(
+            delete(FocusSession).where(FocusSession.task_id.in_(doomed)).execution_options(synchronize_session=False)
+        )
+        removed = (await db.execute(
+            delete(Task)
+            .where(Task.id.in_(doomed), Task.user_id == current_user.id)
+            .returning(Task.id, Task.name, Task.status)
+            .execution_options(synchronize_session=False)
+        )).all()
+        deleted = {task_id for task_id, _, _ in removed}
+        for result in results:
+            if result.ok and result.id not in deleted:
+                result.ok, result.error = False, "Task not found"
+        boards = {task_id: {groups[group_id][0]} if group_id in groups else set() for task_id, group_id in owned.items()}
+        changes = [
+            *(("task", task_id, boards[task_id]) for task_id in deleted),
+            *(("subtask", subtask_id, boards[task_id]) for subtask_id, task_id in subtasks),
+        ]
+        history = [deleted_event(task_id, current_user.id, name, last) for task_id, name, last in removed]
+        await _bump(db, current_user.id, changes, "deleted", history)
+        await db.commit()
+    
+    return _bulk_result(results)
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """Get a specific task by ID."""
+    etag, unchanged = await check_not_modified(db, request, current_user.id)
+    if unchanged:
+        return unchanged
+    
+    response.headers.update(etag_headers(etag))
+    return await _get_user_task(db, task_id, current_user.id)
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Create a new task.
@@ -80,6 +524,9 @@ def create_task(
     - **group_id**: Optional Kanban group ID
     - **subtasks**: List of subtasks to create
     """
+    if task_data.group_id is not None:
+        await _check_group(db, task_data.group_id, current_user.id)
+    
     # Create task
     task = Task(
         name=task_data.name,
@@ -92,7 +539,7 @@ def create_task(
     )
     
     db.add(task)
-    db.flush()  # Get task ID without committing
+    await db.flush()  # Get task ID without committing
     
     # Create subtasks if provided
     if task_data.subtasks:
@@ -104,65 +551,91 @@ def create_task(
             )
             db.add(subtask)
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
     
-    return task
+    return await _get_user_task(db, task.id, current_user.id)
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
-def update_task(
+async def update_task(
     task_id: int,
     task_data: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """
     Update an existing task.
     
     Only provided fields will be updated.
     """
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+    task = await _get_user_task(db, task_id, current_user.id)
     
     update_data = task_data.model_dump(exclude_unset=True)
+    if update_data.get("group_id") not in (None, task.group_id):
+        await _check_group(db, update_data["group_id"], current_user.id)
     for field, value in update_data.items():
         setattr(task, field, value)
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
     
-    return task
+    return await _get_user_task(db, task_id, current_user.id)
 
 
-@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+@router.post("/{task_id}/move", response_model=TaskResponse)
+async def move_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    move: TaskMove,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
-    """Delete a task."""
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
+    """
+    Move a task within its group or to another group.
     
-    if not task:
+    - **group_id**: Target group (default: the task's group)
+    - **after_id**: Put it right after this task of the target group
+    - **before_id**: Put it right before this task of the target group
+    
+    With neither neighbour the task goes last. Only the moved task's row is
+    written; its siblings keep their positions.
+    """
+    task = await _get_user_task(db, task_id, current_user.id)
+    group_id = move.group_id if move.group_id is not None else task.group_id
+    if group_id is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The task is not in a group; give a group_id"
         )
+    if group_id != task.group_id:
+        await _check_group(db, group_id, current_user.id)
     
-    db.delete(task)
-    db.commit()
+    try:
+        position = await place_between(db, Task, group_id, task.id, move.after_id, move.before_id)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid neighbours: {error}"
+        )
+    task.group_id, task.position = group_id, position
+    await db.commit()
+    
+    if needs_rebalance(position):
+        background_tasks.add_task(rebalance, Task, group_id)
+    
+    return await _get_user_task(db, task_id, current_user.id)
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
+):
+    """Delete a task."""
+    task = await _get_user_task(db, task_id, current_user.id)
+    
+    await db.delete(task)
+    await db.commit()
     
     return None
 
@@ -170,24 +643,15 @@ def delete_task(
 # --- Subtask endpoints ---
 
 @router.post("/{task_id}/subtasks", response_model=SubtaskResponse, status_code=status.HTTP_201_CREATED)
-def create_subtask(
+async def create_subtask(
     task_id: int,
     subtask_data: SubtaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Create a subtask for a task."""
     # Verify task belongs to user
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+    await _get_user_task(db, task_id, current_user.id)
     
     subtask = Subtask(
         name=subtask_data.name,
@@ -196,60 +660,42 @@ def create_subtask(
     )
     
     db.add(subtask)
-    db.commit()
-    db.refresh(subtask)
+    await db.commit()
+    await db.refresh(subtask)
     
     return subtask
 
 
 @router.patch("/subtasks/{subtask_id}", response_model=SubtaskResponse)
-def update_subtask(
+async def update_subtask(
     subtask_id: int,
     subtask_data: SubtaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Update a subtask."""
-    subtask = db.query(Subtask).join(Task).filter(
-        Subtask.id == subtask_id,
-        Task.user_id == current_user.id
-    ).first()
-    
-    if not subtask:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subtask not found"
-        )
+    subtask = await _get_user_subtask(db, subtask_id, current_user.id)
     
     update_data = subtask_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(subtask, field, value)
     
-    db.commit()
-    db.refresh(subtask)
+    await db.commit()
+    await db.refresh(subtask)
     
     return subtask
 
 
 @router.delete("/subtasks/{subtask_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_subtask(
+async def delete_subtask(
     subtask_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_async_current_active_user)
 ):
     """Delete a subtask."""
-    subtask = db.query(Subtask).join(Task).filter(
-        Subtask.id == subtask_id,
-        Task.user_id == current_user.id
-    ).first()
-    
-    if not subtask:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subtask not found"
-        )
+    subtask = await _get_user_subtask(db, subtask_id, current_user.id)
     
-    db.delete(subtask)
-    db.commit()
+    await db.delete(subtask)
+    await db.commit()
     
     return None
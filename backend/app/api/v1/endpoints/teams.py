@@ -1,21 +1,28 @@
 from typing import List, Any
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.database import get_db
 from app.api.deps import get_current_active_user
 from app.models.user import User
+from app.core.principals import Principal
 from app.models.team import Team, TeamMember, TeamRole
 from app.schemas.team import TeamCreate, TeamResponse, TeamMemberCreate, TeamMemberResponse
 from app.core.permissions import check_is_admin, check_is_owner, check_is_member
 
 router = APIRouter()
 
+
+def _teams_with_members(db: Session):
+    """Team query that batch-loads what TeamResponse serializes: members and their emails."""
+    return db.query(Team).options(selectinload(Team.members).selectinload(TeamMember.user))
+
+
 @router.post("/", response_model=TeamResponse)
 def create_team(
     team_in: TeamCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Create a new team.
@@ -37,7 +44,6 @@ def create_team(
     # Audit Log
     from app.core.audit import create_audit_log
     create_audit_log(
-        db=db,
         user_id=current_user.id,
         action="TEAM_CREATED",
         target_type="TEAM",
@@ -52,13 +58,13 @@ def read_teams(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve teams that the current user belongs to.
     """
     teams = (
-        db.query(Team)
+        _teams_with_members(db)
         .join(TeamMember)
         .filter(TeamMember.user_id == current_user.id)
         .offset(skip)
@@ -71,23 +77,14 @@ def read_teams(
 def read_team(
     team_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    role: str = Depends(check_is_member),
 ) -> Any:
     """
     Get a specific team by ID.
     """
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = _teams_with_members(db).filter(Team.id == team_id).first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    
-    # Check if user is a member
-    member = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id,
-        TeamMember.user_id == current_user.id
-    ).first()
-    
-    if not member:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
         
     return team
 
@@ -97,7 +94,8 @@ def add_member(
     team_id: int,
     member_in: TeamMemberCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
+    role: str = Depends(check_is_owner),  # must be owner
 ) -> Any:
     """
     Add a new member to the team.
@@ -107,9 +105,6 @@ def add_member(
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
-    # Check permissions (must be owner)
-    check_is_owner(db, current_user, team_id)
-
     # Check if user to add exists
     user_to_add = db.query(User).filter(User.email == member_in.email).first()
     if not user_to_add:
@@ -133,13 +128,9 @@ def add_member(
     db.commit()
     db.refresh(new_member)
     
-    # Hack to return user_email for response schema
-    new_member.user_email = user_to_add.email
-    
     # Audit Log
     from app.core.audit import create_audit_log
     create_audit_log(
-        db=db,
         user_id=current_user.id,
         action="MEMBER_ADDED",
         target_type="TEAM",
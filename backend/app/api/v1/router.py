@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, tasks, boards, plans, teams, payments, planner, gamification, history
+from app.api.v1.endpoints import auth, tasks, boards, plans, teams, payments, planner, gamification, history, sync, realtime
 
 api_router = APIRouter()
 
@@ -13,3 +13,5 @@ api_router.include_router(payments.router, prefix="/payments", tags=["Payments"]
 api_router.include_router(planner.router, prefix="/planner", tags=["Planner"])
 api_router.include_router(gamification.router, prefix="/gamification", tags=["Gamification"])
 api_router.include_router(history.router, prefix="/history", tags=["History"])
+api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
+api_router.include_router(realtime.router, prefix="/ws", tags=["Realtime"])
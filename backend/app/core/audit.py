@@ -1,29 +1,220 @@
+"""
+Audit logging.
+
+create_audit_log() queues the record in memory; a background thread writes
+queued records in multi-row INSERTs once AUDIT_BATCH_SIZE records are
+waiting or every AUDIT_FLUSH_INTERVAL_SECONDS, and once more on shutdown.
+Requests therefore no longer pay for a separate committed transaction per
+audit entry. The buffer is bounded (AUDIT_BUFFER_SIZE): when the database
+cannot keep up, new records are dropped and counted rather than growing
+memory without limit.
+
+A batch that fails to insert is queued again and retried after
+AUDIT_RETRY_BACKOFF_SECONDS, doubling per attempt; retried rows count against
+the buffer bound. After AUDIT_MAX_ATTEMPTS (or when the final flush on
+shutdown fails) its rows are given up on and each one is logged at ERROR, so
+the entries can still be recovered from the logs.
+
+Pass in_transaction=True to add the record to the caller's session instead,
+so it commits (or rolls back) together with the change it describes.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
 from app.models.audit import AuditLog
-from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Bounded in-memory queue of audit rows, flushed in batches by a daemon thread."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        max_buffer: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_attempts: int = 5,
+        retry_backoff: float = 1.0,
+    ):
+        self.engine = engine
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._buffer: List[Dict[str, Any]] = []
+        # Failed batches waiting for another attempt: (not before, attempts so far, rows)
+        self._retries: List[Tuple[float, int, List[Dict[str, Any]]]] = []
+        self._retry_rows = 0
+        self._cond = threading.Condition()
+        # Serializes flushes between the background thread and explicit flush() calls
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+
+    def enqueue(self, record: Dict[str, Any]) -> bool:
+        """Queue one audit row. Returns False if the buffer is full and it was dropped."""
+        with self._cond:
+            if len(self._buffer) + self._retry_rows >= self.max_buffer:
+                self.dropped += 1
+                return False
+            self._buffer.append(record)
+            self.enqueued += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+        self.start()
+        return True
+
+    def flush(self, final: bool = False) -> int:
+        """
+        Write everything queued so far, and failed batches that are due for
+        another attempt (all of them when final). Returns the number of rows
+        written.
+        """
+        with self._flush_lock:
+            now = time.monotonic()
+            with self._cond:
+                rows, self._buffer = self._buffer, []
+                due = [retry for retry in self._retries if final or retry[0] <= now]
+                self._retries = [retry for retry in self._retries if not (final or retry[0] <= now)]
+                self._retry_rows -= sum(len(batch) for _, _, batch in due)
+            batches = [(attempts, batch) for _, attempts, batch in due]
+            batches += [(0, rows[start:start + self.batch_size]) for start in range(0, len(rows), self.batch_size)]
+            written = 0
+            for attempts, batch in batches:
+                try:
+                    with self.engine.begin() as connection:
+                        connection.execute(insert(AuditLog).values(batch))
+                except Exception:
+                    logger.exception("Failed to write %d audit log rows (attempt %d)", len(batch), attempts + 1)
+                    self._failed(batch, attempts + 1, final)
+                    continue
+                written += len(batch)
+                with self._cond:
+                    self.flushed += len(batch)
+                    self.batches += 1
+            return written
+
+    def _failed(self, batch: List[Dict[str, Any]], attempts: int, final: bool) -> None:
+        """Queue a failed batch for a later attempt, or give up on it."""
+        if not final and attempts < self.max_attempts:
+            not_before = time.monotonic() + self.retry_backoff * 2 ** (attempts - 1)
+            with self._cond:
+                self._retries.append((not_before, attempts, batch))
+                self._retry_rows += len(batch)
+                self.retries += 1
+            return
+        for record in batch:
+            logger.error("Lost audit log entry after %d attempts: %r", attempts, record)
+        with self._cond:
+            self.failed += len(batch)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def start(self) -> None:
+        """Start the flush thread (idempotent; enqueue() calls this)."""
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is not None or self._stopping:
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the flush thread after a final flush."""
+        with self._cond:
+            self._stopping = True
+            thread, self._thread = self._thread, None
+            self._cond.notify()
+        if thread is not None:
+            thread.join(timeout)
+        # Anything queued after the thread's last flush, and one last try for failed batches
+        self.flush(final=True)
+        with self._cond:
+            self._stopping = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "buffered": len(self._buffer),
+                "retrying": self._retry_rows,
+                "max_buffer": self.max_buffer,
+                "enqueued": self.enqueued,
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "retries": self.retries,
+                "failed": self.failed,
+            }
+
+
+audit_writer = AuditWriter(
+    default_engine,
+    max_buffer=settings.AUDIT_BUFFER_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_attempts=settings.AUDIT_MAX_ATTEMPTS,
+    retry_backoff=settings.AUDIT_RETRY_BACKOFF_SECONDS,
+)
+# Last-chance flush for scripts and workers that exit without the app's shutdown hook
+atexit.register(audit_writer.close)
+
 
 def create_audit_log(
-    db: Session,
+    db: Optional[Session] = None,
+    *,
     user_id: int,
     action: str,
     target_type: str,
     target_id: Optional[int] = None,
-    details: Optional[Dict[str, Any]] = None
+    details: Optional[Dict[str, Any]] = None,
+    in_transaction: bool = False,
 ):
     """
-    Create a new audit log entry.
+    Record an audit log entry.
+
+    Queued for the background writer by default. With in_transaction=True it
+    is added to `db` and committed by the caller along with its own changes.
     """
-    try:
-        log = AuditLog(
-            user_id=user_id,
-            action=action,
-            target_type=target_type,
-            target_id=target_id,
-            details=details
-        )
-        db.add(log)
-        db.commit()
-    except Exception as e:
-        # Log error but don't fail the request
-        print(f"Failed to create audit log: {e}")
-        db.rollback()
+    record = {
+        "user_id": user_id,
+        "action": action,
+        "target_type": target_type,
+        "target_id": target_id,
+        "details": details,
+        # Time of the event, not of the flush
+        "created_at": datetime.now(timezone.utc),
+    }
+    if in_transaction:
+        db.add(AuditLog(**record))
+        return
+    if not audit_writer.enqueue(record):
+        logger.warning("Audit buffer full, dropped %s %s/%s", action, target_type, target_id)
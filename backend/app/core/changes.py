@@ -0,0 +1,348 @@
+"""
+Change tracking and conditional GETs.
+
+Every flush that creates, modifies or deletes one of a user's tasks,
+subtasks, boards, groups or plans bumps that user's row in change_counters,
+inside the same transaction. The counter therefore changes exactly when
+something the user can list changes, and reading it is a primary-key lookup
+of one tiny row.
+
+GET endpoints derive a weak ETag from it. When the client's If-None-Match
+still matches, they answer 304 before running their real queries, so no ORM
+objects are loaded and no body is built.
+
+Each flush also records, in change_log, the new sequence of every such row
+it wrote (tombstones for deletes), which GET /sync reads to send a client
+only what changed after its cursor. The counter row stays locked until the
+writing transaction commits, so a user's sequences commit in order and a
+cursor never skips a change committed later.
+
+The same flush bumps boards.version of every board whose snapshot it changes
+(the board, its groups, their tasks and subtasks), which keys the board
+snapshot ETag and cache (app.core.snapshots), and queues an event per board
+listing the rows it changed. The events are published to WebSocket
+subscribers (app.core.realtime) after the transaction commits and dropped if
+it rolls back.
+
+Writes that bypass the ORM unit of work (Core UPDATE/DELETE, bulk
+operations) must call bump_change_seq(), log_changes(),
+bump_board_versions() and queue_board_events() themselves.
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.core.realtime import board_events
+from app.core.responses import wants_msgpack
+from app.models.board import Board, Group
+from app.models.change import ChangeCounter, ChangeLogEntry
+from app.models.plan import Plan
+from app.models.task import Subtask, Task
+
+# Browsers and HTTP clients keep the copy but revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+_USER_OWNED = (Task, Board, Plan)
+
+# Rows GET /sync reports, by change_log.entity
+SYNCED = {"task": Task, "subtask": Subtask, "board": Board, "group": Group, "plan": Plan}
+
+# Rows per change_log upsert, well under the bind parameter limits
+_LOG_BATCH = 1000
+
+
+def dialect_insert(connection: Connection, table: Any):
+    """INSERT construct with ON CONFLICT support for the connection's dialect, if it has one."""
+    name = connection.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(table)
+
+
+def bump_change_seq(connection: Connection, user_ids: Iterable[int]) -> Dict[int, int]:
+    """Increment the change counter of each user, creating missing rows; return the new values."""
+    # Sorted so concurrent transactions lock the rows in the same order
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return {}
+    insert = dialect_insert(connection, ChangeCounter)
+    if insert is not None:
+        result = connection.execute(
+            insert.values([{"user_id": user_id, "seq": 1} for user_id in user_ids])
+            .on_conflict_do_update(index_elements=[ChangeCounter.user_id], set_={"seq": ChangeCounter.seq + 1})
+            .returning(ChangeCounter.user_id, ChangeCounter.seq)
+        )
+        return dict(result.all())
+    for user_id in user_ids:
+        result = connection.execute(
+            update(ChangeCounter).where(ChangeCounter.user_id == user_id).values(seq=ChangeCounter.seq + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(ChangeCounter.__table__.insert().values(user_id=user_id, seq=1))
+    return dict(connection.execute(
+        select(ChangeCounter.user_id, ChangeCounter.seq).where(ChangeCounter.user_id.in_(user_ids))
+    ).all())
+
+
+def log_changes(connection: Connection, seqs: Dict[int, int], entries: Iterable[Tuple[int, str, int, bool]]) -> None:
+    """
+    Move the change_log entry of each (user ID, entity, row ID, deleted) to the
+    user's sequence in `seqs` (as returned by bump_change_seq), creating it if new.
+    """
+    # One row per key: an upsert may not touch the same row twice
+    rows = list({
+        (user_id, entity, entity_id): {
+            "user_id": user_id, "entity": entity, "entity_id": entity_id, "seq": seqs[user_id], "deleted": deleted,
+        }
+        for user_id, entity, entity_id, deleted in entries
+    }.values())
+    insert = dialect_insert(connection, ChangeLogEntry)
+    for start in range(0, len(rows), _LOG_BATCH):
+        batch = rows[start:start + _LOG_BATCH]
+        if insert is not None:
+            connection.execute(
+                insert.values(batch).on_conflict_do_update(
+                    index_elements=[ChangeLogEntry.user_id, ChangeLogEntry.entity, ChangeLogEntry.entity_id],
+                    set_={"seq": insert.excluded.seq, "deleted": insert.excluded.deleted},
+                )
+            )
+            continue
+        for row in batch:
+            connection.execute(
+                ChangeLogEntry.__table__.delete().where(
+                    ChangeLogEntry.user_id == row["user_id"],
+                    ChangeLogEntry.entity == row["entity"],
+                    ChangeLogEntry.entity_id == row["entity_id"],
+                )
+            )
+        connection.execute(ChangeLogEntry.__table__.insert(), batch)
+
+
+def bump_board_versions(connection: Connection, board_ids: Iterable[int]) -> Dict[int, int]:
+    """Increment the snapshot version of each board; return the new versions."""
+    board_ids = sorted(set(board_ids))
+    if not board_ids:
+        return {}
+    boards = Board.__table__
+    result = connection.execute(
+        update(boards)
+        .where(boards.c.id.in_(board_ids))
+        # Keep updated_at: it describes the board's own fields
+        .values(version=boards.c.version + 1, updated_at=boards.c.updated_at)
+        .returning(boards.c.id, boards.c.version)
+    )
+    return dict(result.all())
+
+
+def _previous(obj: Any, attribute: str) -> Any:
+    """Value a column attribute had before this flush changed it, or None."""
+    deleted = inspect(obj).attrs[attribute].history.deleted
+    return deleted[0] if deleted else None
+
+
+def _parent_values(session: Session, model: Any, ids: Set[int], attribute: str) -> Dict[int, Any]:
+    """`attribute` of each parent row by ID, from the session where loaded, otherwise in one query."""
+    values: Dict[int, Any] = {}
+    missing = set()
+    for parent_id in ids:
+        parent = session.identity_map.get(identity_key(model, parent_id))
+        if parent is None:
+            missing.add(parent_id)
+        else:
+            values[parent_id] = getattr(parent, attribute)
+    if missing:
+        column = getattr(model, attribute)
+        values.update(session.connection().execute(select(model.id, column).where(model.id.in_(missing))).all())
+    return {parent_id: value for parent_id, value in values.items() if value is not None}
+
+
+def _changed_owners(session: Session, changed: List[Any]) -> Dict[Any, int]:
+    """Owner of each tracked row this flush will insert, update or delete."""
+    owners: Dict[Any, int] = {}
+    by_task: Dict[int, List[Any]] = defaultdict(list)
+    by_board: Dict[int, List[Any]] = defaultdict(list)
+    for obj in changed:
+        if isinstance(obj, _USER_OWNED):
+            if obj.user_id is not None:
+                owners[obj] = obj.user_id
+        elif isinstance(obj, Subtask):
+            # A subtask added through task.subtasks has no task_id until the flush
+            parent = obj.__dict__.get("task")
+            if parent is not None and parent.user_id is not None:
+                owners[obj] = parent.user_id
+            elif obj.task_id is not None:
+                by_task[obj.task_id].append(obj)
+        elif isinstance(obj, Group):
+            parent = obj.__dict__.get("board")
+            if parent is not None and parent.user_id is not None:
+                owners[obj] = parent.user_id
+            elif obj.board_id is not None:
+                by_board[obj.board_id].append(obj)
+
+    # Parents already in the session (e.g. loaded with a cascading delete) need no query
+    for model, children in ((Task, by_task), (Board, by_board)):
+        if children:
+            for parent_id, user_id in _parent_values(session, model, set(children), "user_id").items():
+                owners.update((child, user_id) for child in children[parent_id])
+    return owners
+
+
+def _entity(obj: Any) -> str:
+    return next(entity for entity, model in SYNCED.items() if isinstance(obj, model))
+
+
+def _changed_boards(session: Session, changed: List[Any]) -> Dict[Any, Set[int]]:
+    """Boards whose snapshot each changed row alters: the board itself, or the board of its group or task."""
+    boards: Dict[Any, Set[int]] = defaultdict(set)
+    groups: Dict[Any, Set[int]] = defaultdict(set)
+    tasks: Dict[Any, int] = {}
+    for obj in changed:
+        if isinstance(obj, Board):
+            if obj.id is not None:
+                boards[obj].add(obj.id)
+        elif isinstance(obj, Group):
+            parent = obj.__dict__.get("board")
+            candidates = (obj.board_id, _previous(obj, "board_id"), parent.id if parent is not None else None)
+            boards[obj].update(board_id for board_id in candidates if board_id is not None)
+        elif isinstance(obj, Task):
+            # Moving a task changes the board it left as well as the one it joined
+            parent = obj.__dict__.get("group")
+            candidates = (obj.group_id, _previous(obj, "group_id"), parent.id if parent is not None else None)
+            groups[obj].update(group_id for group_id in candidates if group_id is not None)
+        elif isinstance(obj, Subtask):
+            parent = obj.__dict__.get("task")
+            if parent is not None:
+                if parent.group_id is not None:
+                    groups[obj].add(parent.group_id)
+            elif obj.task_id is not None:
+                tasks[obj] = obj.task_id
+
+    if tasks:
+        task_groups = _parent_values(session, Task, set(tasks.values()), "group_id")
+        for obj, task_id in tasks.items():
+            if task_id in task_groups:
+                groups[obj].add(task_groups[task_id])
+    group_ids = set().union(*groups.values())
+    if group_ids:
+        group_boards = _parent_values(session, Group, group_ids, "board_id")
+        for obj, obj_groups in groups.items():
+            boards[obj].update(group_boards[group_id] for group_id in obj_groups if group_id in group_boards)
+    return {obj: obj_boards for obj, obj_boards in boards.items() if obj_boards}
+
+
+def queue_board_events(
+    session: Session, versions: Dict[int, int], changes: Iterable[Tuple[int, str, int, str]]
+) -> None:
+    """
+    Queue a board event per board in `versions` (board ID -> new version, as
+    returned by bump_board_versions) listing its (board ID, entity, row ID,
+    created/updated/deleted) changes; they are published once the session commits.
+    """
+    pending = session.info.setdefault("board_events", {})
+    for board_id, version in versions.items():
+        pending.setdefault(board_id, {"version": version, "changes": []})["version"] = version
+    for board_id, entity, entity_id, op in changes:
+        if board_id in pending:
+            pending[board_id]["changes"].append({"entity": entity, "id": entity_id, "op": op})
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_on_flush(session: Session, flush_context, instances) -> None:
+    dirty = [obj for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    changed = [*session.new, *dirty, *session.deleted]
+    if not changed:
+        return
+    deleted = session.deleted
+    owners = _changed_owners(session, changed)
+    if owners:
+        seqs = bump_change_seq(session.connection(), owners.values())
+        # New rows get their IDs during the flush; the log and events are built after it
+        session.info["change_log"] = (seqs, [(obj, user_id, obj in deleted) for obj, user_id in owners.items()])
+    boards = _changed_boards(session, changed)
+    if boards:
+        versions = bump_board_versions(session.connection(), set().union(*boards.values()))
+        new = session.new
+        session.info["board_changes"] = (versions, [
+            (obj, obj_boards, "created" if obj in new else "deleted" if obj in deleted else "updated")
+            for obj, obj_boards in boards.items()
+        ])
+
+
+@event.listens_for(Session, "after_flush")
+def _log_on_flush(session: Session, flush_context) -> None:
+    pending = session.info.pop("change_log", None)
+    if pending is not None:
+        seqs, changed = pending
+        log_changes(
+            session.connection(),
+            seqs,
+            [(user_id, _entity(obj), obj.id, deleted) for obj, user_id, deleted in changed if obj.id is not None],
+        )
+    pending = session.info.pop("board_changes", None)
+    if pending is not None:
+        versions, changed = pending
+        queue_board_events(session, versions, [
+            (board_id, _entity(obj), obj.id, op) for obj, obj_boards, op in changed for board_id in obj_boards
+        ])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_on_commit(session: Session) -> None:
+    for board_id, board_event in session.info.pop("board_events", {}).items():
+        board_events.publish(board_id, board_event["version"], board_event["changes"])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    if not session.in_transaction():
+        for key in ("change_log", "board_changes", "board_events"):
+            session.info.pop(key, None)
+
+
+async def get_change_seq(db: AsyncSession, user_id: int) -> int:
+    return await db.scalar(select(ChangeCounter.seq).where(ChangeCounter.user_id == user_id)) or 0
+
+
+def make_etag(request: Request, user_id: int, seq: int) -> str:
+    """Weak ETag for everything a user can list, in the representation the request asks for."""
+    representation = "msgpack" if wants_msgpack(request) else "json"
+    digest = hashlib.blake2b(f"{user_id}:{seq}:{representation}".encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of If-None-Match against our ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    ours = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == ours for candidate in header.split(","))
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={**etag_headers(etag), "Vary": "Accept"})
+
+
+async def check_not_modified(db: AsyncSession, request: Request, user_id: int) -> Tuple[str, Optional[Response]]:
+    """(etag, 304 response or None) for a conditional GET of the user's data."""
+    etag = make_etag(request, user_id, await get_change_seq(db, user_id))
+    return etag, (not_modified(etag) if etag_matches(request, etag) else None)
@@ -0,0 +1,261 @@
+"""
+Response compression.
+
+CompressionMiddleware behaves like Starlette's GZipMiddleware (size
+threshold, streaming responses, excluded media types, large bodies
+compressed off the event loop) but is written against the plain ASGI
+interface rather than that middleware's internals. It adds brotli, chosen
+when the client accepts `br` and the brotli package is installed, and byte
+counters per encoding so /metrics can report the compression ratio
+actually achieved.
+
+Streaming responses are compressed chunk by chunk and flushed after every
+chunk, so clients see data as soon as it is produced.
+"""
+
+import threading
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import anyio
+import anyio.lowlevel
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Already compressed, or streamed to clients that must see each event at once
+EXCLUDED_CONTENT_TYPES = (
+    "application/grpc",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "audio/*",
+    "font/woff",
+    "font/woff2",
+    "image/avif",
+    "image/gif",
+    "image/jpeg",
+    "image/png",
+    "image/webp",
+    "text/event-stream",
+    "video/*",
+)
+
+_limiter: anyio.lowlevel.RunVar[anyio.CapacityLimiter] = anyio.lowlevel.RunVar("compression_limiter")
+
+
+@lru_cache()
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+class CompressionStats:
+    """Thread-safe bytes-before / bytes-after counters per content encoding."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._encodings: Dict[str, Dict[str, int]] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, finished: bool) -> None:
+        with self._lock:
+            counters = self._encodings.setdefault(encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0})
+            counters["bytes_in"] += bytes_in
+            counters["bytes_out"] += bytes_out
+            if finished:
+                counters["responses"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._encodings.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {}
+            for encoding, counters in self._encodings.items():
+                result[encoding] = {
+                    **counters,
+                    # Original size / compressed size, e.g. 6.5 means 6.5x smaller
+                    "ratio": round(counters["bytes_in"] / counters["bytes_out"], 2) if counters["bytes_out"] else 0.0,
+                }
+            return result
+
+
+compression_stats = CompressionStats()
+
+
+class _GzipEncoder:
+    content_encoding = "gzip"
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        return self._compressor.compress(body) + self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    content_encoding = "br"
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = _brotli().Compressor(quality=quality)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        if more_body:
+            return self._compressor.process(body) + self._compressor.flush()
+        return self._compressor.process(body) + self._compressor.finish()
+
+
+def _compression_limiter() -> anyio.CapacityLimiter:
+    """Worker threads for large bodies, kept apart from the threads of sync endpoints."""
+    try:
+        return _limiter.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(40)
+        _limiter.set(limiter)
+        return limiter
+
+
+class _Responder:
+    """
+    The send() of one response: holds back http.response.start until the
+    first body chunk shows whether (and how) to encode, then rewrites the
+    headers and encodes every chunk.
+    """
+
+    def __init__(self, middleware: "CompressionMiddleware", encoder: Optional[Any], send: Send) -> None:
+        self.middleware = middleware
+        self.encoder = encoder
+        self.send = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+
+    def _excluded(self, headers: Headers) -> bool:
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        media_types = {media_type, media_type.partition("/")[0] + "/*"}
+        if media_type.startswith("application/grpc+"):
+            media_types.add("application/grpc")
+        return not media_types.isdisjoint(self.middleware.exclude_content_types)
+
+    async def _encode(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= self.middleware.thread_minimum_size:
+            # Compressing large bodies inline would block the event loop
+            encoded = await anyio.to_thread.run_sync(
+                self.encoder.compress, body, more_body, limiter=_compression_limiter()
+            )
+        else:
+            encoded = self.encoder.compress(body, more_body)
+        compression_stats.record(self.encoder.content_encoding, len(body), len(encoded), not more_body)
+        return encoded
+
+    async def __call__(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or message["status"] == 206 or self._excluded(headers)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if kind != "http.response.body" or self.passthrough:
+            # e.g. http.response.pathsend, which is sent as-is
+            if self.start is not None:
+                start, self.start = self.start, None
+                await self.send(start)
+            await self.send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.start is None:
+            # Later chunk of a streaming response
+            if self.encoder is not None:
+                message = {**message, "body": await self._encode(body, more_body)}
+            await self.send(message)
+            return
+
+        start, self.start = self.start, None
+        if more_body or len(body) >= self.middleware.minimum_size:
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoder is not None:
+                body = await self._encode(body, more_body)
+                headers["Content-Encoding"] = self.encoder.content_encoding
+                if more_body or start.get("trailers", False):
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+        await self.send(start)
+        await self.send(message)
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}; `gzip;q=0` means "not gzip"."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class CompressionMiddleware:
+    """Brotli or gzip, negotiated from Accept-Encoding, for responses of at least minimum_size bytes."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        *,
+        thread_minimum_size: int = 128 * 1024,
+        exclude_content_types: Tuple[str, ...] = EXCLUDED_CONTENT_TYPES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+        self.exclude_content_types = tuple(
+            content_type.partition(";")[0].strip().lower() for content_type in exclude_content_types
+        )
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = _accepted_encodings(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        # Our preference among the codings the client accepts at all
+        for coding in ("br", "gzip"):
+            if coding == "br" and _brotli() is None:
+                continue
+            if accepted.get(coding, wildcard) > 0:
+                return coding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = self.choose_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+        if coding == "br":
+            encoder = _BrotliEncoder(self.brotli_quality)
+        elif coding == "gzip":
+            encoder = _GzipEncoder(self.gzip_level)
+        else:
+            encoder = None
+        await self.app(scope, receive, _Responder(self, encoder, send))
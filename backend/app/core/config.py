@@ -8,10 +8,75 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./planner.db"  # Default to SQLite for local dev
     
+    # Database connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 to disable
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_PRE_PING: bool = True
+    
+    # Read replicas - comma-separated URLs, empty to read from the primary
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_RETRY_SECONDS: int = 30  # how long an unreachable replica is skipped
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # reads stay on the primary after a client writes
+    
+    @property
+    def DATABASE_REPLICAS(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
+    # SQLite tuning (only used when DATABASE_URL is sqlite)
+    SQLITE_TUNING: bool = True  # WAL journal, relaxed fsync, mmap and busy timeout
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # NORMAL is durable across app crashes in WAL mode
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes (256 MiB)
+    SQLITE_CACHE_SIZE: int = -65536  # negative values are KiB (64 MiB)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_SERIALIZE_WRITES: bool = True  # one writer at a time per process
+    
+    # Schema - refuse to start unless the database is at the Alembic head revision
+    DB_SCHEMA_CHECK: bool = True
+    
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production-use-openssl-rand-hex-32"
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # short-lived: carries status and team-role claims
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    
+    # Authenticated-user cache (per worker process)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000  # users, 0 to disable
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0  # upper bound on staleness across workers
+    
+    # Encoded board snapshots (per worker process), checked against boards.version
+    BOARD_SNAPSHOT_CACHE_SIZE: int = 1000  # board x representation entries, 0 to disable
+    
+    # WebSocket /ws/boards/{id} events
+    REALTIME_BROADCAST: str = "local"  # local (single worker) or postgres (LISTEN/NOTIFY across workers)
+    REALTIME_QUEUE_SIZE: int = 100  # events per subscriber; a slower client is told to resync
+    REALTIME_MAX_CHANGES: int = 100  # rows per event; larger changes are sent as a resync
+    
+    # POST/PATCH/DELETE /tasks/bulk
+    TASK_BULK_MAX_ITEMS: int = 500  # per request; larger requests get 400
+    
+    # Kanban position keys (app.core.ranking)
+    RANK_REBALANCE_LENGTH: int = 16  # a longer key makes a move rebalance its list in the background
+    
+    # Password hashing (bcrypt) process pool, per worker process
+    PASSWORD_HASH_WORKERS: int = 2  # 0 hashes on the default thread pool instead
+    PASSWORD_HASH_MAX_PENDING: int = 32  # running + queued; beyond this requests get 503
+    
+    # Audit log writer (per worker process)
+    AUDIT_BUFFER_SIZE: int = 10000  # queued rows; beyond this new entries are dropped
+    AUDIT_BATCH_SIZE: int = 500  # rows per INSERT
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_MAX_ATTEMPTS: int = 5  # per batch; after that its rows are logged and dropped
+    AUDIT_RETRY_BACKOFF_SECONDS: float = 1.0  # before the first retry, doubled per attempt
+    
+    # Response compression (brotli if installed and accepted, else gzip)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller responses are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; higher costs much more CPU per response
+    
+    # GET /metrics - bearer token for scrapers; empty allows superusers only
+    METRICS_TOKEN: str = ""
     
     # CORS - parse as string and split
     ALLOWED_ORIGINS_STR: str = "http://localhost:3000,http://localhost:3001,http://localhost:8000"
@@ -35,9 +100,19 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
+    SMTP_START_TLS: bool = True  # False only for local relays / test servers
     EMAIL_FROM: str = "noreply@deepfocusplanner.com"
     EMAIL_FROM_NAME: str = "Deep Focus Planner"
     
+    # Email outbox sender (background thread per worker process)
+    EMAIL_SENDER_ENABLED: bool = True  # False when another process drains the outbox
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_POLL_INTERVAL_SECONDS: float = 2.0
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0  # doubles after each failed attempt
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_CLAIM_LEASE_SECONDS: float = 300.0  # claimed rows reappear if a sender dies mid-batch
+    
     # OAuth Configuration
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
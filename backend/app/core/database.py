@@ -1,18 +1,95 @@
+from typing import Any, AsyncGenerator, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
+from app.core.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
+from app.core.sqlite import apply_sqlite_pragmas, is_sqlite_url, serialize_sqlite_writes
+
+# Async drivers used for each sync driver family
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+}
+
+
+def get_async_database_url(database_url: str) -> URL:
+    """
+    Translate a sync DATABASE_URL into its async-driver equivalent.
+
+    sqlite:///./planner.db        -> sqlite+aiosqlite:///./planner.db
+    postgresql://user@host/db     -> postgresql+psycopg://user@host/db
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def _is_memory_database(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def get_engine_options(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build create_engine() keyword arguments from the pool settings.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool; every
+    other database gets an instrumented queue pool sized from Settings.
+    """
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Verify connections before using
+        "echo": settings.ENVIRONMENT == "development",  # Log SQL in development
+    }
+    if _is_memory_database(make_url(database_url)):
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=settings.ENVIRONMENT == "development"  # Log SQL in development
+engine = create_engine(settings.DATABASE_URL, **get_engine_options(settings.DATABASE_URL))
+instrument_engine(engine, "primary")
+
+# Async engine for endpoints that run on the event loop
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    **get_engine_options(settings.DATABASE_URL, is_async=True)
 )
+instrument_engine(async_engine.sync_engine, "primary_async")
+
+if is_sqlite_url(settings.DATABASE_URL) and settings.SQLITE_TUNING:
+    apply_sqlite_pragmas(engine)
+    apply_sqlite_pragmas(async_engine.sync_engine)
+    if settings.SQLITE_SERIALIZE_WRITES:
+        serialize_sqlite_writes(engine)
+        serialize_sqlite_writes(async_engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Objects stay usable after commit; async code cannot lazy-refresh expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -27,3 +104,12 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting an async database session.
+    Usage: db: AsyncSession = Depends(get_async_db)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,26 +1,175 @@
 """
-Email service for sending verification and password reset emails.
-Supports both SendGrid and SMTP providers.
+Email service for verification and password reset emails.
+
+Request handlers only queue messages in the email_outbox table; the
+background sender in app.core.email_sender delivers them through a
+SendGrid or SMTP transport.
 """
 
-from typing import Optional
 import logging
+import smtplib
+from email.message import EmailMessage
+from typing import Optional
+
 from app.core.config import settings
+from app.models.email_outbox import EmailOutbox
 
 logger = logging.getLogger(__name__)
 
 
-async def send_email(
+class EmailDeliveryError(Exception):
+    """The provider did not accept a message. The sender retries it later."""
+
+
+class SMTPTransport:
+    """
+    Sends over one SMTP connection, opened on first use and kept for
+    following messages until close() or a connection error.
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        start_tls: bool = True,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self._connection: Optional[smtplib.SMTP] = None
+        self.connections_opened = 0
+    
+    def _connect(self) -> smtplib.SMTP:
+        if self._connection is None:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.start_tls:
+                    connection.starttls()
+                if self.username:
+                    connection.login(self.username, self.password)
+            except Exception:
+                connection.close()
+                raise
+            self._connection = connection
+            self.connections_opened += 1
+        return self._connection
+    
+    def send(self, to_email: str, subject: str, html_content: str, from_email: str, from_name: Optional[str]) -> None:
+        message = EmailMessage()
+        message["From"] = f"{from_name} <{from_email}>" if from_name else from_email
+        message["To"] = to_email
+        message["Subject"] = subject
+        message.set_content("Please view this email in an HTML-capable email client.")
+        message.add_alternative(html_content, subtype="html")
+        
+        try:
+            reused = self._connection is not None
+            try:
+                self._connect().send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                if not reused:
+                    raise
+                # The server closed the idle connection since the last batch
+                self.close()
+                self._connect().send_message(message)
+        except (smtplib.SMTPException, OSError) as e:
+            # Drop the connection so the next message starts from a clean session
+            self.close()
+            raise EmailDeliveryError(f"SMTP error: {e}") from e
+    
+    def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.quit()
+            except Exception:
+                connection.close()
+
+
+class SendGridTransport:
+    """Sends through the SendGrid v3 API on one pooled keep-alive HTTP client."""
+    
+    API_URL = "https://api.sendgrid.com/v3/mail/send"
+    
+    def __init__(self, api_key: str, timeout: float = 30.0):
+        self.api_key = api_key
+        self.timeout = timeout
+        self._client = None
+    
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            
+            self._client = httpx.Client(
+                timeout=self.timeout,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+        return self._client
+    
+    def send(self, to_email: str, subject: str, html_content: str, from_email: str, from_name: Optional[str]) -> None:
+        if not self.api_key:
+            raise EmailDeliveryError("SendGrid API key not configured")
+        
+        sender = {"email": from_email}
+        if from_name:
+            sender["name"] = from_name
+        payload = {
+            "personalizations": [{"to": [{"email": to_email}]}],
+            "from": sender,
+            "subject": subject,
+            "content": [{"type": "text/html", "value": html_content}],
+        }
+        try:
+            response = self._get_client().post(self.API_URL, json=payload)
+        except Exception as e:
+            raise EmailDeliveryError(f"SendGrid error: {e}") from e
+        if response.status_code not in (200, 201, 202):
+            raise EmailDeliveryError(f"SendGrid returned status {response.status_code}: {response.text[:200]}")
+    
+    def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+def get_transport():
+    """Transport for the configured EMAIL_PROVIDER."""
+    if settings.EMAIL_PROVIDER == "sendgrid":
+        return SendGridTransport(settings.SENDGRID_API_KEY)
+    if settings.EMAIL_PROVIDER == "smtp":
+        return SMTPTransport(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            start_tls=settings.SMTP_START_TLS,
+        )
+    raise ValueError(f"Unknown email provider: {settings.EMAIL_PROVIDER}")
+
+
+def queue_email(
+    db,
     to_email: str,
     subject: str,
     html_content: str,
     from_email: Optional[str] = None,
     from_name: Optional[str] = None
-) -> bool:
+) -> EmailOutbox:
     """
-    Send an email using configured provider (SendGrid or SMTP).
+    Add an email to the outbox in the caller's session (sync or async).
+    
+    Nothing is sent here: the row commits with the caller's transaction and
+    the background sender (app.core.email_sender) delivers it, retrying with
+    backoff if the provider is unavailable.
     
     Args:
+        db: Session the outbox row is added to
         to_email: Recipient email address
         subject: Email subject
         html_content: HTML email body
@@ -28,100 +177,17 @@ async def send_email(
         from_name: Sender name (defaults to config)
         
     Returns:
-        True if sent successfully, False otherwise
+        The pending outbox row
     """
-    from_email = from_email or settings.EMAIL_FROM
-    from_name = from_name or settings.EMAIL_FROM_NAME
-    
-    try:
-        if settings.EMAIL_PROVIDER == "sendgrid":
-            return await _send_with_sendgrid(to_email, subject, html_content, from_email, from_name)
-        elif settings.EMAIL_PROVIDER == "smtp":
-            return await _send_with_smtp(to_email, subject, html_content, from_email, from_name)
-        else:
-            logger.error(f"Unknown email provider: {settings.EMAIL_PROVIDER}")
-            return False
-    except Exception as e:
-        logger.error(f"Failed to send email to {to_email}: {str(e)}")
-        return False
-
-
-async def _send_with_sendgrid(
-    to_email: str,
-    subject: str,
-    html_content: str,
-    from_email: str,
-    from_name: str
-) -> bool:
-    """Send email using SendGrid API."""
-    try:
-        from sendgrid import SendGridAPIClient
-        from sendgrid.helpers.mail import Mail, Email, To, Content
-        
-        if not settings.SENDGRID_API_KEY:
-            logger.warning("SendGrid API key not configured, email not sent")
-            return False
-        
-        message = Mail(
-            from_email=Email(from_email, from_name),
-            to_emails=To(to_email),
-            subject=subject,
-            html_content=Content("text/html", html_content)
-        )
-        
-        sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-        response = sg.send(message)
-        
-        if response.status_code in [200, 201, 202]:
-            logger.info(f"Email sent successfully to {to_email}")
-            return True
-        else:
-            logger.error(f"SendGrid returned status {response.status_code}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"SendGrid error: {str(e)}")
-        return False
-
-
-async def _send_with_smtp(
-    to_email: str,
-    subject: str,
-    html_content: str,
-    from_email: str,
-    from_name: str
-) -> bool:
-    """Send email using SMTP."""
-    try:
-        import aiosmtplib
-        from email.message import EmailMessage
-        
-        if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
-            logger.warning("SMTP credentials not configured, email not sent")
-            return False
-        
-        message = EmailMessage()
-        message["From"] = f"{from_name} <{from_email}>"
-        message["To"] = to_email
-        message["Subject"] = subject
-        message.set_content("Please view this email in an HTML-capable email client.")
-        message.add_alternative(html_content, subtype="html")
-        
-        await aiosmtplib.send(
-            message,
-            hostname=settings.SMTP_HOST,
-            port=settings.SMTP_PORT,
-            username=settings.SMTP_USER,
-            password=settings.SMTP_PASSWORD,
-            start_tls=True,
-        )
-        
-        logger.info(f"Email sent successfully to {to_email} via SMTP")
-        return True
-        
-    except Exception as e:
-        logger.error(f"SMTP error: {str(e)}")
-        return False
+    email = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        html_content=html_content,
+        from_email=from_email or settings.EMAIL_FROM,
+        from_name=from_name or settings.EMAIL_FROM_NAME,
+    )
+    db.add(email)
+    return email
 
 
 def get_verification_email_html(verification_link: str, user_name: Optional[str] = None) -> str:
@@ -286,44 +352,48 @@ def get_password_reset_email_html(reset_link: str, user_name: Optional[str] = No
     """
 
 
-async def send_verification_email(to_email: str, verification_token: str, user_name: Optional[str] = None) -> bool:
+def queue_verification_email(db, to_email: str, verification_token: str, user_name: Optional[str] = None) -> EmailOutbox:
     """
-    Send email verification email to user.
+    Queue the email verification email for a user.
     
     Args:
+        db: Session the outbox row is added to
         to_email: User's email address
         verification_token: Verification token
         user_name: User's name (optional)
         
     Returns:
-        True if sent successfully
+        The pending outbox row
     """
     verification_link = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
     html_content = get_verification_email_html(verification_link, user_name)
     
-    return await send_email(
+    return queue_email(
+        db,
         to_email=to_email,
         subject="Verify Your Email - Deep Focus Planner",
         html_content=html_content
     )
 
 
-async def send_password_reset_email(to_email: str, reset_token: str, user_name: Optional[str] = None) -> bool:
+def queue_password_reset_email(db, to_email: str, reset_token: str, user_name: Optional[str] = None) -> EmailOutbox:
     """
-    Send password reset email to user.
+    Queue the password reset email for a user.
     
     Args:
+        db: Session the outbox row is added to
         to_email: User's email address
         reset_token: Password reset token
         user_name: User's name (optional)
         
     Returns:
-        True if sent successfully
+        The pending outbox row
     """
     reset_link = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
     html_content = get_password_reset_email_html(reset_link, user_name)
     
-    return await send_email(
+    return queue_email(
+        db,
         to_email=to_email,
         subject="Reset Your Password - Deep Focus Planner",
         html_content=html_content
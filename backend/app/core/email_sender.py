@@ -0,0 +1,204 @@
+"""
+Background delivery of the email outbox.
+
+Handlers add EmailOutbox rows in their own transaction and return; an
+EmailSender thread per worker process claims due rows in batches and sends
+them over one provider connection (a keep-alive HTTP client for SendGrid,
+one SMTP session for SMTP) that is reused across batches.
+
+Claiming moves a row's next_attempt_at forward by EMAIL_CLAIM_LEASE_SECONDS
+in a single UPDATE ... RETURNING, so several workers can poll the same
+table without sending a message twice; a worker that dies mid-batch leaves
+its rows to be picked up again once the lease runs out. Failed deliveries
+are retried with exponential backoff, up to EMAIL_MAX_ATTEMPTS.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import engine as default_engine
+from app.core.email import get_transport
+from app.models.email_outbox import EmailOutbox, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+
+class EmailSender:
+    """Polls the outbox and delivers due messages in batches on a daemon thread."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        transport_factory: Callable[[], Any] = get_transport,
+        batch_size: int = 50,
+        poll_interval: float = 2.0,
+        max_attempts: int = 8,
+        retry_base_seconds: float = 30.0,
+        retry_max_seconds: float = 3600.0,
+        lease_seconds: float = 300.0,
+    ):
+        self.engine = engine
+        self.transport_factory = transport_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self._transport = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.batches = 0
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Delay before retrying a message that has failed `attempts` times."""
+        return timedelta(seconds=min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempts - 1)))
+
+    def _claim(self, now: datetime) -> List[Any]:
+        due = (
+            (EmailOutbox.status == EmailStatus.PENDING)
+            & (EmailOutbox.next_attempt_at <= now)
+        )
+        with self.engine.begin() as connection:
+            ids = connection.scalars(
+                select(EmailOutbox.id)
+                .where(due)
+                .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not ids:
+                return []
+            # Re-checking `due` makes the claim atomic: a row another worker
+            # claimed in the meantime no longer matches
+            return connection.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(ids), due)
+                .values(
+                    attempts=EmailOutbox.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=self.lease_seconds),
+                )
+                .returning(
+                    EmailOutbox.id,
+                    EmailOutbox.to_email,
+                    EmailOutbox.subject,
+                    EmailOutbox.html_content,
+                    EmailOutbox.from_email,
+                    EmailOutbox.from_name,
+                    EmailOutbox.attempts,
+                )
+            ).all()
+
+    def run_once(self) -> int:
+        """Send one batch of due messages. Returns how many were delivered."""
+        rows = self._claim(datetime.now(timezone.utc))
+        if not rows:
+            return 0
+
+        if self._transport is None:
+            self._transport = self.transport_factory()
+        delivered: List[int] = []
+        failures: List[tuple] = []
+        for row in rows:
+            try:
+                self._transport.send(row.to_email, row.subject, row.html_content, row.from_email, row.from_name)
+            except Exception as e:
+                logger.warning("Email %s to %s failed (attempt %d): %s", row.id, row.to_email, row.attempts, e)
+                failures.append((row, str(e)))
+            else:
+                delivered.append(row.id)
+
+        now = datetime.now(timezone.utc)
+        with self.engine.begin() as connection:
+            if delivered:
+                connection.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(delivered))
+                    .values(status=EmailStatus.SENT, sent_at=now, last_error=None)
+                )
+            for row, error in failures:
+                gave_up = row.attempts >= self.max_attempts
+                connection.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == row.id)
+                    .values(
+                        status=EmailStatus.FAILED if gave_up else EmailStatus.PENDING,
+                        next_attempt_at=now + self.backoff(row.attempts),
+                        last_error=error[:1000],
+                    )
+                )
+
+        gave_up = sum(1 for row, _ in failures if row.attempts >= self.max_attempts)
+        with self._lock:
+            self.batches += 1
+            self.sent += len(delivered)
+            self.failed += gave_up
+            self.retried += len(failures) - gave_up
+        return len(delivered)
+
+    def wake(self) -> None:
+        """Check the outbox now instead of at the next poll (call after committing new mail)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                # Drain full batches back to back, then wait for the next poll
+                while self.run_once() == self.batch_size and not self._stop.is_set():
+                    pass
+            except Exception:
+                logger.exception("Email sender batch failed")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="email-sender", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the thread (after its current batch) and close the provider connection."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None,
+                "batches": self.batches,
+                "sent": self.sent,
+                "retried": self.retried,
+                "failed": self.failed,
+            }
+
+
+email_sender = EmailSender(
+    default_engine,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    poll_interval=settings.EMAIL_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    retry_base_seconds=settings.EMAIL_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.EMAIL_RETRY_MAX_SECONDS,
+    lease_seconds=settings.EMAIL_CLAIM_LEASE_SECONDS,
+)
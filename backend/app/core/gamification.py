@@ -0,0 +1,125 @@
+"""
+Daily statistics maintenance.
+
+daily_stats keeps one row per user per day (uq_daily_stats_user_id_date).
+Writers add to the day's counters with bump_daily_stats(), a single
+
+    INSERT ... ON CONFLICT (user_id, date) DO UPDATE SET x = daily_stats.x + excluded.x
+
+so the row is created on first use, concurrent writers never lose an
+increment, and reading a date range costs O(days) instead of a rescan of
+every task.
+
+Task counters follow the task events of app.core.history, written in the
+same flush, so they are net changes for the day: a task created counts in
+tasks_created; a task entering "done" or "postponed" adds one to
+tasks_completed or tasks_postponed, and leaving that status again (by a
+status change or by being deleted) takes the one off. Done, reopened and
+done again on the same day counts once. completion_rate is the day's
+completed tasks as a percentage of the tasks created that day, between 0
+and 100 (100 when tasks were only completed).
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import case, func, update
+from sqlalchemy.engine import Connection
+
+from app.core.changes import dialect_insert
+from app.models.task_history import DailyStats
+
+# Counters bump_daily_stats() adds to
+COUNTERS = (
+    "tasks_created", "tasks_completed", "tasks_postponed",
+    "focus_sessions_count", "total_focus_minutes", "completed_focus_sessions", "xp_earned",
+)
+
+COMPLETED_STATUS = "done"
+POSTPONED_STATUS = "postponed"
+
+# Counter that follows tasks in each status
+_STATUS_COUNTERS = {COMPLETED_STATUS: "tasks_completed", POSTPONED_STATUS: "tasks_postponed"}
+
+
+def today() -> date:
+    return datetime.utcnow().date()
+
+
+def _completion_rate(created: Any, completed: Any) -> Any:
+    """SQL for the percentage of `created` that is `completed`, from 0 to 100."""
+    return case(
+        (completed <= 0, 0),
+        (completed >= created, 100),
+        else_=completed * 100 // created,
+    )
+
+
+def _python_rate(created: int, completed: int) -> int:
+    if completed <= 0:
+        return 0
+    if completed >= created:
+        return 100
+    return completed * 100 // created
+
+
+def task_event_counts(rows: Iterable[Dict[str, Any]]) -> Dict[int, Dict[str, int]]:
+    """Task counter deltas per user for task_history rows (app.core.history)."""
+    counts: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        user_counts = counts[row["user_id"]]
+        if row["event_type"] == "created":
+            user_counts["tasks_created"] += 1
+        # Deleted rows have no new status, created rows no old one
+        if row["old_status"] in _STATUS_COUNTERS:
+            user_counts[_STATUS_COUNTERS[row["old_status"]]] -= 1
+        if row["new_status"] in _STATUS_COUNTERS:
+            user_counts[_STATUS_COUNTERS[row["new_status"]]] += 1
+    return counts
+
+
+def bump_daily_stats(connection: Connection, deltas: Dict[int, Dict[str, int]], day: Optional[date] = None) -> None:
+    """Add each user's counter deltas (COUNTERS) to their row for `day` (default: today, UTC)."""
+    day = day or today()
+    # Sorted so concurrent transactions lock the rows in the same order
+    rows = []
+    for user_id in sorted(deltas):
+        row = {counter: int(deltas[user_id].get(counter, 0)) for counter in COUNTERS}
+        if any(row.values()):
+            row.update(
+                user_id=user_id, date=day,
+                completion_rate=_python_rate(row["tasks_created"], row["tasks_completed"]),
+            )
+            rows.append(row)
+    if not rows:
+        return
+
+    insert = dialect_insert(connection, DailyStats)
+    if insert is not None:
+        totals = {counter: getattr(DailyStats, counter) + getattr(insert.excluded, counter) for counter in COUNTERS}
+        # Parameters rather than .values(rows): the statement is compiled once and cached
+        connection.execute(
+            insert.on_conflict_do_update(
+                index_elements=[DailyStats.user_id, DailyStats.date],
+                set_={
+                    **totals,
+                    "completion_rate": _completion_rate(totals["tasks_created"], totals["tasks_completed"]),
+                    "updated_at": func.now(),
+                },
+            ),
+            rows,
+        )
+        return
+    for row in rows:
+        totals = {counter: getattr(DailyStats, counter) + row[counter] for counter in COUNTERS}
+        result = connection.execute(
+            update(DailyStats)
+            .where(DailyStats.user_id == row["user_id"], DailyStats.date == day)
+            .values(
+                **totals,
+                completion_rate=_completion_rate(totals["tasks_created"], totals["tasks_completed"]),
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(DailyStats.__table__.insert().values(row))
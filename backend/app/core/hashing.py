@@ -0,0 +1,123 @@
+"""
+Password hashing off the request path.
+
+bcrypt is deliberately slow (~100-300 ms of CPU per call). Run inline or on
+Starlette's threadpool, a burst of logins occupies the threads and the CPU
+that serve every other endpoint. PasswordHasher runs hashing on a small,
+dedicated process pool instead and bounds how many calls may be running or
+queued: past PASSWORD_HASH_MAX_PENDING it raises PasswordHashingBusy right
+away (answered with 503 + Retry-After) rather than letting login latency,
+and everything queued behind it, grow without bound.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+
+def _lower_priority() -> None:
+    # Hashing yields the CPU to the worker that is serving requests
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+class PasswordHashingBusy(Exception):
+    """Too many password hashes are already running or queued."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing is at capacity")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Bounded async front-end to a bcrypt process pool."""
+
+    def __init__(self, workers: int = 2, max_pending: int = 32):
+        # workers=0 hashes on the event loop's default thread pool (no isolation)
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that is running an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_lower_priority,
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusy()
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    def _job_done(self, future: "asyncio.Future[Any]") -> None:
+        if not future.cancelled():
+            future.exception()  # retrieved here too, in case the caller stopped waiting
+        self._release()
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(), func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is freed when the job finishes, not when the caller stops
+        # waiting: a cancelled request's hash keeps running and still counts
+        future.add_done_callback(self._job_done)
+        return await asyncio.shield(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,139 @@
+"""
+Task history capture.
+
+Every flush that creates or deletes a task, or changes its status, writes a
+task_history row for it in the same transaction:
+
+- created: new_status is the task's status; changes holds its name;
+- status_changed / completed (a change to "done"): old and new status, and
+  in changes every tracked field the flush changed, as {field: [old, new]};
+- deleted: old_status is the task's last status; changes holds its name.
+  History has no foreign key to tasks, so it outlives the task.
+
+Edits that leave the status alone are not recorded. The rows are collected
+before the flush, when attribute history still shows the old values, and
+written after it (new tasks need their IDs) as one multi-row INSERT.
+
+The same flush applies the events to the day's task counters in daily_stats
+(app.core.gamification).
+
+Writes that bypass the ORM unit of work (bulk endpoints) build rows with
+created_event(), status_event() and deleted_event() and pass them to
+record_history() themselves.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.gamification import COMPLETED_STATUS, bump_daily_stats, task_event_counts
+from app.models.task import Task
+from app.models.task_history import TaskHistory
+
+# Fields whose changes a status event records
+TRACKED = (
+    "name", "description", "status", "priority", "date", "group_id", "estimated_time", "actual_time", "points_value",
+)
+
+
+def _jsonable(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _row(task_id: Optional[int], user_id: int, event_type: str, old_status, new_status, changes) -> Dict[str, Any]:
+    return {
+        "task_id": task_id, "user_id": user_id, "event_type": event_type,
+        "old_status": old_status, "new_status": new_status, "changes": changes,
+    }
+
+
+def created_event(task_id: Optional[int], user_id: int, name: str, status: str) -> Dict[str, Any]:
+    return _row(task_id, user_id, "created", None, status, {"name": [None, name]})
+
+
+def deleted_event(task_id: int, user_id: int, name: str, status: str) -> Dict[str, Any]:
+    return _row(task_id, user_id, "deleted", status, None, {"name": [name, None]})
+
+
+def status_event(
+    task_id: int, user_id: int, before: Dict[str, Any], after: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Row for a task update that set the TRACKED fields in `after`, which held
+    the values in `before`; None unless the status changed.
+    """
+    old_status, new_status = before.get("status"), after.get("status")
+    if "status" not in after or old_status == new_status:
+        return None
+    changes = {
+        field: [_jsonable(before.get(field)), _jsonable(value)]
+        for field, value in after.items()
+        if field in TRACKED and before.get(field) != value
+    }
+    event_type = "completed" if new_status == COMPLETED_STATUS else "status_changed"
+    return _row(task_id, user_id, event_type, old_status, new_status, changes)
+
+
+def record_history(connection: Connection, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert history rows (from the *_event() functions) with one multi-row
+    INSERT per 1000, and count them in today's daily stats.
+    """
+    # With RETURNING, SQLAlchemy sends executemany parameters as multi-row
+    # INSERTs from one cached compilation ("insertmanyvalues"); insert().values(rows)
+    # would be compiled again on every flush. render_nulls keeps rows with
+    # None in different fields in the same statement.
+    statement = insert(TaskHistory).returning(TaskHistory.id).execution_options(render_nulls=True)
+    connection.execute(statement, rows)
+    bump_daily_stats(connection, task_event_counts(rows))
+
+
+def _updated_fields(task: Task) -> Optional[tuple]:
+    """(before, after) of the TRACKED fields this flush changes, if the status is one of them."""
+    attrs = inspect(task).attrs
+    if not attrs.status.history.has_changes():
+        return None
+    before, after = {}, {}
+    for field in TRACKED:
+        history = attrs[field].history
+        if history.has_changes():
+            before[field] = history.deleted[0] if history.deleted else None
+            after[field] = history.added[0] if history.added else None
+    return before, after
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_on_flush(session: Session, flush_context, instances) -> None:
+    pending = []
+    for obj in session.new:
+        if isinstance(obj, Task):
+            # The column default is only applied by the INSERT
+            status = obj.status if obj.status is not None else Task.__table__.c.status.default.arg
+            pending.append((obj, created_event(None, obj.user_id, obj.name, status)))
+    for obj in session.dirty:
+        if isinstance(obj, Task) and obj not in session.deleted:
+            fields = _updated_fields(obj)
+            row = fields and status_event(obj.id, obj.user_id, *fields)
+            if row:
+                pending.append((obj, row))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            pending.append((obj, deleted_event(obj.id, obj.user_id, obj.name, obj.status)))
+    if pending:
+        session.info.setdefault("task_history", []).extend(pending)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_on_flush(session: Session, flush_context) -> None:
+    pending = session.info.pop("task_history", None)
+    if pending:
+        record_history(session.connection(), [{**row, "task_id": task.id} for task, row in pending])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    if not session.in_transaction():
+        session.info.pop("task_history", None)
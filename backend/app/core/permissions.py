@@ -2,34 +2,53 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.api.deps import get_current_active_user
-from app.models.user import User
-from app.models.team import TeamMember, TeamRole
+from app.core.principals import Principal
+from app.models.team import Team, TeamMember, TeamRole
 
 class TeamPermission:
-    def __init__(self, required_roles: list[str]):
+    """
+    Dependency that requires one of `required_roles` in the path's team.
+    
+    The role comes from the access token's team claims when present. A team
+    missing from the claims (joined after the token was issued, or a token
+    without claims) is looked up in team_members instead. Claims can be up
+    to a token lifetime stale, so with `fresh` the role is always read from
+    team_members: use it where a removed or demoted member must lose access
+    at once. A team that does not exist is a 404.
+    """
+
+    def __init__(self, required_roles: list[str], fresh: bool = False):
         self.required_roles = required_roles
+        self.fresh = fresh
 
-    def __call__(self, team_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
-        member = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
+    def __call__(self, team_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_active_user)) -> str:
+        role = None
+        if current_user.team_roles is not None and not self.fresh:
+            role = current_user.team_roles.get(team_id)
+        if role is None:
+            role = db.query(TeamMember.role).filter(
+                TeamMember.team_id == team_id,
+                TeamMember.user_id == current_user.id
+            ).scalar()
 
-        if not member:
+        if role is None:
+            if db.query(Team.id).filter(Team.id == team_id).scalar() is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You are not a member of this team"
             )
 
-        if member.role not in self.required_roles:
+        if role not in self.required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You do not have permission to perform this action"
             )
         
-        return member
+        return role
 
 # Common permission checkers
-check_is_owner = TeamPermission([TeamRole.OWNER])
-check_is_admin = TeamPermission([TeamRole.OWNER, TeamRole.ADMIN])
+# Managing a team is checked against team_members, not the token's claims
+check_is_owner = TeamPermission([TeamRole.OWNER], fresh=True)
+check_is_admin = TeamPermission([TeamRole.OWNER, TeamRole.ADMIN], fresh=True)
 check_is_member = TeamPermission([TeamRole.OWNER, TeamRole.ADMIN, TeamRole.MEMBER])
@@ -0,0 +1,144 @@
+"""
+Connection pool instrumentation.
+
+Pools created with InstrumentedQueuePool / InstrumentedAsyncAdaptedQueuePool
+time how long each checkout waits for a connection and count checkout
+timeouts. Pool events registered by instrument_engine() track connections
+in use, their peak and physical connects/invalidations.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Thread-safe counters for a single engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidate(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool: Optional[Any] = None) -> Dict[str, Any]:
+        """Return current counters, plus live pool sizing when available."""
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "idle": pool.checkedin(),
+            })
+        return data
+
+
+class _TimedCheckoutMixin:
+    """Times _do_get (the wait for a free connection) and counts timeouts."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Engine.dispose() swaps in a recreated pool; keep reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that reports checkout waits and timeouts."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that reports checkout waits and timeouts."""
+
+
+# Registered engines, keyed by name
+_registry: Dict[str, Tuple[PoolMetrics, Engine]] = {}
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """
+    Attach metrics to an engine's pool and register it for get_pool_stats().
+
+    Pass `async_engine.sync_engine` for async engines.
+    """
+    metrics = PoolMetrics(name)
+    if isinstance(engine.pool, _TimedCheckoutMixin):
+        engine.pool.metrics = metrics
+
+    # Pool events registered on the Engine survive Engine.dispose()
+    event.listen(engine, "checkout", lambda *args: metrics.record_checkout())
+    event.listen(engine, "checkin", lambda *args: metrics.record_checkin())
+    event.listen(engine, "connect", lambda *args: metrics.record_connect())
+    event.listen(engine, "invalidate", lambda *args: metrics.record_invalidate())
+
+    _registry[name] = (metrics, engine)
+    return metrics
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every instrumented pool."""
+    return {name: metrics.snapshot(engine.pool) for name, (metrics, engine) in _registry.items()}
@@ -0,0 +1,174 @@
+"""
+Authenticated-principal cache.
+
+Access tokens carry the claims needed for authorization, so most requests
+never touch the users table. Endpoints that need the profile (and tokens
+issued without claims) resolve the user id to a Principal - a small,
+immutable snapshot of the columns endpoints read - kept in a per-process
+TTL + LRU cache.
+
+Code that changes a user (profile update, deactivation, password reset)
+must call principal_cache.invalidate(user_id) after committing. Other
+worker processes keep their copy until PRINCIPAL_CACHE_TTL_SECONDS expires,
+which bounds how long a change can take to be seen everywhere. Requests
+authorized from claims are checked against this snapshot too (checked_against()),
+so deactivation and password resets also end access tokens within that
+bound rather than at the token's expiry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.core.config import settings
+from app.core.security import password_version
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    The authenticated user as seen by endpoints.
+    
+    Built either from access-token claims (id, status and team roles only)
+    or from the users row, which adds the profile fields UserResponse needs.
+    """
+
+    id: int
+    is_active: bool
+    is_superuser: bool
+    # Team id -> role from the token; None when the token carried no team claims
+    team_roles: Optional[Mapping[int, str]] = None
+    email: Optional[str] = None
+    username: Optional[str] = None
+    full_name: Optional[str] = None
+    email_verified: Optional[bool] = None
+    provider: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    # Fingerprint of the password (app.core.security.password_version); None in tokens issued without it
+    password_version: Optional[str] = None
+
+    @property
+    def has_profile(self) -> bool:
+        return self.email is not None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        provider = user.provider
+        return cls(
+            id=user.id,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            email_verified=user.email_verified,
+            provider=getattr(provider, "value", provider),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+            password_version=password_version(user.hashed_password),
+        )
+
+    @classmethod
+    def from_claims(cls, payload: Mapping[str, Any]) -> Optional["Principal"]:
+        """Principal from access-token claims, or None for tokens issued without them."""
+        if "active" not in payload:
+            return None
+        teams = payload.get("teams")
+        return cls(
+            id=int(payload["sub"]),
+            is_active=bool(payload["active"]),
+            is_superuser=bool(payload.get("su", False)),
+            team_roles={int(team_id): role for team_id, role in teams.items()} if teams is not None else None,
+            password_version=payload.get("pv"),
+        )
+
+    def checked_against(self, stored: Optional["Principal"]) -> Optional["Principal"]:
+        """
+        This claims principal checked against the user's stored snapshot:
+        None if the user is gone or changed password since the token was
+        issued; else deactivation and a lost superuser flag apply at once.
+        """
+        if stored is None:
+            return None
+        if self.password_version is not None and self.password_version != stored.password_version:
+            return None
+        return replace(
+            self,
+            is_active=self.is_active and stored.is_active,
+            is_superuser=self.is_superuser and stored.is_superuser,
+        )
+
+
+class PrincipalCache:
+    """Thread-safe LRU of Principals by user id, with a per-entry TTL."""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                expires_at, principal = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return principal
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, principal: Principal) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's snapshot so the next request reloads it."""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,264 @@
+"""
+Fractional position keys for Kanban ordering.
+
+Groups are ordered within their board and tasks within their group by a
+string `position` compared byte by byte (LexoRank-style). Placing a row
+between two neighbours only needs a key that sorts between theirs, so a move
+or insert writes exactly one row instead of renumbering its siblings.
+
+Keys use base-36 digits (0-9, a-z, which sort alike in every collation): an
+integer part, whose first character says how many digits follow ("a0" is
+zero, "b00" comes after "az", "9z" before "a0"), then an optional fraction
+that never ends in "0", so there is always a key between any two. Appending
+or prepending steps the integer, so a list of n rows built that way has keys
+of about log36(n) characters; repeated inserts into one gap lengthen the
+fraction by about one digit per five inserts. Once a key grows past
+RANK_REBALANCE_LENGTH the move endpoints schedule rebalance(), which gives
+the list consecutive integer keys again (three characters for up to 1332
+rows).
+
+New rows and rows moved to another group or board without an explicit
+position are appended to the end of their list when the session flushes.
+Writes that bypass the ORM (bulk endpoints) use last_positions() and
+key_between() themselves.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.board import Group
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Ranked model -> (column of the list it is ordered in, relationship to the list's parent)
+SCOPES = {Task: ("group_id", "group"), Group: ("board_id", "board")}
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """Fraction strictly between `low` ("" = 0) and `high` (None = 1); neither ends in "0"."""
+    if high is not None:
+        # Keep the common prefix (reading a missing digit of `low` as 0)
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else "0") == high[n]:
+            n += 1
+        if n:
+            return high[:n] + _midpoint(low[n:], high[n:])
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else len(DIGITS)
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def _integer_part(key: str) -> str:
+    """The head character and the digits it announces: "a" has one digit, "b" two, ...; "9" one, "8" two, ..."""
+    head = key[:1]
+    if "a" <= head <= "z":
+        length = ord(head) - ord("a") + 2
+    elif "0" <= head <= "9":
+        length = ord("9") - ord(head) + 2
+    else:
+        raise ValueError(f"Invalid position key: {key!r}")
+    if len(key) < length or key[length:].endswith("0"):
+        raise ValueError(f"Invalid position key: {key!r}")
+    return key[:length]
+
+
+def _increment(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for n in reversed(range(len(digits))):
+        if digits[n] != DIGITS[-1]:
+            digits[n] = DIGITS[DIGITS.index(digits[n]) + 1]
+            return head + "".join(digits)
+        digits[n] = DIGITS[0]
+    # Carried out of the digits: one digit more (or, below zero, one fewer)
+    if head == "z":
+        return None
+    if head == "9":
+        return "a" + DIGITS[0]
+    head = chr(ord(head) + 1)
+    return head + "".join(digits + [DIGITS[0]] if head > "a" else digits[:-1])
+
+
+def _decrement(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for n in reversed(range(len(digits))):
+        if digits[n] != DIGITS[0]:
+            digits[n] = DIGITS[DIGITS.index(digits[n]) - 1]
+            return head + "".join(digits)
+        digits[n] = DIGITS[-1]
+    if head == "0":
+        return None
+    if head == "a":
+        return "9" + DIGITS[-1]
+    head = chr(ord(head) - 1)
+    return head + "".join(digits + [DIGITS[-1]] if head < "9" else digits[:-1])
+
+
+def key_between(after: Optional[str], before: Optional[str]) -> str:
+    """A key sorting after `after` and before `before`; None means the start or end of the list."""
+    if after is not None and before is not None and after >= before:
+        raise ValueError(f"{after!r} does not sort before {before!r}")
+    if after is None and before is None:
+        return "a" + DIGITS[0]
+    if after is None:
+        integer = _integer_part(before)
+        if integer < before:
+            return integer
+        lower = _decrement(integer)
+        return lower if lower is not None else integer + _midpoint("", before[len(integer):])
+    integer = _integer_part(after)
+    fraction = after[len(integer):]
+    if before is not None and _integer_part(before) == integer:
+        return integer + _midpoint(fraction, before[len(integer):])
+    higher = _increment(integer)
+    if higher is not None and (before is None or higher < before):
+        return higher
+    return integer + _midpoint(fraction, None)
+
+
+def keys_between(after: Optional[str], before: Optional[str], count: int) -> List[str]:
+    """`count` ascending keys between `after` and `before`, bisecting so they stay short."""
+    if count <= 0:
+        return []
+    if before is None:
+        keys = []
+        for _ in range(count):
+            after = key_between(after, None)
+            keys.append(after)
+        return keys
+    middle = key_between(after, before)
+    half = (count - 1) // 2
+    return [*keys_between(after, middle, half), middle, *keys_between(middle, before, count - 1 - half)]
+
+
+def needs_rebalance(key: str) -> bool:
+    return len(key) > settings.RANK_REBALANCE_LENGTH
+
+
+def last_positions(connection: Connection, model: Any, scope_ids: Iterable[int]) -> Dict[int, str]:
+    """Highest position in each of the lists (group IDs for tasks, board IDs for groups), in one query."""
+    scope = getattr(model, SCOPES[model][0])
+    result = connection.execute(
+        select(scope, func.max(model.position)).where(scope.in_(set(scope_ids))).group_by(scope)
+    )
+    return {scope_id: position for scope_id, position in result.all() if position is not None}
+
+
+async def position_between(
+    db: AsyncSession,
+    model: Any,
+    scope_id: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    exclude_id: Optional[int] = None,
+) -> str:
+    """
+    Key for a row placed in the list after the row at `after` and before the
+    one at `before`. With only one neighbour given the other is looked up;
+    with neither the row goes to the end. `exclude_id` is the row being moved.
+    """
+    scope = getattr(model, SCOPES[model][0])
+    siblings = [scope == scope_id]
+    if exclude_id is not None:
+        siblings.append(model.id != exclude_id)
+    if after is None and before is None:
+        after = await db.scalar(select(func.max(model.position)).where(*siblings))
+    elif before is None:
+        before = await db.scalar(select(func.min(model.position)).where(*siblings, model.position > after))
+    elif after is None:
+        after = await db.scalar(select(func.max(model.position)).where(*siblings, model.position < before))
+    return key_between(after, before)
+
+
+async def place_between(
+    db: AsyncSession, model: Any, scope_id: int, row_id: int, after_id: Optional[int], before_id: Optional[int]
+) -> str:
+    """
+    New position for row `row_id` moved into list `scope_id` after row
+    `after_id` and/or before row `before_id`; ValueError if those are not in
+    the list or out of order.
+    """
+    neighbours = {row for row in (after_id, before_id) if row is not None}
+    if row_id in neighbours:
+        raise ValueError("A row cannot be moved next to itself")
+    positions: Dict[int, str] = {}
+    if neighbours:
+        scope = getattr(model, SCOPES[model][0])
+        positions = dict((await db.execute(
+            select(model.id, model.position).where(model.id.in_(neighbours), scope == scope_id)
+        )).all())
+        missing = neighbours - positions.keys()
+        if missing:
+            raise ValueError(f"Not in the same list: {sorted(missing)}")
+    return await position_between(
+        db, model, scope_id, positions.get(after_id), positions.get(before_id), exclude_id=row_id
+    )
+
+
+async def rebalance(model: Any, scope_id: int) -> None:
+    """Give one list consecutive integer keys again, in its current order."""
+    scope = getattr(model, SCOPES[model][0])
+    async with AsyncSessionLocal() as db:
+        rows = (await db.scalars(
+            select(model).where(scope == scope_id).order_by(model.position, model.id).with_for_update()
+        )).all()
+        for row, key in zip(rows, keys_between(None, None, len(rows))):
+            if row.position != key:
+                row.position = key
+        # Through the unit of work, so clients hear about the new keys
+        await db.commit()
+    logger.info("Rebalanced %d %s positions of %s %d", len(rows), model.__name__, scope.key, scope_id)
+
+
+@event.listens_for(Session, "before_flush")
+def _place_on_flush(session: Session, flush_context, instances) -> None:
+    """Append new rows, and rows moved to another list without a position, to the end of their list."""
+    pending: Dict[Tuple[Any, Any], List[Any]] = defaultdict(list)
+    new = session.new
+    for obj in [*new, *session.dirty]:
+        if type(obj) not in SCOPES or obj in session.deleted:
+            continue
+        column, parent_name = SCOPES[type(obj)]
+        if obj in new:
+            if obj.position is not None:
+                continue
+        else:
+            attrs = inspect(obj).attrs
+            if not attrs[column].history.has_changes() or attrs.position.history.has_changes():
+                continue
+        parent = obj.__dict__.get(parent_name)
+        scope_id = getattr(obj, column)
+        if scope_id is None and parent is not None:
+            # Parent added in the same flush: an empty list so far
+            scope_id = parent.id if parent.id is not None else ("new", id(parent))
+        if scope_id is None:
+            # A task taken out of its group has no position
+            obj.position = None
+            continue
+        pending[(type(obj), scope_id)].append(obj)
+    if not pending:
+        return
+
+    lasts: Dict[Tuple[Any, Any], str] = {}
+    for model in {model for model, _ in pending}:
+        scope_ids = [scope_id for m, scope_id in pending if m is model and isinstance(scope_id, int)]
+        if scope_ids:
+            last = last_positions(session.connection(), model, scope_ids)
+            lasts.update(((model, scope_id), position) for scope_id, position in last.items())
+    for key, objs in pending.items():
+        for obj, position in zip(objs, keys_between(lasts.get(key), None, len(objs))):
+            obj.position = position
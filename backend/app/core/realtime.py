@@ -0,0 +1,258 @@
+"""
+Real-time board events.
+
+Every committed transaction that changes a board's snapshot (the board, its
+groups, their tasks or subtasks) publishes one event per board
+(app.core.changes):
+
+    {"type": "board.changed", "board_id": 7, "version": 42,
+     "changes": [{"entity": "task", "id": 3, "op": "updated"}, ...]}
+
+Subscribers of WebSocket /ws/boards/{id} receive it and refetch what they
+need; `version` matches the board snapshot's. Events listing more than
+REALTIME_MAX_CHANGES rows are sent as {"type": "resync", ...} instead, as are
+events for a subscriber that fell REALTIME_QUEUE_SIZE events behind: the
+client should reload the snapshot. Every subscriber also gets a resync (with
+a null version) when the worker may have missed events, after the postgres
+listener reconnected.
+
+Each worker keeps its own subscribers (BoardEventHub). Events go through a
+broadcast backend so that subscribers on other workers see them too:
+
+- local: straight back to this worker's hub (one worker, and tests);
+- postgres: LISTEN/NOTIFY on the primary database (psycopg), for several
+  workers or hosts. A dropped listener connection is logged and reopened,
+  with backoff, until it succeeds.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[bytes], None]
+
+
+class LocalBroadcast:
+    """Delivers published messages to this worker's hub only."""
+
+    async def start(self, deliver: Deliver, lost: Optional[Callable[[], None]] = None) -> None:
+        self._deliver = deliver
+
+    async def publish(self, message: bytes) -> None:
+        self._deliver(message)
+
+    async def close(self) -> None:
+        pass
+
+
+class PostgresBroadcast:
+    """
+    Fan-out across workers with PostgreSQL LISTEN/NOTIFY.
+
+    Publishes with pg_notify on one connection and listens on another; every
+    worker (including the publisher) receives each message once.
+    """
+
+    CHANNEL = "board_events"
+
+    # Seconds before reconnecting a dropped listener, doubled after each failed attempt
+    RETRY_INITIAL = 0.5
+    RETRY_MAX = 30.0
+
+    def __init__(self, url: str):
+        # SQLAlchemy URL -> libpq URL
+        scheme, _, rest = url.partition("://")
+        self.url = f"{scheme.split('+')[0]}://{rest}"
+        self._publisher = None
+        self._listener = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _connect(self):
+        import psycopg
+
+        return await psycopg.AsyncConnection.connect(self.url, autocommit=True)
+
+    async def _open_listener(self) -> None:
+        self._listener = await self._connect()
+        await self._listener.execute(f"LISTEN {self.CHANNEL}")
+
+    async def _drop_listener(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            try:
+                await listener.close()
+            except Exception:
+                pass
+
+    async def start(self, deliver: Deliver, lost: Optional[Callable[[], None]] = None) -> None:
+        """Start listening; `lost` is called after a reconnect, when messages may have been missed."""
+        self._publisher = await self._connect()
+        await self._open_listener()
+        self._task = asyncio.create_task(self._listen(deliver, lost))
+
+    async def _listen(self, deliver: Deliver, lost: Optional[Callable[[], None]]) -> None:
+        delay = self.RETRY_INITIAL
+        while True:
+            try:
+                if self._listener is None:
+                    await self._open_listener()
+                    logger.info("Board event listener reconnected")
+                    delay = self.RETRY_INITIAL
+                    if lost is not None:
+                        lost()
+                async for notify in self._listener.notifies():
+                    deliver(notify.payload.encode())
+                raise ConnectionError("listener connection closed")
+            except Exception as exc:
+                logger.warning("Board event listener lost (%r), reconnecting in %.1fs", exc, delay)
+                await self._drop_listener()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RETRY_MAX)
+
+    async def publish(self, message: bytes) -> None:
+        if self._publisher is None or self._publisher.closed:
+            self._publisher = await self._connect()
+        await self._publisher.execute("SELECT pg_notify(%s, %s)", (self.CHANNEL, message.decode()))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        await self._drop_listener()
+        if self._publisher is not None:
+            await self._publisher.close()
+
+
+def get_broadcast():
+    """Backend for the configured REALTIME_BROADCAST."""
+    if settings.REALTIME_BROADCAST == "local":
+        return LocalBroadcast()
+    if settings.REALTIME_BROADCAST == "postgres":
+        return PostgresBroadcast(settings.DATABASE_URL)
+    raise ValueError(f"Unknown realtime broadcast backend: {settings.REALTIME_BROADCAST}")
+
+
+class BoardEventHub:
+    """
+    This worker's board subscribers, fed from the broadcast backend.
+
+    publish() may be called from any thread (sessions commit on the event
+    loop and in the threadpool); delivery happens on the loop the hub was
+    started on.
+    """
+
+    def __init__(self, backend, queue_size: int = 100, max_changes: int = 100):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.max_changes = max_changes
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Set[asyncio.Task] = set()
+        self.published = 0
+        self.delivered = 0
+        self.resyncs = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        # Also restarts on a new loop once the old one is gone (test clients run one loop per portal)
+        if self._loop is not None and not self._loop.is_closed():
+            return
+        self._loop = asyncio.get_running_loop()
+        await self.backend.start(self._deliver, self._resync_all)
+
+    async def close(self) -> None:
+        loop, self._loop = self._loop, None
+        if loop is not None:
+            await self.backend.close()
+
+    def publish(self, board_id: int, version: int, changes: List[Dict[str, Any]]) -> None:
+        """Send a board.changed event to the board's subscribers on every worker."""
+        loop = self._loop
+        if loop is None:
+            # Not started: nobody in this process is subscribed
+            return
+        if len(changes) > self.max_changes:
+            event = {"type": "resync", "board_id": board_id, "version": version}
+        else:
+            event = {"type": "board.changed", "board_id": board_id, "version": version, "changes": changes}
+        try:
+            loop.call_soon_threadsafe(self._send, orjson.dumps(event))
+        except RuntimeError:
+            # The loop has closed (shutdown)
+            pass
+
+    def _send(self, message: bytes) -> None:
+        task = asyncio.ensure_future(self.backend.publish(message))
+        self._pending.add(task)
+        task.add_done_callback(self._sent)
+        self.published += 1
+
+    def _sent(self, task: asyncio.Task) -> None:
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+            logger.warning("Could not publish a board event: %r", task.exception())
+
+    def _push(self, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind to catch up event by event
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"type": "resync", "board_id": event["board_id"], "version": event["version"]})
+            self.resyncs += 1
+
+    def _deliver(self, message: bytes) -> None:
+        event = orjson.loads(message)
+        for queue in self._subscribers.get(event["board_id"], ()):
+            self._push(queue, event)
+            self.delivered += 1
+
+    def _resync_all(self) -> None:
+        """Tell every subscriber to reload: events may have been missed."""
+        for board_id, queues in self._subscribers.items():
+            for queue in queues:
+                # Queued events are superseded by the reload
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "resync", "board_id": board_id, "version": None})
+                self.resyncs += 1
+
+    @asynccontextmanager
+    async def subscribe(self, board_id: int) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving the board's events for as long as the block runs."""
+        await self.start()
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers[board_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[board_id].discard(queue)
+            if not self._subscribers[board_id]:
+                del self._subscribers[board_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "boards": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "errors": self.errors,
+        }
+
+
+board_events = BoardEventHub(
+    get_broadcast(),
+    queue_size=settings.REALTIME_QUEUE_SIZE,
+    max_changes=settings.REALTIME_MAX_CHANGES,
+)
@@ -0,0 +1,165 @@
+"""
+Read-replica routing.
+
+Read-only requests are spread round-robin over DATABASE_REPLICA_URLS. A
+replica that cannot hand out a connection is skipped for
+REPLICA_RETRY_SECONDS, and reads fall back to the primary when no replica is
+available. Clients that wrote within READ_YOUR_WRITES_SECONDS keep reading
+from the primary so they see their own changes despite replication lag.
+
+The pin travels with the client rather than living in a worker: a response
+to a request that wrote carries the end of the window (Unix time) in the
+primary_until cookie and the X-Primary-Until header, and a read that sends
+either one back before then is served by the primary, whichever worker or
+host handles it. Clients that do not keep cookies echo the header.
+"""
+
+import itertools
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    get_async_database_url,
+    get_engine_options,
+)
+from app.core.pool_metrics import instrument_engine
+from app.core.sqlite import apply_sqlite_pragmas, is_sqlite_url
+
+# Session.info key carrying the response of an authenticated request (set by the auth dependencies)
+SESSION_RESPONSE_KEY = "response"
+
+# Where the end of a client's read-your-writes window is carried
+PIN_COOKIE = "primary_until"
+PIN_HEADER = "X-Primary-Until"
+
+
+class ReplicaRouter:
+    """Chooses the database a read-only session should use."""
+
+    def __init__(
+        self,
+        replica_urls: List[str],
+        retry_seconds: float = 30,
+        read_your_writes_seconds: float = 5.0,
+    ):
+        self.retry_seconds = retry_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._sessions = []
+        self._async_sessions = []
+        for index, url in enumerate(replica_urls):
+            engine = create_engine(url, **get_engine_options(url))
+            instrument_engine(engine, f"replica_{index}")
+            async_engine = create_async_engine(
+                get_async_database_url(url), **get_engine_options(url, is_async=True)
+            )
+            instrument_engine(async_engine.sync_engine, f"replica_{index}_async")
+            if is_sqlite_url(url) and settings.SQLITE_TUNING:
+                apply_sqlite_pragmas(engine)
+                apply_sqlite_pragmas(async_engine.sync_engine)
+            self._sessions.append(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+            self._async_sessions.append(
+                async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+            )
+
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._down_until: Dict[int, float] = {}
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._sessions)
+
+    def pin(self, response: Response) -> None:
+        """Pin the client's reads to the primary for the read-your-writes window."""
+        until = f"{time.time() + self.read_your_writes_seconds:.3f}"
+        # Each flush restarts the window; keep only the latest cookie
+        prefix = f"{PIN_COOKIE}=".encode()
+        response.raw_headers[:] = [
+            (name, value) for name, value in response.raw_headers
+            if not (name == b"set-cookie" and value.startswith(prefix))
+        ]
+        response.set_cookie(
+            PIN_COOKIE, until, max_age=math.ceil(self.read_your_writes_seconds), httponly=True, samesite="lax"
+        )
+        response.headers[PIN_HEADER] = until
+
+    def is_pinned(self, until: Optional[str]) -> bool:
+        """Whether a pin sent back by the client still routes its reads to the primary."""
+        try:
+            until = float(until)
+        except (TypeError, ValueError):
+            return False
+        now = time.time()
+        # Farther out than the window (plus slack for clock skew between hosts): not one of ours
+        return now < until <= now + 2 * self.read_your_writes_seconds
+
+    def mark_unhealthy(self, index: int) -> None:
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def _healthy_replicas(self) -> List[int]:
+        """Healthy replica indexes, rotated so each call starts at the next one."""
+        count = len(self._sessions)
+        start = next(self._counter) % count
+        now = time.monotonic()
+        with self._lock:
+            return [
+                index for index in ((start + offset) % count for offset in range(count))
+                if self._down_until.get(index, 0.0) <= now
+            ]
+
+    def _use_primary(self, pin: Optional[str]) -> bool:
+        return not self.has_replicas or self.is_pinned(pin)
+
+    def read_session(self, pin: Optional[str] = None) -> Session:
+        """Open a session on a healthy replica, or on the primary as a fallback."""
+        if not self._use_primary(pin):
+            for index in self._healthy_replicas():
+                session = self._sessions[index]()
+                try:
+                    # Check out a connection now so a dead replica is detected up front
+                    session.connection()
+                    return session
+                except DBAPIError:
+                    session.close()
+                    self.mark_unhealthy(index)
+        return SessionLocal()
+
+    async def async_read_session(self, pin: Optional[str] = None) -> AsyncSession:
+        """Async counterpart of read_session()."""
+        if not self._use_primary(pin):
+            for index in self._healthy_replicas():
+                session = self._async_sessions[index]()
+                try:
+                    await session.connection()
+                    return session
+                except DBAPIError:
+                    await session.close()
+                    self.mark_unhealthy(index)
+        return AsyncSessionLocal()
+
+
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICAS,
+    retry_seconds=settings.REPLICA_RETRY_SECONDS,
+    read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _pin_writer_to_primary(session: Session, flush_context) -> None:
+    """Any flush by an authenticated request starts its client's read-your-writes window."""
+    response = session.info.get(SESSION_RESPONSE_KEY)
+    if response is not None and replica_router.has_replicas:
+        replica_router.pin(response)
@@ -0,0 +1,123 @@
+"""
+Response encoding for large list endpoints.
+
+FastAPI validates every returned ORM row against the response model before
+encoding it; for a page of 1000 tasks with subtasks that validation costs
+more than producing the JSON. Rows loaded from our own tables are already
+the right shape, so list endpoints hand them to list_response(), which reads
+the schema's fields straight off the rows (following a plan built once per
+schema) and encodes the result with orjson - or with MessagePack for clients
+that send `Accept: application/msgpack`.
+
+msgpack is an optional dependency (listed in requirements.txt, like brotli).
+Without it MessagePack is simply not offered: such requests are answered
+with JSON and Content-Type: application/json, never with 406, so clients
+must check the response's content type.
+
+The output matches what the response_model would produce; the schema stays
+on the route for the OpenAPI docs. tests/test_responses.py checks the two
+against each other.
+
+Other routes keep FastAPI's default encoding: with a response_model it
+already writes JSON straight from pydantic, which is faster than dumping
+to Python objects for orjson (see benchmarks/list_serialization.py).
+"""
+
+import collections.abc
+import types
+import typing
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Same text as pydantic's JSON mode: UTC as "Z", naive datetimes without an offset
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """(model, is_list) for fields typed as Model, Optional[Model] or List[Model]."""
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, collections.abc.Sequence):
+        (item,) = typing.get_args(annotation) or (Any,)
+        model, _ = _nested_model(item)
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def row_serializer(schema: Type[BaseModel]) -> Callable[[Any], Dict[str, Any]]:
+    """Build (once per schema) a function turning a trusted ORM row into the schema's dict."""
+    plan = []
+    for name, field in schema.model_fields.items():
+        model, is_list = _nested_model(field.annotation)
+        plan.append((name, row_serializer(model) if model else None, is_list))
+
+    def serialize(row: Any) -> Dict[str, Any]:
+        data = {}
+        for name, nested, is_list in plan:
+            value = getattr(row, name)
+            if nested is not None and value is not None:
+                value = [nested(item) for item in value] if is_list else nested(value)
+            data[name] = value
+        return data
+
+    return serialize
+
+
+def serialize_rows(rows: Iterable[Any], schema: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """Rows as the list of dicts `List[schema]` would dump, without validating them."""
+    serialize = row_serializer(schema)
+    return [serialize(row) for row in rows]
+
+
+@lru_cache()
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        # Same text as the JSON encoding
+        return orjson.dumps(value, option=_ORJSON_OPTIONS)[1:-1].decode()
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Whether the client asked for MessagePack and we can produce it."""
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES) and _msgpack() is not None
+
+
+def encode(request: Request, data: Any) -> Tuple[bytes, str]:
+    """(body, media type) of serialized data, as JSON or (if accepted) MessagePack."""
+    if wants_msgpack(request):
+        return _msgpack().packb(data, default=_msgpack_default, use_bin_type=True), MSGPACK_MEDIA_TYPES[0]
+    return orjson.dumps(data, option=_ORJSON_OPTIONS), "application/json"
+
+
+def list_response(
+    request: Request,
+    rows: Iterable[Any],
+    schema: Type[BaseModel],
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Encode trusted ORM rows as `List[schema]`, as JSON or (if accepted) MessagePack."""
+    body, media_type = encode(request, serialize_rows(rows, schema))
+    return Response(body, status_code=status_code, headers={"Vary": "Accept", **(headers or {})}, media_type=media_type)
@@ -0,0 +1,60 @@
+"""
+Schema version check.
+
+Alembic owns the schema (`alembic upgrade head` creates and migrates it).
+On startup each worker compares the revision stamped in the database with
+the head revision of the migration scripts shipped with the code - a single
+SELECT, with no reflection and no DDL - and refuses to serve on a mismatch.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+# backend/alembic.ini
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is not at the revision this code expects."""
+
+
+@lru_cache()
+def get_head_revisions() -> Tuple[str, ...]:
+    """Head revision(s) of the migration scripts, read once per process."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(Config(str(ALEMBIC_INI)))
+    return tuple(sorted(script.get_heads()))
+
+
+def get_database_revisions(engine: Engine) -> Optional[Tuple[str, ...]]:
+    """Revision(s) stamped in the database, or None when it was never migrated."""
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+    except DBAPIError:
+        # No alembic_version table
+        return None
+    return tuple(sorted(rows))
+
+
+def check_schema_version(engine: Engine) -> None:
+    """Raise SchemaVersionError unless the database is at the head revision."""
+    expected = get_head_revisions()
+    current = get_database_revisions(engine)
+    if current is None:
+        raise SchemaVersionError(
+            "Database has no schema version. Run `alembic upgrade head` "
+            "(for a database created before migrations, first `alembic stamp 0001`)."
+        )
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at revision {', '.join(current) or 'none'}, "
+            f"expected {', '.join(expected)}. Run `alembic upgrade head`."
+        )
@@ -0,0 +1,93 @@
+"""
+Full-text task search.
+
+GET /tasks/search matches a query against each task's name, description and
+subtask names through an index built by migration 0009 and kept current by
+database triggers, so Core bulk writes are covered as well as the ORM:
+
+- SQLite: the FTS5 table task_search (rowid = task ID), ranked by bm25;
+- PostgreSQL: task_search.document, a weighted tsvector under a GIN index,
+  ranked by ts_rank.
+
+Other databases fall back to ILIKE scans of the tasks and subtasks tables:
+correct, but linear in the user's tasks.
+
+Either way a name match outranks a subtask match, which outranks a match in
+the description. Every word of the query must match, the last characters of
+each word being optional (prefix matching), so results narrow as the user
+types.
+
+hits() returns a subquery of (id, rank) for one user's matches; rank grows
+with relevance and is the sort key of the endpoint's keyset pagination.
+"""
+
+import re
+from typing import Any, List
+
+from sqlalchemy import Float, Integer, and_, case, column, exists, func, literal_column, or_, select, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.models.task import Subtask, Task
+
+MAX_TERMS = 10
+
+# The SQLite FTS5 table; its owner column holds "~<user id>", which no search word can match
+_fts = table("task_search", column("rowid", Integer), column("task_search"))
+# bm25 weights per column: owner, name, description, subtasks
+_FTS_WEIGHTS = (0.0, 4.0, 1.0, 2.0)
+
+_documents = table("task_search", column("task_id", Integer), column("user_id", Integer), column("document", TSVECTOR))
+
+
+def search_terms(q: str) -> List[str]:
+    """Lower-cased words of the query, at most MAX_TERMS of them."""
+    return re.findall(r"[^\W_]+", q.lower())[:MAX_TERMS]
+
+
+def _sqlite_hits(terms: List[str], user_id: int) -> Any:
+    prefixes = " ".join(f'"{term}"*' for term in terms)
+    # Not a {name description subtasks} column filter: that makes FTS5 check
+    # every match's positions, several times slower for common words
+    match = f'owner : "~{user_id}" AND ({prefixes})'
+    # bm25 is lower for better matches
+    rank = -func.bm25(literal_column("task_search"), *_FTS_WEIGHTS)
+    return select(
+        _fts.c.rowid.label("id"), rank.cast(Float).label("rank")
+    ).where(_fts.c.task_search.match(match))
+
+
+def _postgres_hits(terms: List[str], user_id: int) -> Any:
+    query = func.to_tsquery("simple", " & ".join(f"'{term}':*" for term in terms))
+    return select(
+        _documents.c.task_id.label("id"), func.ts_rank(_documents.c.document, query).cast(Float).label("rank")
+    ).where(_documents.c.user_id == user_id, _documents.c.document.op("@@")(query))
+
+
+def _starts_word(expression: Any, term: str) -> Any:
+    # Terms are letters and digits only, so nothing to escape for LIKE
+    return or_(expression.ilike(f"{term}%"), expression.ilike(f"% {term}%"))
+
+
+def _scan_hits(terms: List[str], user_id: int) -> Any:
+    _, name_weight, description_weight, subtask_weight = _FTS_WEIGHTS
+    conditions, rank = [], 0.0
+    for term in terms:
+        in_name = _starts_word(Task.name, term)
+        in_description = _starts_word(Task.description, term)
+        in_subtasks = exists().where(Subtask.task_id == Task.id, _starts_word(Subtask.name, term))
+        conditions.append(or_(in_name, in_description, in_subtasks))
+        rank = rank + case(
+            (in_name, name_weight), (in_subtasks, subtask_weight), else_=description_weight,
+        )
+    return select(Task.id.label("id"), rank.cast(Float).label("rank")).where(
+        Task.user_id == user_id, and_(*conditions)
+    )
+
+
+def hits(dialect_name: str, terms: List[str], user_id: int) -> Any:
+    """Subquery of (id, rank) for the user's tasks matching every term; `terms` from search_terms()."""
+    if dialect_name == "sqlite":
+        return _sqlite_hits(terms, user_id).subquery("hits")
+    if dialect_name == "postgresql":
+        return _postgres_hits(terms, user_id).subquery("hits")
+    return _scan_hits(terms, user_id).subquery("hits")
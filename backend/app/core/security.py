@@ -1,5 +1,6 @@
+import hashlib
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -18,12 +19,21 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Token "type" claim values; tokens issued before claims were added carry none
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+# Users in more teams than this get no team claims and are checked against the database
+MAX_TEAM_CLAIMS = 50
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
     
     Args:
-        data: Dictionary containing user data (typically {"sub": user_id})
+        data: Dictionary containing user data (typically {"sub": user_id}),
+            optionally with the claims from build_user_claims()
         expires_delta: Optional expiration time delta
         
     Returns:
@@ -36,28 +46,89 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": ACCESS_TOKEN_TYPE})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[str]:
+def build_user_claims(user, team_roles: Dict[int, str]) -> Dict[str, Any]:
     """
-    Verify and decode a JWT token.
+    Authorization claims embedded in access tokens.
     
     Args:
-        token: JWT token string
+        user: User the token is issued to
+        team_roles: Mapping of team id to the user's role in that team
         
     Returns:
-        User ID (subject) if valid, None otherwise
+        Claims dict: `active`, `su`, `pv` (password_version(), so that a
+        password reset revokes the token) and, for users in at most
+        MAX_TEAM_CLAIMS teams, `teams` as {"<team_id>": "<role>"}
+    """
+    claims: Dict[str, Any] = {
+        "sub": str(user.id),
+        "active": bool(user.is_active),
+        "su": bool(user.is_superuser),
+        "pv": password_version(user.hashed_password),
+    }
+    if len(team_roles) <= MAX_TEAM_CLAIMS:
+        claims["teams"] = {str(team_id): str(role) for team_id, role in team_roles.items()}
+    return claims
+
+
+def password_version(hashed_password: Optional[str]) -> str:
+    """Short fingerprint of the password hash; changes whenever the password does."""
+    return hashlib.sha256((hashed_password or "").encode()).hexdigest()[:12]
+
+
+def create_refresh_token(user) -> str:
+    """
+    Create a long-lived refresh token for POST /auth/refresh.
+    
+    The token is bound to the current password, so a password reset revokes
+    every refresh token issued before it.
+    """
+    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {
+        "sub": str(user.id),
+        "type": REFRESH_TOKEN_TYPE,
+        "pv": password_version(user.hashed_password),
+        "exp": expire,
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_token(token: str, token_type: str = ACCESS_TOKEN_TYPE) -> Optional[Dict[str, Any]]:
+    """
+    Verify and decode a JWT token of the given type.
+    
+    Access tokens issued without a "type" claim are still accepted as access
+    tokens; a refresh token is never accepted as an access token.
+    
+    Returns:
+        The token payload if valid, None otherwise
     """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        return user_id
     except JWTError:
         return None
+    if payload.get("type", ACCESS_TOKEN_TYPE) != token_type or payload.get("sub") is None:
+        return None
+    return payload
+
+
+def verify_token(token: str) -> Optional[str]:
+    """
+    Verify and decode a JWT access token.
+    
+    Args:
+        token: JWT token string
+        
+    Returns:
+        User ID (subject) if valid, None otherwise
+    """
+    payload = decode_token(token)
+    return payload["sub"] if payload else None
 
 
 def create_verification_token() -> str:
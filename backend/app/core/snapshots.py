@@ -0,0 +1,86 @@
+"""
+Board snapshots.
+
+GET /boards/{id}/snapshot returns a board with its groups, their tasks and
+the tasks' subtasks. Every change to any of those bumps boards.version in
+the same transaction (app.core.changes), so the version alone says whether
+a snapshot is still current:
+
+- the ETag is derived from (board id, version, representation), so an
+  unchanged board answers 304 after a one-row primary-key lookup;
+- encoded bodies are kept in a per-process LRU keyed by board and
+  representation and tagged with the version they were built from. A
+  request for a newer version rebuilds and replaces the entry; there is
+  nothing to invalidate by hand, and other workers never serve a stale body.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+def snapshot_etag(board_id: int, version: int, representation: str) -> str:
+    digest = hashlib.blake2b(f"board:{board_id}:{version}:{representation}".encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+class SnapshotCache:
+    """Thread-safe LRU of encoded snapshots by (board id, representation), each tagged with its version."""
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[int, bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, board_id: int, representation: str, version: int) -> Optional[Tuple[bytes, str]]:
+        """(body, media type) built from exactly this version, if cached."""
+        key = (board_id, representation)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2]
+            self.misses += 1
+            return None
+
+    def put(self, board_id: int, representation: str, version: int, body: bytes, media_type: str) -> None:
+        if self.max_size <= 0:
+            return
+        key = (board_id, representation)
+        with self._lock:
+            current = self._entries.get(key)
+            # A slower request must not replace a newer snapshot with an older one
+            if current is not None and current[0] > version:
+                return
+            self._entries[key] = (version, body, media_type)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "bytes": sum(len(entry[1]) for entry in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+board_snapshots = SnapshotCache(max_size=settings.BOARD_SNAPSHOT_CACHE_SIZE)
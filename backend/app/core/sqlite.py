@@ -0,0 +1,158 @@
+"""
+SQLite production mode.
+
+With the default rollback journal, concurrent uvicorn workers block each
+other on every write and surface "database is locked" errors.
+apply_sqlite_pragmas() switches each new connection to WAL with
+synchronous=NORMAL, memory-mapped reads, a larger page cache and a busy
+timeout, so readers never wait for writers and writers wait instead of
+failing. serialize_sqlite_writes() additionally queues the write
+transactions of one process on a single lock (an asyncio lock for the
+async engine), leaving SQLite's busy handler to arbitrate only between
+processes.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.util import await_
+
+from app.core.config import settings
+
+# Connection.info key holding the write lock taken by its transaction
+_HELD_LOCK_KEY = "sqlite_write_lock"
+
+# Write lock per (sync) engine
+_write_locks: "weakref.WeakKeyDictionary[Engine, Union[threading.Lock, AsyncWriteLock]]" = weakref.WeakKeyDictionary()
+
+_SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def is_sqlite_url(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def apply_sqlite_pragmas(
+    engine: Engine,
+    *,
+    wal: bool = True,
+    synchronous: Optional[str] = None,
+    mmap_size: Optional[int] = None,
+    cache_size: Optional[int] = None,
+    busy_timeout_ms: Optional[int] = None,
+) -> None:
+    """
+    Run the tuning PRAGMAs on every new DBAPI connection of `engine`.
+
+    Pass `async_engine.sync_engine` for async engines. Unset values come
+    from the SQLITE_* settings.
+    """
+    synchronous = (synchronous or settings.SQLITE_SYNCHRONOUS).upper()
+    if synchronous not in _SYNCHRONOUS_LEVELS:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS value: {synchronous}")
+    mmap_size = settings.SQLITE_MMAP_SIZE if mmap_size is None else mmap_size
+    cache_size = settings.SQLITE_CACHE_SIZE if cache_size is None else cache_size
+    busy_timeout_ms = settings.SQLITE_BUSY_TIMEOUT_MS if busy_timeout_ms is None else busy_timeout_ms
+
+    pragmas = [f"PRAGMA busy_timeout = {int(busy_timeout_ms)}"]
+    if wal:
+        pragmas.append("PRAGMA journal_mode = WAL")
+    pragmas += [
+        f"PRAGMA synchronous = {synchronous}",
+        f"PRAGMA mmap_size = {int(mmap_size)}",
+        f"PRAGMA cache_size = {int(cache_size)}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def serialize_sqlite_writes(engine: Union[Engine, AsyncEngine]) -> Union[threading.Lock, "AsyncWriteLock"]:
+    """
+    Make transactions on `engine` write one at a time in this process.
+
+    The lock is taken before a transaction's first INSERT, UPDATE or DELETE
+    (ORM flush or Core statement) and released when the transaction ends
+    (commit, rollback or close). Sync engines share a threading.Lock; an
+    AsyncEngine waits on an AsyncWriteLock instead, so a queued writer
+    yields the event loop rather than blocking it. Sync and async engines
+    have separate locks and, like processes, are left to SQLite's busy
+    handler to arbitrate.
+    """
+    if isinstance(engine, AsyncEngine):
+        lock = _write_locks.setdefault(engine.sync_engine, AsyncWriteLock())
+        engine = engine.sync_engine
+    else:
+        lock = _write_locks.setdefault(engine, threading.Lock())
+    if not event.contains(engine, "before_cursor_execute", _acquire_write_lock):
+        event.listen(engine, "before_cursor_execute", _acquire_write_lock)
+        for name in ("commit", "rollback"):
+            event.listen(engine, name, _release_write_lock)
+        # Safety net for connections returned without ending their transaction
+        event.listen(engine.pool, "checkin", _release_on_checkin)
+    return lock
+
+
+class AsyncWriteLock:
+    """One asyncio.Lock per event loop (asyncio locks cannot be shared between loops)."""
+
+    def __init__(self) -> None:
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def for_loop(self) -> asyncio.Lock:
+        return self._locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+
+    def locked(self) -> bool:
+        return self.for_loop().locked()
+
+
+async def _acquire(lock: asyncio.Lock, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(lock.acquire(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+def _acquire_write_lock(conn, cursor, statement, parameters, context, executemany):
+    if _HELD_LOCK_KEY in conn.info or context is None:
+        return
+    if not (context.isinsert or context.isupdate or context.isdelete):
+        return
+    lock = _write_locks.get(conn.engine)
+    if lock is None:
+        return
+    timeout = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+    # On timeout carry on unlocked and let SQLite's busy_timeout arbitrate
+    if isinstance(lock, AsyncWriteLock):
+        # Runs in the greenlet of an AsyncConnection call, which can await
+        lock = lock.for_loop()
+        acquired = await_(_acquire(lock, timeout))
+    else:
+        acquired = lock.acquire(timeout=timeout)
+    if acquired:
+        conn.info[_HELD_LOCK_KEY] = lock
+
+
+def _release_write_lock(conn) -> None:
+    lock = conn.info.pop(_HELD_LOCK_KEY, None)
+    if lock is not None:
+        lock.release()
+
+
+def _release_on_checkin(dbapi_connection, connection_record) -> None:
+    lock = connection_record.info.pop(_HELD_LOCK_KEY, None) if connection_record else None
+    if lock is not None:
+        lock.release()
@@ -1,10 +1,39 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
+from app.api.deps import require_metrics_access
+from app.core.audit import audit_writer
+from app.core.compression import CompressionMiddleware, compression_stats
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import engine
+from app.core.email_sender import email_sender
+from app.core.hashing import PasswordHashingBusy, password_hasher
+from app.core.pool_metrics import get_pool_stats
+from app.core.principals import principal_cache
+from app.core.realtime import board_events
+from app.core.schema import check_schema_version
+from app.core.snapshots import board_snapshots
 from app.api.v1.router import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Refuse to serve against a database that is not at the migration head."""
+    # The schema itself is managed by Alembic: `alembic upgrade head`
+    if settings.DB_SCHEMA_CHECK:
+        check_schema_version(engine)
+    if settings.EMAIL_SENDER_ENABLED:
+        email_sender.start()
+    await board_events.start()
+    yield
+    await board_events.close()
+    email_sender.close()
+    audit_writer.close()
+    password_hasher.shutdown()
+
+
 # Create FastAPI application instance
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -12,11 +41,9 @@ app = FastAPI(
     version=settings.VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Configure CORS
 origins = settings.ALLOWED_ORIGINS
 if not origins:
@@ -28,12 +55,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Primary-Until"],
+)
+
+# Compress large responses (task lists, history pages); tiny ones are sent as-is
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    """Shed login/signup load instead of queueing it behind the bcrypt pool."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many sign-in attempts in progress, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @app.get("/")
 def root():
     """Root endpoint - API health check."""
@@ -50,6 +96,26 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", dependencies=[Depends(require_metrics_access)])
+def metrics():
+    """
+    Process-local runtime metrics (connection pools, caches) for this worker.
+    
+    Needs settings.METRICS_TOKEN as a bearer token, or a superuser.
+    """
+    return {
+        "pid": os.getpid(),
+        "db_pools": get_pool_stats(),
+        "principal_cache": principal_cache.stats(),
+        "board_snapshots": board_snapshots.stats(),
+        "realtime": board_events.stats(),
+        "password_hasher": password_hasher.stats(),
+        "audit": audit_writer.stats(),
+        "email_sender": email_sender.stats(),
+        "compression": compression_stats.stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
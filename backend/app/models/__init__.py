@@ -15,6 +15,8 @@ from app.models.subscription import Subscription
 from app.models.audit import AuditLog
 from app.models.gamification import UserStats, Achievement, UserAchievement, FocusSession
 from app.models.task_history import TaskHistory, DailyStats
+from app.models.email_outbox import EmailOutbox
+from app.models.change import ChangeCounter, ChangeLogEntry
 
 __all__ = [
     "User",
@@ -33,4 +35,7 @@ __all__ = [
     "FocusSession",
     "TaskHistory",
     "DailyStats",
+    "EmailOutbox",
+    "ChangeCounter",
+    "ChangeLogEntry",
 ]
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, and_, or_, select
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# Position keys compare byte by byte; PostgreSQL would otherwise use the database's locale collation
+RANK_KEY = String(255).with_variant(String(255, collation="C"), "postgresql")
+
 
 class Board(Base):
     """Board model - Kanban boards for organizing tasks.
@@ -16,13 +19,22 @@ class Board(Base):
     description = Column(String(1024), nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
+    # Bumped whenever the board, its groups or their tasks change (app.core.changes)
+    version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Keyset pagination of a user's boards, newest first
+        Index("ix_boards_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     # Relationships
     owner = relationship("User", back_populates="boards")
     team = relationship("Team", back_populates="boards")
-    groups = relationship("Group", back_populates="board", cascade="all, delete-orphan")
+    groups = relationship(
+        "Group", back_populates="board", cascade="all, delete-orphan", order_by="[Group.position, Group.id]"
+    )
 
     def __repr__(self) -> str:
         return f"<Board(id={self.id}, name='{self.name}', user_id={self.user_id})>"
@@ -38,14 +50,40 @@ class Group(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     color = Column(String(20), default="#579bfc", nullable=False)
-    order = Column(Integer, default=0, nullable=False)
-    board_id = Column(Integer, ForeignKey("boards.id"), nullable=False, index=True)
+    # Fractional key ordering the board's groups (app.core.ranking)
+    position = Column(RANK_KEY, nullable=False)
+    board_id = Column(Integer, ForeignKey("boards.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        # A board's groups in display order; also serves lookups by board_id
+        Index("ix_groups_board_id_position", "board_id", "position"),
+    )
 
     # Relationships
     board = relationship("Board", back_populates="groups")
-    tasks = relationship("Task", back_populates="group", cascade="all, delete-orphan")
+    tasks = relationship(
+        "Task", back_populates="group", cascade="all, delete-orphan", order_by="[Task.position, Task.id]"
+    )
 
     def __repr__(self) -> str:
         return f"<Group(id={self.id}, name='{self.name}', board_id={self.board_id})>"
+
+
+_preceding = Group.__table__.alias("preceding")
+
+# Deprecated integer order, for API clients predating position keys: the
+# group's index on its board (groups before it in (position, id) order)
+Group.order = column_property(
+    select(func.count())
+    .where(
+        _preceding.c.board_id == Group.board_id,
+        or_(
+            _preceding.c.position < Group.position,
+            and_(_preceding.c.position == Group.position, _preceding.c.id < Group.id),
+        ),
+    )
+    .correlate_except(_preceding)
+    .scalar_subquery()
+)
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
+from app.core.database import Base
+
+
+class ChangeCounter(Base):
+    """
+    Per-user change sequence.
+    
+    Incremented in the same transaction as every write to the user's tasks,
+    subtasks, boards, groups and plans (see app.core.changes), so it serves
+    as a cheap validator for conditional GETs and orders the change log.
+    """
+    
+    __tablename__ = "change_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    seq = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ChangeCounter(user_id={self.user_id}, seq={self.seq})>"
+
+
+class ChangeLogEntry(Base):
+    """
+    Latest change to one of a user's tasks, subtasks, boards, groups or plans.
+    
+    One row per synced row: every write moves it to the user's new change
+    sequence, and a delete leaves it behind as a tombstone. GET /sync reads
+    the entries after a client's cursor.
+    """
+    
+    __tablename__ = "change_log"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity = Column(String(20), nullable=False)  # task, subtask, board, group, plan
+    entity_id = Column(Integer, nullable=False)
+    seq = Column(Integer, nullable=False)
+    deleted = Column(Boolean, default=False, nullable=False)
+    
+    __table_args__ = (
+        Index("uq_change_log_user_id_entity_entity_id", "user_id", "entity", "entity_id", unique=True),
+        # GET /sync: a user's entries after a cursor, in order
+        Index("ix_change_log_user_id_seq", "user_id", "seq"),
+    )
+    
+    def __repr__(self):
+        return f"<ChangeLogEntry(user_id={self.user_id}, {self.entity}={self.entity_id}, seq={self.seq})>"
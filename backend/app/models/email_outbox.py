@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class EmailStatus:
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # gave up after EMAIL_MAX_ATTEMPTS
+
+
+class EmailOutbox(Base):
+    """Outgoing email, queued by request handlers and delivered by the background sender."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    from_email = Column(String(255), nullable=False)
+    from_name = Column(String(255), nullable=True)
+    subject = Column(String(255), nullable=False)
+    html_content = Column(Text, nullable=False)
+
+    # Delivery state
+    status = Column(String(20), nullable=False, default=EmailStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The sender's poll: due pending rows, oldest first
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, to='{self.to_email}', status='{self.status}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,18 +10,24 @@ class Plan(Base):
     __tablename__ = "plans"
     
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     
     # Time tracking (in hours)
     sleep_time = Column(Float, default=0.0, nullable=True)
     commute_time = Column(Float, default=0.0, nullable=True)
     work_time = Column(Float, default=0.0, nullable=True)
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
+    __table_args__ = (
+        # One plan per user per day; also serves lookups by date and keyset
+        # pagination of a user's plans, latest date first
+        Index("uq_plans_user_id_date", "user_id", "date", unique=True),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="plans")
     
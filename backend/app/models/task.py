@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.board import RANK_KEY
 
 
 class Task(Base):
@@ -14,7 +15,7 @@ class Task(Base):
     description = Column(Text, nullable=True)
     status = Column(String(50), default="not_started", nullable=False)  # not_started, in_progress, done, postponed
     priority = Column(String(50), default="medium", nullable=False)  # low, medium, high, urgent
-    date = Column(Date, nullable=True, index=True)
+    date = Column(Date, nullable=True)
     
     # Gamification fields
     estimated_time = Column(Integer, nullable=True)  # in minutes
@@ -22,20 +23,31 @@ class Task(Base):
     points_value = Column(Integer, default=0, nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # user_id is covered by the composite indexes below, which all lead with it
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    # Fractional key ordering the group's tasks (app.core.ranking); None outside a group
+    position = Column(RANK_KEY, nullable=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
+    __table_args__ = (
+        # Keyset pagination of a user's tasks, newest first
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        # GET /tasks filtered by date (and status), still newest first
+        Index("ix_tasks_user_id_date_status_created_at_id", "user_id", "date", "status", "created_at", "id"),
+        # A group's tasks in display order; also serves lookups by group_id
+        Index("ix_tasks_group_id_position", "group_id", "position"),
+    )
+    
     # Relationships
     owner = relationship("User", back_populates="tasks")
     group = relationship("Group", back_populates="tasks")
     team = relationship("Team", back_populates="tasks")
     subtasks = relationship("Subtask", back_populates="task", cascade="all, delete-orphan")
     focus_sessions = relationship("FocusSession", back_populates="task", cascade="all, delete-orphan")
-    history = relationship("TaskHistory", back_populates="task", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Task(id={self.id}, name='{self.name}', status='{self.status}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,22 +10,27 @@ class TaskHistory(Base):
     __tablename__ = "task_history"
     
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # No foreign key: a task's history, "deleted" event included, outlives the task
+    task_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
-    # Event details
-    event_type = Column(String(50), nullable=False)  # created, updated, completed, deleted, status_changed
+    # Event details (written by app.core.history)
+    event_type = Column(String(50), nullable=False)  # created, status_changed, completed, deleted
     old_status = Column(String(50), nullable=True)
     new_status = Column(String(50), nullable=True)
     
     # Metadata
-    changes = Column(JSON, nullable=True)  # Store what changed (field: {old, new})
+    changes = Column(JSON, nullable=True)  # What changed: {field: [old, new]}
     notes = Column(Text, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
+    __table_args__ = (
+        # A user's history by time range and keyset pagination, newest first
+        Index("ix_task_history_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+    
     # Relationships
-    task = relationship("Task", back_populates="history")
     user = relationship("User")
     
     def __repr__(self):
@@ -38,8 +43,8 @@ class DailyStats(Base):
     __tablename__ = "daily_stats"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    date = Column(Date, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
     
     # Task metrics
     tasks_created = Column(Integer, default=0, nullable=False)
@@ -65,6 +70,11 @@ class DailyStats(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
+    __table_args__ = (
+        # One row per user per day, updated in place; also serves date ranges
+        Index("uq_daily_stats_user_id_date", "user_id", "date", unique=True),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="daily_stats")
     
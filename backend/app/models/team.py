@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -28,10 +28,21 @@ class TeamMember(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Teams of a user: token claims, GET /teams
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     role = Column(String(50), default=TeamRole.MEMBER, nullable=False)
     joined_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Membership checks; a user is a member of a team at most once
+        Index("uq_team_members_team_id_user_id", "team_id", "user_id", unique=True),
+    )
+
     # Relationships
     team = relationship("Team", back_populates="members")
     user = relationship("User", back_populates="team_memberships")
+
+    @property
+    def user_email(self):
+        """Member's email, for TeamMemberResponse."""
+        return self.user.email if self.user else None
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+from app.schemas.task import TaskResponse
 
 
 # --- Group Schemas ---
@@ -9,25 +10,36 @@ class GroupBase(BaseModel):
     """Base group schema."""
     name: str
     color: str = "#579bfc"
-    order: int = 0
+
+
+# Groups are ordered by position keys; `order` is kept for older clients only
+_ORDER = "Deprecated: index on the board. Use POST /boards/groups/{id}/move and `position`."
 
 
 class GroupCreate(GroupBase):
-    """Schema for creating a group."""
-    pass
+    """Schema for creating a group; it is added after the board's last group unless `order` is given."""
+    order: Optional[int] = Field(None, ge=0, description=_ORDER, deprecated=True)
 
 
 class GroupUpdate(BaseModel):
-    """Schema for updating a group."""
+    """Schema for updating a group; reorder with POST /boards/groups/{id}/move."""
     name: Optional[str] = None
     color: Optional[str] = None
-    order: Optional[int] = None
+    order: Optional[int] = Field(None, ge=0, description=_ORDER, deprecated=True)
+
+
+class GroupMove(BaseModel):
+    """Where to put a group: after one group and/or before another; neither means last."""
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
 
 
 class GroupResponse(GroupBase):
     """Schema for group response."""
     id: int
     board_id: int
+    position: str
+    order: int = Field(0, description=_ORDER, deprecated=True)
     created_at: datetime
     updated_at: datetime
     
@@ -64,3 +76,16 @@ class BoardResponse(BoardBase):
     
     class Config:
         from_attributes = True
+
+
+# --- Snapshot Schemas ---
+
+class GroupSnapshot(GroupResponse):
+    """A group with its tasks, in position order."""
+    tasks: List[TaskResponse] = []
+
+
+class BoardSnapshot(BoardResponse):
+    """A board with everything needed to render it: groups in display order, their tasks and subtasks."""
+    version: int
+    groups: List[GroupSnapshot] = []
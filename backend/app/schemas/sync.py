@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+from app.schemas.board import BoardBase, GroupResponse
+from app.schemas.plan import PlanResponse
+from app.schemas.task import TaskBase, SubtaskResponse
+
+
+class SyncTask(TaskBase):
+    """A changed task; its subtasks are listed separately."""
+    id: int
+    user_id: int
+    group_id: Optional[int] = None
+    position: Optional[str] = None
+    points_value: int = 0
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class SyncBoard(BoardBase):
+    """A changed board; its groups are listed separately."""
+    id: int
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class SyncDeleted(BaseModel):
+    """IDs of the rows deleted since the cursor (tombstones)."""
+    tasks: List[int] = []
+    subtasks: List[int] = []
+    boards: List[int] = []
+    groups: List[int] = []
+    plans: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    """Rows created, updated or deleted after the `since` cursor."""
+    cursor: int
+    has_more: bool
+    tasks: List[SyncTask] = []
+    subtasks: List[SubtaskResponse] = []
+    boards: List[SyncBoard] = []
+    groups: List[GroupResponse] = []
+    plans: List[PlanResponse] = []
+    deleted: SyncDeleted
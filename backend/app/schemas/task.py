@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime, date
+from datetime import datetime
+from datetime import date as date_type  # a field named `date` would shadow the type
 
 
 # --- Subtask Schemas ---
@@ -43,7 +44,7 @@ class TaskBase(BaseModel):
     description: Optional[str] = None
     status: str = "not_started"  # not_started, in_progress, done, postponed
     priority: str = "medium"  # low, medium, high, urgent
-    date: Optional[date] = None
+    date: Optional[date_type] = None
     estimated_time: Optional[int] = None  # in minutes
     actual_time: Optional[int] = None  # in minutes
 
@@ -60,7 +61,7 @@ class TaskUpdate(BaseModel):
     description: Optional[str] = None
     status: Optional[str] = None
     priority: Optional[str] = None
-    date: Optional[date] = None
+    date: Optional[date_type] = None
     group_id: Optional[int] = None
     estimated_time: Optional[int] = None
     actual_time: Optional[int] = None
@@ -71,6 +72,7 @@ class TaskResponse(TaskBase):
     id: int
     user_id: int
     group_id: Optional[int] = None
+    position: Optional[str] = None
     points_value: int = 0
     completed_at: Optional[datetime] = None
     created_at: datetime
@@ -79,3 +81,51 @@ class TaskResponse(TaskBase):
     
     class Config:
         from_attributes = True
+
+
+class TaskMove(BaseModel):
+    """
+    Where to put a task: in `group_id` (default: its current group), after
+    one task and/or before another of that group; neither means last.
+    """
+    group_id: Optional[int] = None
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+
+# --- Bulk Schemas ---
+
+class TaskBulkCreate(BaseModel):
+    """Schema for creating many tasks in one request."""
+    tasks: List[TaskCreate]
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """One task of a bulk update: its ID and the fields to change."""
+    id: int
+
+
+class TaskBulkUpdate(BaseModel):
+    """Schema for updating many tasks in one request."""
+    tasks: List[TaskBulkUpdateItem]
+
+
+class TaskBulkDelete(BaseModel):
+    """Schema for deleting many tasks in one request."""
+    ids: List[int]
+
+
+class TaskBulkItemResult(BaseModel):
+    """Outcome of one item of a bulk request, by its position in the request."""
+    index: int
+    id: Optional[int] = None
+    ok: bool
+    error: Optional[str] = None
+    task: Optional[TaskResponse] = None
+
+
+class TaskBulkResult(BaseModel):
+    """Schema for bulk responses."""
+    succeeded: int
+    failed: int
+    results: List[TaskBulkItemResult]
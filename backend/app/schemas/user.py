@@ -50,6 +50,13 @@ class Token(BaseModel):
     """Schema for JWT token response."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # access token lifetime in seconds
+
+
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging a refresh token."""
+    refresh_token: str
 
 
 class TokenData(BaseModel):
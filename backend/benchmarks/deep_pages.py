@@ -0,0 +1,103 @@
+"""
+Cost of deep pages: offset vs keyset pagination of one user's tasks.
+
+Seeds a throwaway SQLite database with one user owning --tasks tasks, then
+times the query for a page of --limit tasks at increasing depths, once with
+offset(skip) and once from the cursor of the row just before that page
+(app.core.pagination). Offset pages get slower with depth; keyset pages
+should not.
+
+Usage (from backend/):
+    python -m benchmarks.deep_pages
+    python -m benchmarks.deep_pages --tasks 200000 --limit 50 --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='pages-bench-')}/bench.db")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import insert, select
+
+from app.core.database import SessionLocal
+from app.core.pagination import Keyset
+from app.core.schema import ALEMBIC_INI
+from app.models.task import Task
+from app.models.user import User
+
+_pages = Keyset("tasks", Task.created_at, Task.id)
+
+
+def _seed(tasks: int) -> int:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+    db = SessionLocal()
+    user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    # One task a minute, as if created over time; Core insert because the ORM
+    # flush would take longer than the benchmark itself
+    started = datetime(2020, 1, 1)
+    for start in range(0, tasks, 10000):
+        db.execute(insert(Task), [
+            {"name": f"Task {n}", "user_id": user.id, "created_at": started + timedelta(minutes=n)}
+            for n in range(start, min(start + 10000, tasks))
+        ])
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def _time(func, repeat: int) -> float:
+    func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    user_id = _seed(args.tasks)
+    db = SessionLocal()
+    base = select(Task).where(Task.user_id == user_id)
+
+    print(f"Page of {args.limit} out of {args.tasks} tasks (median of {args.repeat}):")
+    print(f"  {'depth':>8}  {'offset':>10}  {'cursor':>10}")
+    depth = args.limit
+    while depth < args.tasks:
+        # limit=0 still fetches the one look-ahead row: the last task of the previous page
+        before = db.scalars(_pages.apply(base, db, cursor=None, skip=depth - 1, limit=0)).one()
+        cursor = _pages.encode(before)
+
+        def by_offset():
+            return db.scalars(_pages.apply(base, db, cursor=None, skip=depth, limit=args.limit)).all()
+
+        def by_cursor():
+            return db.scalars(_pages.apply(base, db, cursor=cursor, skip=0, limit=args.limit)).all()
+
+        assert [t.id for t in by_offset()] == [t.id for t in by_cursor()]
+        print(f"  {depth:>8}  {_time(by_offset, args.repeat):>8.2f}ms  {_time(by_cursor, args.repeat):>8.2f}ms")
+        depth *= 4
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
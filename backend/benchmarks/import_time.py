@@ -0,0 +1,129 @@
+"""
+Cold import time of the application (what every new worker pays at startup).
+
+Imports `app.main` in fresh interpreters under `python -X importtime`, reports
+the median total and the slowest top-level imports, and exits non-zero when
+the median is over the budget or when a lazily-loaded SDK (stripe, authlib,
+the email providers) was imported at startup.
+
+Usage (from backend/):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 10 --budget-ms 1500 --top 15
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Override per machine with IMPORT_TIME_BUDGET_MS (CI runners are slower than laptops)
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+
+# Provider SDKs that must only be imported on first use
+LAZY_MODULES = ("stripe", "authlib", "httpx")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_PROBE = (
+    "import sys, app.main; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+
+
+def import_once(module: str = "app.main") -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Import `module` in a fresh interpreter.
+
+    Returns the cumulative import time in ms, the cumulative time of each
+    module imported directly by the top-level import, and any LAZY_MODULES
+    that ended up loaded.
+    """
+    probe = _PROBE.replace("app.main", module)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    children: Dict[str, float] = {}
+    pending: Dict[str, float] = {}
+    # A module's line comes after the lines of everything it imported
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if len(indent) == 1:
+            if name == module:
+                total = int(cumulative) / 1000
+                children = pending
+            pending = {}
+        elif len(indent) == 3:
+            pending[name] = pending.get(name, 0.0) + int(cumulative) / 1000
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return total, children, loaded
+
+
+def measure(runs: int = 5, module: str = "app.main") -> dict:
+    """Median cold import time over `runs` interpreters."""
+    totals = []
+    children: Dict[str, List[float]] = {}
+    loaded = set()
+    for _ in range(runs):
+        total, direct, lazy = import_once(module)
+        totals.append(total)
+        for name, ms in direct.items():
+            children.setdefault(name, []).append(ms)
+        loaded.update(lazy)
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "max_ms": round(max(totals), 1),
+        "slowest": sorted(
+            ((name, round(statistics.median(values), 1)) for name, values in children.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        ),
+        "eager_sdks": sorted(loaded),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="median budget for the import")
+    parser.add_argument("--top", type=int, default=10, help="how many top-level imports to list")
+    parser.add_argument("--module", default="app.main")
+    args = parser.parse_args()
+
+    result = measure(args.runs, args.module)
+    print(
+        f"import {result['module']}: median {result['median_ms']} ms "
+        f"(min {result['min_ms']}, max {result['max_ms']}, {result['runs']} runs), "
+        f"budget {args.budget_ms:g} ms"
+    )
+    for name, ms in result["slowest"][:args.top]:
+        print(f"  {ms:>9.1f} ms  {name}")
+
+    failed = False
+    if result["eager_sdks"]:
+        print(f"FAIL: imported at startup, should be lazy: {', '.join(result['eager_sdks'])}")
+        failed = True
+    if result["median_ms"] > args.budget_ms:
+        print(f"FAIL: over budget by {result['median_ms'] - args.budget_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Index usage of the hot per-user queries on a large seeded dataset.
+
+Seeds a throwaway database (SQLite unless DATABASE_URL points elsewhere)
+with --rows tasks and as many task_history rows spread over --users users,
+a plan and a daily_stats row per user per day for --days days, and two team
+memberships per user. Then, for each hot query (task lists filtered by
+date/status, plan and daily-stats lookups, history ranges, membership checks,
+a board group's tasks) prints the database's query plan and the median
+latency.
+
+With --compare the queries also run at the revision before the composite
+and unique indexes (0005), so both plans can be read side by side. Seeding
+the default 10M rows into SQLite takes several minutes; pass e.g.
+--rows 1000000 for a quicker run.
+
+Usage (from backend/):
+    python -m benchmarks.index_usage
+    python -m benchmarks.index_usage --rows 1000000 --users 2000 --compare
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='index-bench-')}/bench.db")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import insert, select, text
+
+from app.core.database import engine
+from app.core.schema import ALEMBIC_INI
+from app.models.board import Board, Group
+from app.models.plan import Plan
+from app.models.task import Task
+from app.models.task_history import DailyStats, TaskHistory
+from app.models.team import Team, TeamMember
+from app.models.user import User
+
+BATCH = 20000
+STATUSES = ("not_started", "in_progress", "done", "postponed")
+FIRST_DAY = date(2025, 1, 1)
+BEFORE_INDEXES = "0005"
+
+
+def _config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def _insert(conn, table, rows) -> None:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH:
+            conn.execute(insert(table), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+
+
+def seed(args) -> None:
+    started = time.perf_counter()
+    rng = random.Random(42)
+    teams = max(1, args.users // 10)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        _insert(conn, User.__table__, (
+            {"id": u, "email": f"bench-{u}@example.com", "hashed_password": "x"} for u in range(1, args.users + 1)
+        ))
+        _insert(conn, Team.__table__, ({"id": t, "name": f"Team {t}"} for t in range(1, teams + 1)))
+        _insert(conn, TeamMember.__table__, (
+            {"team_id": t, "user_id": u, "role": "member"}
+            for u in range(1, args.users + 1)
+            for t in {(u % teams) + 1, ((u * 7) % teams) + 1}
+        ))
+        _insert(conn, Board.__table__, ({"id": u, "name": "Board", "user_id": u} for u in range(1, args.users + 1)))
+        _insert(conn, Group.__table__, (
+            {"id": (u - 1) * 3 + g + 1, "name": f"Group {g}", "board_id": u}
+            for u in range(1, args.users + 1) for g in range(3)
+        ))
+        _insert(conn, Task.__table__, (
+            {
+                "id": n + 1,
+                "name": f"Task {n}",
+                "user_id": n % args.users + 1,
+                "status": rng.choice(STATUSES),
+                "date": FIRST_DAY + timedelta(days=rng.randrange(args.days)),
+                "group_id": (n % args.users) * 3 + rng.randrange(3) + 1 if n % 4 == 0 else None,
+                "created_at": start + timedelta(seconds=n),
+            }
+            for n in range(args.rows)
+        ))
+        _insert(conn, TaskHistory.__table__, (
+            {
+                "task_id": n + 1,
+                "user_id": n % args.users + 1,
+                "event_type": "status_changed",
+                "created_at": start + timedelta(seconds=n),
+            }
+            for n in range(args.rows)
+        ))
+        for table in (Plan.__table__, DailyStats.__table__):
+            _insert(conn, table, (
+                {"user_id": u, "date": FIRST_DAY + timedelta(days=d)}
+                for u in range(1, args.users + 1) for d in range(args.days)
+            ))
+    print(f"Seeded {args.rows} tasks in {time.perf_counter() - started:.0f}s")
+
+
+def queries(args):
+    user = args.users // 2
+    day = FIRST_DAY + timedelta(days=args.days // 2)
+    moment = datetime(2025, 1, 1) + timedelta(seconds=args.rows // 2)
+    return [
+        ("tasks by date and status", select(Task.id).where(
+            Task.user_id == user, Task.date == day, Task.status == "done"
+        ).order_by(Task.created_at.desc(), Task.id.desc()).limit(100)),
+        ("tasks, newest first", select(Task.id).where(Task.user_id == user)
+            .order_by(Task.created_at.desc(), Task.id.desc()).limit(100)),
+        ("tasks of a board group", select(Task.id).where(Task.group_id == user * 3)),
+        ("plan of a day", select(Plan.id).where(Plan.user_id == user, Plan.date == day)),
+        ("plans, latest first", select(Plan.id).where(Plan.user_id == user)
+            .order_by(Plan.date.desc(), Plan.id.desc()).limit(100)),
+        ("history in a range", select(TaskHistory.id).where(
+            TaskHistory.user_id == user, TaskHistory.created_at >= moment - timedelta(days=7),
+            TaskHistory.created_at < moment,
+        ).order_by(TaskHistory.created_at.desc(), TaskHistory.id.desc()).limit(50)),
+        ("daily stats, 30 days", select(DailyStats.id).where(
+            DailyStats.user_id == user, DailyStats.date >= day - timedelta(days=29), DailyStats.date <= day,
+        ).order_by(DailyStats.date.desc())),
+        ("membership check", select(TeamMember.role).where(
+            TeamMember.team_id == (user % max(1, args.users // 10)) + 1, TeamMember.user_id == user
+        )),
+        ("teams of a user", select(TeamMember.team_id, TeamMember.role).where(TeamMember.user_id == user)),
+    ]
+
+
+def _plan(conn, statement) -> str:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    if engine.dialect.name == "sqlite":
+        return "; ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    return "; ".join(row[0].strip() for row in conn.execute(text(f"EXPLAIN {sql}")))
+
+
+def measure(args, label: str) -> None:
+    # Fresh connections: pooled ones may hold statements prepared against the old schema
+    engine.dispose()
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"\n{label} (median of {args.repeat}):")
+    with engine.connect() as conn:
+        for name, statement in queries(args):
+            conn.execute(statement).all()
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                conn.execute(statement).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"  {name:<26} {statistics.median(samples):>9.2f} ms  {_plan(conn, statement)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="tasks, and as many history rows")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365, help="plans and daily stats per user")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--compare", action="store_true", help=f"also measure at revision {BEFORE_INDEXES}")
+    args = parser.parse_args()
+
+    config = _config()
+    command.upgrade(config, "head")
+    seed(args)
+
+    if args.compare:
+        command.downgrade(config, BEFORE_INDEXES)
+        measure(args, f"Before the composite indexes (revision {BEFORE_INDEXES})")
+        command.upgrade(config, "head")
+    measure(args, "With the composite and unique indexes (head)")
+
+
+if __name__ == "__main__":
+    main()
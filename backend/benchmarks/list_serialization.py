@@ -0,0 +1,152 @@
+"""
+Encoding cost of large list responses (GET /tasks with 1000 tasks).
+
+First times the encoders alone on in-memory Task rows with subtasks:
+stdlib json over jsonable_encoder (the classic FastAPI path), FastAPI's
+response_model path (TypeAdapter validation + pydantic JSON), validation +
+orjson (what an orjson default response class would do), and the
+trusted-row path list endpoints use (app.core.responses). Then times
+GET /api/v1/tasks/?limit=N end to end on a throwaway SQLite database,
+through the response_model path and the trusted-row path.
+
+Usage (from backend/):
+    python -m benchmarks.list_serialization
+    python -m benchmarks.list_serialization --tasks 1000 --subtasks 3 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from typing import Callable, List
+
+# The end-to-end part imports the app, which reads DATABASE_URL at import time
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='list-bench-')}/bench.db")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core import responses
+from app.models.task import Subtask, Task
+from app.schemas.task import TaskResponse
+
+
+def _rows(tasks: int, subtasks: int) -> List[Task]:
+    now = datetime.now(timezone.utc)
+    rows = []
+    for n in range(tasks):
+        task = Task(
+            id=n, name=f"Task {n}", description="Something to do " * 4, status="in_progress",
+            priority="high", date=date.today(), estimated_time=30, actual_time=None, points_value=5,
+            user_id=1, group_id=None, completed_at=None, created_at=now, updated_at=now,
+        )
+        task.subtasks = [
+            Subtask(id=n * subtasks + i, name=f"Step {i}", is_done=False, order=i, task_id=n, created_at=now, updated_at=now)
+            for i in range(subtasks)
+        ]
+        rows.append(task)
+    return rows
+
+
+def _time(func: Callable[[], bytes], repeat: int) -> float:
+    func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def encoders(args) -> None:
+    rows = _rows(args.tasks, args.subtasks)
+    adapter = TypeAdapter(List[TaskResponse])
+
+    def validated():
+        return adapter.validate_python(rows, from_attributes=True)
+
+    cases = [
+        ("stdlib json (jsonable_encoder)", lambda: json.dumps(jsonable_encoder(validated())).encode()),
+        ("response_model (pydantic JSON)", lambda: adapter.dump_json(validated())),
+        ("response_model + orjson", lambda: orjson.dumps(adapter.dump_python(validated(), mode="json"))),
+        ("trusted rows + orjson", lambda: orjson.dumps(responses.serialize_rows(rows, TaskResponse), option=responses._ORJSON_OPTIONS)),
+    ]
+    if responses._msgpack() is not None:
+        cases.append((
+            "trusted rows + msgpack",
+            lambda: responses._msgpack().packb(responses.serialize_rows(rows, TaskResponse), default=responses._msgpack_default),
+        ))
+
+    print(f"Encoders, {args.tasks} tasks x {args.subtasks} subtasks (median of {args.repeat}):")
+    for label, func in cases:
+        print(f"  {label:<34} {_time(func, args.repeat):>8.1f} ms  {len(func()) / 1024:>7.0f} KiB")
+
+
+def end_to_end(args) -> None:
+    from alembic import command
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+
+    from app.api.v1.endpoints import tasks as task_endpoints
+    from app.core.database import SessionLocal
+    from app.core.schema import ALEMBIC_INI
+    from app.core.security import create_access_token
+    from app.main import app
+    from app.models.user import User
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+    db = SessionLocal()
+    user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    for n in range(args.tasks):
+        task = Task(name=f"Task {n}", description="Something to do " * 4, date=date.today(), user_id=user.id)
+        task.subtasks = [Subtask(name=f"Step {i}", order=i) for i in range(args.subtasks)]
+        db.add(task)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(user.id)})}"}
+    db.close()
+
+    client = TestClient(app)
+    url = f"/api/v1/tasks/?limit={args.tasks}"
+
+    def fetch():
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        return response.content
+
+    trusted = _time(fetch, args.repeat)
+    original = task_endpoints.list_response
+    # Hand the ORM rows back to FastAPI, as before: validated against response_model
+    task_endpoints.list_response = lambda request, rows, schema, **kwargs: rows
+    try:
+        validated = _time(fetch, args.repeat)
+    finally:
+        task_endpoints.list_response = original
+
+    print(f"GET {url} end to end (median of {args.repeat}, includes the query):")
+    print(f"  {'response_model path':<34} {validated:>8.1f} ms")
+    print(f"  {'trusted rows + orjson':<34} {trusted:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--subtasks", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    encoders(args)
+    end_to_end(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Task CRUD latency during a login storm.
+
+Starts the API under uvicorn on a throwaway SQLite database, measures task
+CRUD latency (create, read, update, delete) on its own, then again while
+many clients hammer /auth/login/json. Runs twice: bcrypt on the default
+thread pool with no queue limit (the old behaviour), then on the bounded
+process pool.
+
+Usage (from backend/):
+    python -m benchmarks.login_storm
+    python -m benchmarks.login_storm --seconds 10 --login-clients 64 --hash-workers 2
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _start_server(env: Dict[str, str], port: int) -> subprocess.Popen:
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True,
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+
+async def _crud_loop(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event, latencies: List[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.post("/api/v1/tasks/", json={"name": "bench"}, headers=headers)
+        task_id = response.json()["id"]
+        await client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+        await client.put(f"/api/v1/tasks/{task_id}", json={"status": "done"}, headers=headers)
+        await client.delete(f"/api/v1/tasks/{task_id}", headers=headers)
+        # Average per request of the four
+        latencies.append((time.perf_counter() - started) / 4 * 1000)
+
+
+async def _login_loop(client: httpx.AsyncClient, credentials: dict, stop: asyncio.Event, codes: Dict[int, int]):
+    while not stop.is_set():
+        try:
+            response = await client.post("/api/v1/auth/login/json", json=credentials)
+            codes[response.status_code] = codes.get(response.status_code, 0) + 1
+            if response.status_code == 503:
+                # Well-behaved clients back off as told
+                await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+        except httpx.TimeoutException:
+            codes[0] = codes.get(0, 0) + 1
+
+
+async def _phase(client, headers, credentials, seconds: float, crud_clients: int, login_clients: int) -> dict:
+    stop = asyncio.Event()
+    latencies: List[float] = []
+    codes: Dict[int, int] = {}
+    workers = [asyncio.create_task(_crud_loop(client, headers, stop, latencies)) for _ in range(crud_clients)]
+    workers += [asyncio.create_task(_login_loop(client, credentials, stop, codes)) for _ in range(login_clients)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*workers)
+    return {
+        "crud_p50_ms": round(statistics.median(latencies), 1) if latencies else 0.0,
+        "crud_p99_ms": round(_percentile(latencies, 99), 1),
+        "crud_ops": len(latencies),
+        "logins_ok": codes.get(200, 0),
+        "logins_shed": codes.get(503, 0),
+        "logins_timed_out": codes.get(0, 0),
+    }
+
+
+async def _run(hash_workers: int, max_pending: int, args) -> dict:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tempfile.mkdtemp(prefix='login-storm-')}/bench.db",
+        "ENVIRONMENT": "benchmark",
+        "PASSWORD_HASH_WORKERS": str(hash_workers),
+        "PASSWORD_HASH_MAX_PENDING": str(max_pending),
+    }
+    server = _start_server(env, port)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            timeout=30,
+            limits=httpx.Limits(max_connections=args.login_clients + args.crud_clients + 8),
+        ) as client:
+            await _wait_ready(client)
+            credentials = {"email": f"storm-{uuid.uuid4().hex[:8]}@example.com", "password": "storm-password"}
+            await client.post("/api/v1/auth/signup", json=credentials)
+            token = (await client.post("/api/v1/auth/login/json", json=credentials)).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            quiet = await _phase(client, headers, credentials, args.seconds, args.crud_clients, 0)
+            storm = await _phase(client, headers, credentials, args.seconds, args.crud_clients, args.login_clients)
+            return {"quiet": quiet, "storm": storm}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each phase")
+    parser.add_argument("--crud-clients", type=int, default=4)
+    parser.add_argument("--login-clients", type=int, default=32)
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=8)
+    args = parser.parse_args()
+
+    modes = [
+        ("thread pool, unbounded", 0, 1_000_000),
+        (f"{args.hash_workers} processes, max {args.max_pending} pending", args.hash_workers, args.max_pending),
+    ]
+    print(f"{args.crud_clients} CRUD clients, {args.login_clients} login clients, {args.seconds:g}s per phase")
+    for label, workers, max_pending in modes:
+        result = asyncio.run(_run(workers, max_pending, args))
+        quiet, storm = result["quiet"], result["storm"]
+        print(f"{label}:")
+        print(f"  quiet  CRUD p50 {quiet['crud_p50_ms']:>7} ms  p99 {quiet['crud_p99_ms']:>7} ms")
+        print(
+            f"  storm  CRUD p50 {storm['crud_p50_ms']:>7} ms  p99 {storm['crud_p99_ms']:>7} ms  "
+            f"logins ok {storm['logins_ok']}, shed (503) {storm['logins_shed']}, "
+            f"timed out {storm['logins_timed_out']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Cost of dragging a card: renumbering an integer order vs. fractional keys.
+
+Seeds a throwaway SQLite database with one group of --tasks tasks, ordered
+twice: by tasks.position (app.core.ranking) and by an integer `ord` column
+in a scratch table shaped like the old Group.order scheme. Then performs
+--moves random moves (a card taken from anywhere and dropped anywhere else)
+each way, timing each move's transaction and counting the rows it writes:
+
+- renumbering shifts every card between the old and the new place by one;
+- a fractional move reads its two neighbours' keys and updates one row.
+
+Finally reports the longest key after the random moves, after --gap moves
+into the same gap (the worst case for key growth), and the time to rebalance
+the group.
+
+Usage (from backend/):
+    python -m benchmarks.rank_moves
+    python -m benchmarks.rank_moves --tasks 10000 --moves 500
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='rank-bench-')}/bench.db")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Column, Index, Integer, MetaData, Table, func, insert, select, update
+
+from app.core.database import engine
+from app.core.ranking import key_between, keys_between, rebalance
+from app.core.schema import ALEMBIC_INI
+from app.models.board import Board, Group
+from app.models.task import Task
+from app.models.user import User
+
+# The integer scheme being replaced: a dense 0..n-1 order per group
+_renumbered = Table(
+    "bench_renumbered_tasks", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("group_id", Integer, nullable=False),
+    Column("ord", Integer, nullable=False),
+    Index("ix_bench_renumbered_tasks_group_id_ord", "group_id", "ord"),
+)
+
+
+def _seed(tasks: int) -> None:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    _renumbered.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__).values(id=1, email="bench@example.com", hashed_password="x"))
+        conn.execute(insert(Board.__table__).values(id=1, name="Board", user_id=1))
+        conn.execute(insert(Group.__table__).values(id=1, name="Group", board_id=1, position=key_between(None, None)))
+        positions = keys_between(None, None, tasks)
+        conn.execute(insert(Task.__table__), [
+            {"id": n + 1, "name": f"Task {n}", "user_id": 1, "group_id": 1, "position": positions[n]}
+            for n in range(tasks)
+        ])
+        conn.execute(insert(_renumbered), [{"id": n + 1, "group_id": 1, "ord": n} for n in range(tasks)])
+
+
+def _renumber_move(conn, task_id: int, target: int) -> int:
+    """Move the task to index `target`, shifting the cards in between; rows written."""
+    current = conn.scalar(select(_renumbered.c.ord).where(_renumbered.c.id == task_id))
+    if target == current:
+        return 0
+    if target < current:
+        shift = _renumbered.c.ord.between(target, current - 1), _renumbered.c.ord + 1
+    else:
+        shift = _renumbered.c.ord.between(current + 1, target), _renumbered.c.ord - 1
+    shifted = conn.execute(
+        update(_renumbered).where(_renumbered.c.group_id == 1, shift[0]).values(ord=shift[1])
+    ).rowcount
+    conn.execute(update(_renumbered).where(_renumbered.c.id == task_id).values(ord=target))
+    return shifted + 1
+
+
+def _fractional_move(conn, task_id: int, after_id, before_id) -> int:
+    """Move the task between two neighbours (None: an end of the list); rows written."""
+    positions = dict(conn.execute(
+        select(Task.id, Task.position).where(Task.id.in_([after_id, before_id]))
+    ).all())
+    position = key_between(positions.get(after_id), positions.get(before_id))
+    conn.execute(update(Task).where(Task.id == task_id).values(position=position))
+    return 1
+
+
+def _order(conn):
+    return list(conn.scalars(select(Task.id).where(Task.group_id == 1).order_by(Task.position, Task.id)))
+
+
+def _longest(conn) -> int:
+    return conn.scalar(select(func.max(func.length(Task.position))).where(Task.group_id == 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000, help="cards in the group")
+    parser.add_argument("--moves", type=int, default=300, help="random moves")
+    parser.add_argument("--gap", type=int, default=100, help="moves into the same gap")
+    args = parser.parse_args()
+
+    _seed(args.tasks)
+    rng = random.Random(42)
+    order = list(range(1, args.tasks + 1))
+    timings = {"renumber": [], "fractional": []}
+    written = {"renumber": [], "fractional": []}
+    for _ in range(args.moves):
+        task_id = rng.choice(order)
+        order.remove(task_id)
+        target = rng.randrange(len(order) + 1)
+        after_id = order[target - 1] if target else None
+        before_id = order[target] if target < len(order) else None
+        order.insert(target, task_id)
+
+        for name, move in (
+            ("renumber", lambda conn: _renumber_move(conn, task_id, target)),
+            ("fractional", lambda conn: _fractional_move(conn, task_id, after_id, before_id)),
+        ):
+            started = time.perf_counter()
+            with engine.begin() as conn:
+                written[name].append(move(conn))
+            timings[name].append((time.perf_counter() - started) * 1000)
+
+    with engine.connect() as conn:
+        assert _order(conn) == order
+        renumbered = conn.scalars(select(_renumbered.c.id).order_by(_renumbered.c.ord)).all()
+        assert list(renumbered) == order
+
+        print(f"{args.moves} random moves in a group of {args.tasks} cards:")
+        print(f"  {'':<12} {'median':>9} {'p99':>9} {'rows written/move':>18}")
+        for name in ("renumber", "fractional"):
+            samples = sorted(timings[name])
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+            print(
+                f"  {name:<12} {statistics.median(samples):>7.2f}ms {p99:>7.2f}ms "
+                f"{statistics.mean(written[name]):>18.1f}"
+            )
+        print(f"\nLongest key after the random moves: {_longest(conn)} characters")
+
+    with engine.begin() as conn:
+        first, second = order[0], order[1]
+        for n in range(args.gap):
+            # Alternate two cards into the gap right after the first card
+            task_id = order[2 + n % 2]
+            _fractional_move(conn, task_id, first, second)
+            second = task_id
+        print(f"Longest key after {args.gap} moves into one gap: {_longest(conn)} characters")
+
+    started = time.perf_counter()
+    asyncio.run(rebalance(Task, 1))
+    elapsed = (time.perf_counter() - started) * 1000
+    with engine.connect() as conn:
+        print(f"Rebalance of {args.tasks} cards: {elapsed:.0f}ms, longest key {_longest(conn)} characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Concurrent SQLite write throughput: default settings vs. production mode.
+
+Simulates several uvicorn workers (processes), each serving requests on a
+few threads. Every request runs a small ORM transaction (read + insert +
+update + commit), like the task endpoints do. With --async each process
+serves the requests as coroutines on AsyncSessions instead, the way the
+task, board and stats endpoints do.
+
+Usage (from backend/):
+    python -m benchmarks.sqlite_writes
+    python -m benchmarks.sqlite_writes --processes 4 --threads 8 --requests 200
+    python -m benchmarks.sqlite_writes --async
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import Column, Integer, String, create_engine, exc, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.sqlite import apply_sqlite_pragmas, serialize_sqlite_writes
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "bench_items"
+
+    id = Column(Integer, primary_key=True)
+    owner = Column(Integer, nullable=False, index=True)
+    name = Column(String(200), nullable=False)
+    version = Column(Integer, default=0, nullable=False)
+
+
+def _make_engine(path: str, tuned: bool):
+    engine = create_engine(f"sqlite:///{path}")
+    if tuned:
+        apply_sqlite_pragmas(engine)
+        serialize_sqlite_writes(engine)
+    return engine
+
+
+def _worker(path: str, tuned: bool, threads: int, requests: int, owner_base: int, go, results):
+    engine = _make_engine(path, tuned)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    ok = 0
+    locked = 0
+    ok_lock = threading.Lock()
+
+    def serve(owner: int):
+        nonlocal ok, locked
+        for n in range(requests):
+            session = Session()
+            try:
+                count = session.scalar(select(func.count()).where(Item.owner == owner))
+                item = Item(owner=owner, name=f"item {count}")
+                session.add(item)
+                session.flush()
+                item.version = item.version + 1
+                session.commit()
+                with ok_lock:
+                    ok += 1
+            except exc.OperationalError:
+                session.rollback()
+                with ok_lock:
+                    locked += 1
+            finally:
+                session.close()
+
+    pool = [threading.Thread(target=serve, args=(owner_base + i,)) for i in range(threads)]
+    go.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    results.put((ok, locked, elapsed))
+
+
+def _async_worker(path: str, tuned: bool, tasks: int, requests: int, owner_base: int, go, results):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    if tuned:
+        apply_sqlite_pragmas(engine.sync_engine)
+        serialize_sqlite_writes(engine)
+    Session = async_sessionmaker(bind=engine, autoflush=False)
+    ok = 0
+    locked = 0
+
+    async def serve(owner: int):
+        nonlocal ok, locked
+        for n in range(requests):
+            async with Session() as session:
+                try:
+                    count = await session.scalar(select(func.count()).where(Item.owner == owner))
+                    item = Item(owner=owner, name=f"item {count}")
+                    session.add(item)
+                    await session.flush()
+                    item.version = item.version + 1
+                    await session.commit()
+                    ok += 1
+                except exc.OperationalError:
+                    await session.rollback()
+                    locked += 1
+
+    async def main():
+        started = time.perf_counter()
+        await asyncio.gather(*(serve(owner_base + i) for i in range(tasks)))
+        elapsed = time.perf_counter() - started
+        await engine.dispose()
+        return elapsed
+
+    go.wait()
+    elapsed = asyncio.run(main())
+    results.put((ok, locked, elapsed))
+
+
+def run(tuned: bool, processes: int, threads: int, requests: int, use_async: bool = False) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix="sqlite-bench-"), "bench.db")
+    engine = _make_engine(path, tuned)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    go = ctx.Event()
+    workers = [
+        ctx.Process(target=_async_worker if use_async else _worker, args=(path, tuned, threads, requests, p * threads, go, results))
+        for p in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    # Let every process finish importing before the clock starts
+    time.sleep(2)
+    go.set()
+    totals = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    # Wall time of the slowest worker
+    elapsed = max(seconds for _, _, seconds in totals)
+
+    committed = sum(ok for ok, _, _ in totals)
+    return {
+        "mode": "production" if tuned else "default",
+        "committed": committed,
+        "locked_errors": sum(locked for _, locked, _ in totals),
+        "seconds": round(elapsed, 2),
+        "writes_per_second": round(committed / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100, help="transactions per thread")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="coroutines on AsyncSessions")
+    args = parser.parse_args()
+
+    unit = "coroutines" if args.use_async else "threads"
+    print(f"{args.processes} processes x {args.threads} {unit} x {args.requests} transactions")
+    for tuned in (False, True):
+        result = run(tuned, args.processes, args.threads, args.requests, args.use_async)
+        print(
+            f"{result['mode']:>10}: {result['writes_per_second']:>8} writes/s, "
+            f"{result['committed']} committed, {result['locked_errors']} 'database is locked', "
+            f"{result['seconds']}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
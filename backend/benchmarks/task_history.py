@@ -0,0 +1,123 @@
+"""
+Overhead of task history capture (app.core.history) on the task update path.
+
+Seeds a throwaway SQLite database with --tasks tasks, then times --updates
+single-task status changes (load, set status, commit - what PATCH /tasks/{id}
+does) twice: with the history listeners removed and with them installed
+(which includes the daily_stats upsert of app.core.gamification). Also times plain edits that leave the status alone, which only pay for the
+listener's check. Reports the median and p99 of each and exits non-zero when
+the median cost added to a status change is over the budget.
+
+Usage (from backend/):
+    python -m benchmarks.task_history
+    python -m benchmarks.task_history --updates 5000 --budget-ms 0.5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='history-bench-')}/bench.db")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core import history
+from app.core.database import SessionLocal, engine
+from app.core.schema import ALEMBIC_INI
+from app.models.task import Task
+from app.models.task_history import TaskHistory
+from app.models.user import User
+
+# Override per machine with HISTORY_OVERHEAD_BUDGET_MS (CI runners are slower than laptops)
+DEFAULT_BUDGET_MS = float(os.getenv("HISTORY_OVERHEAD_BUDGET_MS", "1.0"))
+
+_LISTENERS = (
+    ("before_flush", history._collect_on_flush),
+    ("after_flush", history._record_on_flush),
+    ("after_soft_rollback", history._discard_on_rollback),
+)
+
+STATUSES = ("not_started", "in_progress", "done", "postponed")
+
+
+def _seed(tasks: int) -> None:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__).values(id=1, email="bench@example.com", hashed_password="x"))
+        conn.execute(insert(Task.__table__), [{"id": n + 1, "name": f"Task {n}", "user_id": 1} for n in range(tasks)])
+
+
+def _install(enabled: bool) -> None:
+    for name, listener in _LISTENERS:
+        installed = event.contains(Session, name, listener)
+        if enabled and not installed:
+            event.listen(Session, name, listener)
+        elif not enabled and installed:
+            event.remove(Session, name, listener)
+
+
+def _time_updates(rng: random.Random, tasks: int, updates: int, field: str):
+    timings = []
+    for _ in range(updates):
+        task_id = rng.randrange(1, tasks + 1)
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            task = db.get(Task, task_id)
+            if field == "status":
+                task.status = rng.choice([status for status in STATUSES if status != task.status])
+            else:
+                task.priority = rng.choice(["low", "medium", "high", "urgent"])
+            db.commit()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks in the database")
+    parser.add_argument("--updates", type=int, default=2000, help="updates per run")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="median overhead allowed")
+    args = parser.parse_args()
+
+    _seed(args.tasks)
+    results = {}
+    for enabled in (False, True, False, True):
+        # Each configuration twice, interleaved, so warm-up does not favour either
+        _install(enabled)
+        for field in ("status", "priority"):
+            rng = random.Random(7)
+            results.setdefault((enabled, field), []).extend(_time_updates(rng, args.tasks, args.updates, field))
+    _install(True)
+
+    print(f"{args.updates * 2} single-task updates on {args.tasks} tasks:")
+    print(f"  {'':<28} {'median':>9} {'p99':>9}")
+    medians = {}
+    for (enabled, field), samples in sorted(results.items(), key=lambda item: (item[0][1], item[0][0])):
+        samples.sort()
+        medians[enabled, field] = statistics.median(samples)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        label = f"{field} change, history {'on' if enabled else 'off'}"
+        print(f"  {label:<28} {medians[enabled, field]:>7.3f}ms {p99:>7.3f}ms")
+
+    with engine.connect() as conn:
+        rows = conn.scalar(select(func.count()).select_from(TaskHistory))
+    overhead = medians[True, "status"] - medians[False, "status"]
+    print(f"\n{rows} history rows written; median overhead of a status change: {overhead:.3f}ms "
+          f"(budget {args.budget_ms:.3f}ms)")
+    if overhead > args.budget_ms:
+        print("Over budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
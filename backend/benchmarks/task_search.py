@@ -0,0 +1,153 @@
+"""
+Task search: the full-text index against a LIKE scan.
+
+Seeds a throwaway SQLite database with --tasks tasks spread over --users
+users, indexed by the triggers of migration 0009. Names and descriptions
+draw words Zipf-style from a vocabulary of --vocabulary words, the way
+natural text does: a few words are in a large share of the tasks, most are
+rare. Every tenth task has a subtask. Then runs each
+query --repeat times for one user, both ways:
+
+- fts: app.core.search.hits(), ranked, first page of --limit rows - what
+  GET /tasks/search runs;
+- like: every word as `LIKE '%word%'` against name, description and subtask
+  names, over the user's tasks, first --limit rows by id. Unranked and
+  substring-only, so it does less than the index and is still a scan.
+
+Usage (from backend/):
+    python -m benchmarks.task_search
+    python -m benchmarks.task_search --tasks 100000 --users 10
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='search-bench-')}/bench.db")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import and_, exists, insert, or_, select
+
+from app.core.database import engine
+from app.core.schema import ALEMBIC_INI
+from app.core.search import hits, search_terms
+from app.models.task import Subtask, Task
+from app.models.user import User
+
+# The most common words, in order; the rest of the vocabulary is made up
+COMMON = (
+    "report budget review invoice meeting client design draft release deploy backup server "
+    "garden groceries dentist flight hotel passport birthday present library refund contract "
+    "hiring interview onboarding roadmap sprint retro quarterly summary newsletter workshop "
+    "laptop printer insurance renewal taxes receipt mortgage plumber painter kitchen"
+).split()
+
+# The most common word, a common pair, a prefix, a rarer pair, no match
+QUERIES = ("report", "quarterly budget", "pass", "mortgage plumber", "zzz")
+
+BATCH = 20000
+
+
+def _vocabulary(size: int, rng: random.Random):
+    syllables = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+    made_up = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size * 2)}
+    words = COMMON + sorted(made_up - set(COMMON))[:max(0, size - len(COMMON))]
+    # Zipf: the n-th most common word is used in proportion to 1/n
+    return words, list(itertools.accumulate(1 / n for n in range(1, len(words) + 1)))
+
+
+def _seed(tasks: int, users: int, vocabulary: int) -> None:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    rng = random.Random(42)
+    words, weights = _vocabulary(vocabulary, rng)
+
+    def text(k):
+        return " ".join(rng.choices(words, cum_weights=weights, k=k))
+
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": n + 1, "email": f"bench{n}@example.com", "hashed_password": "x"} for n in range(users)
+        ])
+        for start in range(0, tasks, BATCH):
+            ids = range(start + 1, min(start + BATCH, tasks) + 1)
+            conn.execute(insert(Task.__table__), [
+                {
+                    "id": task_id,
+                    "name": text(3).capitalize(),
+                    "description": text(12),
+                    "user_id": task_id % users + 1,
+                }
+                for task_id in ids
+            ])
+            conn.execute(insert(Subtask.__table__), [
+                {"name": text(2), "task_id": task_id} for task_id in ids if task_id % 10 == 0
+            ])
+
+
+def _fts(conn, q: str, user_id: int, limit: int):
+    matches = hits(conn.dialect.name, search_terms(q), user_id)
+    query = (
+        select(Task.id).join(matches, matches.c.id == Task.id).where(Task.user_id == user_id)
+        .order_by(matches.c.rank.desc(), matches.c.id.desc()).limit(limit)
+    )
+    return conn.scalars(query).all()
+
+
+def _like(conn, q: str, user_id: int, limit: int):
+    conditions = []
+    for term in search_terms(q):
+        pattern = f"%{term}%"
+        conditions.append(or_(
+            Task.name.ilike(pattern),
+            Task.description.ilike(pattern),
+            exists().where(Subtask.task_id == Task.id, Subtask.name.ilike(pattern)),
+        ))
+    query = select(Task.id).where(Task.user_id == user_id, and_(*conditions)).order_by(Task.id.desc()).limit(limit)
+    return conn.scalars(query).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="tasks in the database")
+    parser.add_argument("--users", type=int, default=4, help="owners the tasks are spread over")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="distinct words")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of each query")
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    _seed(args.tasks, args.users, args.vocabulary)
+    print(f"Seeded and indexed {args.tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+    print(f"Searching the {args.tasks // args.users} tasks of one user, first {args.limit} results:")
+    print(f"  {'query':<18} {'fts median':>11} {'fts p99':>9} {'like median':>12} {'like p99':>9} {'hits':>6}")
+    with engine.connect() as conn:
+        for q in QUERIES:
+            timings = {"fts": [], "like": []}
+            found = {}
+            for _ in range(args.repeat):
+                for name, search in (("fts", _fts), ("like", _like)):
+                    began = time.perf_counter()
+                    found[name] = search(conn, q, 1, args.limit)
+                    timings[name].append((time.perf_counter() - began) * 1000)
+            cells = []
+            for name in ("fts", "like"):
+                samples = sorted(timings[name])
+                p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+                cells += [statistics.median(samples), p99]
+            print(
+                f"  {q!r:<18} {cells[0]:>9.2f}ms {cells[1]:>7.2f}ms {cells[2]:>10.2f}ms {cells[3]:>7.2f}ms "
+                f"{len(found['fts']):>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,8 @@ import traceback
 sys.path.append(os.getcwd())
 
 try:
-    from app.core.database import SessionLocal, engine, Base
+    from app.core.database import SessionLocal, engine
+    from app.core.schema import check_schema_version
     from app.core.security import get_password_hash
     
     # Import ALL models to ensure relationships are registered
@@ -39,12 +40,12 @@ except ImportError as e:
 def create_admin_user():
     """Create or update admin test user."""
     
-    print("Initializing database tables...")
+    print("Checking database schema...")
     try:
-        Base.metadata.create_all(bind=engine)
+        check_schema_version(engine)
     except Exception as e:
-        print("Error creating tables:", e)
-        traceback.print_exc()
+        print("Database is not ready:", e)
+        print("Run `alembic upgrade head` first.")
         return False
     
     db = SessionLocal()
@@ -12,7 +12,7 @@ async def main():
         from app.core.security import get_password_hash, create_verification_token
         from app.models.user import User, AuthProvider
         from app.core.config import settings
-        from app.core.email import send_verification_email
+        from app.core.email import queue_verification_email
         print("   Imports successful")
     except Exception as e:
         print(f"   Import failed: {e}")
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+# Point the app at a throwaway SQLite database before anything imports settings
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="planner-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DB_DIR}/test.db"
+os.environ["ENVIRONMENT"] = "test"
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.core.config import settings
+from app.core.schema import ALEMBIC_INI
+from app.core.database import SessionLocal, async_engine, engine
+from app.core.security import create_access_token
+from app.models.user import User
+
+
+def _migrate_test_database():
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+_migrate_test_database()
+
+
+@pytest.fixture
+def client():
+    """Test client bound to the application."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def user():
+    """A fresh active user stored in the test database."""
+    db = SessionLocal()
+    try:
+        new_user = User(
+            email=f"user-{uuid.uuid4().hex[:12]}@example.com",
+            hashed_password="not-a-real-hash",
+            full_name="Test User",
+        )
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        db.expunge(new_user)
+        return new_user
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def auth_headers(user):
+    """Bearer headers for the `user` fixture."""
+    token = create_access_token(data={"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def metrics_headers(monkeypatch):
+    """Bearer headers for GET /metrics, with a METRICS_TOKEN configured."""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "test-metrics-token")
+    return {"Authorization": "Bearer test-metrics-token"}
+
+
+@contextmanager
+def _count_queries(limit):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # The audit log writer flushes on its own timer, not for the request
+        if not statement.startswith("INSERT INTO audit_logs"):
+            statements.append(statement)
+
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+    assert len(statements) <= limit, f"{len(statements)} queries, expected at most {limit}:\n" + "\n".join(statements)
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    `with assert_max_queries(5) as statements:` fails if the block runs more
+    than 5 SQL statements on the primary engines, listing them.
+    """
+    return _count_queries
@@ -0,0 +1,134 @@
+import uuid
+
+from sqlalchemy import event, select
+
+from app.core.audit import AuditWriter, audit_writer, create_audit_log
+from app.core.database import SessionLocal, engine
+from app.models.audit import AuditLog
+
+
+def _audit_rows(user_id):
+    db = SessionLocal()
+    try:
+        return db.scalars(select(AuditLog).where(AuditLog.user_id == user_id).order_by(AuditLog.id)).all()
+    finally:
+        db.close()
+
+
+def _record(user_id, n):
+    return {"user_id": user_id, "action": "TEST", "target_type": "TEST", "target_id": n, "details": {"n": n}}
+
+
+def test_rows_are_written_in_multi_row_batches(user):
+    writer = AuditWriter(engine, max_buffer=100, batch_size=4, flush_interval=60)
+    for n in range(10):
+        writer.enqueue(_record(user.id, n))
+
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO audit_logs"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_inserts)
+    try:
+        writer.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count_inserts)
+
+    assert [row.target_id for row in _audit_rows(user.id)] == list(range(10))
+    # 10 rows in batches of 4: three statements, not ten
+    assert len(inserts) <= 3
+    stats = writer.stats()
+    assert stats["flushed"] == 10
+    assert stats["buffered"] == 0
+    assert stats["dropped"] == 0
+
+
+def test_full_buffer_drops_and_counts(user):
+    writer = AuditWriter(engine, max_buffer=3, batch_size=100, flush_interval=60)
+    accepted = [writer.enqueue(_record(user.id, n)) for n in range(5)]
+    assert accepted == [True, True, True, False, False]
+    assert writer.stats()["dropped"] == 2
+
+    writer.close()
+    assert len(_audit_rows(user.id)) == 3
+    assert writer.stats()["flushed"] == 3
+
+
+def _failing_inserts(count):
+    """Make the next `count` audit INSERTs fail, as during a database outage."""
+    left = [count]
+
+    def fail(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO audit_logs") and left[0]:
+            left[0] -= 1
+            raise RuntimeError("database unavailable")
+
+    return fail
+
+
+def test_failed_batches_are_retried(user):
+    writer = AuditWriter(engine, max_buffer=4, batch_size=100, flush_interval=60, retry_backoff=0)
+    for n in range(3):
+        writer.enqueue(_record(user.id, n))
+
+    fail = _failing_inserts(1)
+    event.listen(engine, "before_cursor_execute", fail)
+    try:
+        assert writer.flush() == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", fail)
+    assert writer.stats()["retrying"] == 3
+    # Rows waiting for a retry still count against the buffer
+    assert [writer.enqueue(_record(user.id, n)) for n in (3, 4)] == [True, False]
+
+    assert writer.flush() == 4
+    assert sorted(row.target_id for row in _audit_rows(user.id)) == [0, 1, 2, 3]
+    stats = writer.stats()
+    assert (stats["retries"], stats["retrying"], stats["failed"]) == (1, 0, 0)
+    writer.close()
+
+
+def test_batches_are_logged_once_given_up(user, caplog):
+    writer = AuditWriter(engine, max_buffer=10, batch_size=100, flush_interval=60, max_attempts=2, retry_backoff=0)
+    writer.enqueue(_record(user.id, 7))
+
+    fail = _failing_inserts(10)
+    event.listen(engine, "before_cursor_execute", fail)
+    try:
+        writer.flush()
+        assert writer.stats()["retrying"] == 1
+        writer.flush()
+    finally:
+        event.remove(engine, "before_cursor_execute", fail)
+
+    assert _audit_rows(user.id) == []
+    assert (writer.stats()["retrying"], writer.stats()["failed"]) == (0, 1)
+    lost = [r for r in caplog.records if r.getMessage().startswith("Lost audit log entry")]
+    assert len(lost) == 1 and "'target_id': 7" in lost[0].getMessage()
+    writer.close()
+
+
+def test_in_transaction_entries_commit_with_the_caller(user):
+    db = SessionLocal()
+    try:
+        create_audit_log(db, user_id=user.id, action="ROLLED_BACK", target_type="TEST", in_transaction=True)
+        db.rollback()
+        create_audit_log(db, user_id=user.id, action="COMMITTED", target_type="TEST", in_transaction=True)
+        db.commit()
+    finally:
+        db.close()
+
+    assert [row.action for row in _audit_rows(user.id)] == ["COMMITTED"]
+
+
+def test_board_creation_is_audited_through_the_writer(client, user, auth_headers, metrics_headers):
+    name = f"Audited {uuid.uuid4().hex[:6]}"
+    response = client.post("/api/v1/boards/", json={"name": name}, headers=auth_headers)
+    assert response.status_code == 201
+
+    audit_writer.flush()
+    rows = _audit_rows(user.id)
+    assert [(row.action, row.details) for row in rows] == [("BOARD_CREATED", {"name": name})]
+    assert client.get("/metrics", headers=metrics_headers).json()["audit"]["flushed"] >= 1
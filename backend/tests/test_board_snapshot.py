@@ -0,0 +1,149 @@
+import pytest
+
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.core.snapshots import SnapshotCache, board_snapshots
+from app.models.user import User
+
+
+@pytest.fixture
+def board(client, auth_headers):
+    board = client.post("/api/v1/boards/", json={"name": "Release"}, headers=auth_headers).json()
+    url = f"/api/v1/boards/{board['id']}"
+    done = client.post(f"{url}/groups", json={"name": "Done"}, headers=auth_headers).json()
+    todo = client.post(f"{url}/groups", json={"name": "To do"}, headers=auth_headers).json()
+    client.post(f"/api/v1/boards/groups/{todo['id']}/move", json={"before_id": done["id"]}, headers=auth_headers)
+    for n in range(3):
+        client.post(
+            "/api/v1/tasks/",
+            json={"name": f"Write {n}", "group_id": todo["id"], "subtasks": [{"name": "Draft"}, {"name": "Review"}]},
+            headers=auth_headers,
+        )
+    client.post("/api/v1/tasks/", json={"name": "Ship", "group_id": done["id"]}, headers=auth_headers)
+    return {"id": board["id"], "url": f"{url}/snapshot", "todo": todo, "done": done}
+
+
+@pytest.fixture
+def stranger_headers(user):
+    db = SessionLocal()
+    stranger = User(email=f"stranger-{user.id}@example.com", hashed_password="x")
+    db.add(stranger)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(stranger.id)})}"}
+    db.close()
+    return headers
+
+
+def _snapshot(client, board, headers, etag=None):
+    return client.get(board["url"], headers={**headers, **({"If-None-Match": etag} if etag else {})})
+
+
+def test_snapshot_contents(client, auth_headers, board):
+    response = _snapshot(client, board, auth_headers)
+    assert response.status_code == 200
+    snapshot = response.json()
+    assert snapshot["name"] == "Release"
+    assert [g["name"] for g in snapshot["groups"]] == ["To do", "Done"]
+    todo, done = snapshot["groups"]
+    assert [t["name"] for t in todo["tasks"]] == ["Write 0", "Write 1", "Write 2"]
+    assert [s["name"] for s in todo["tasks"][0]["subtasks"]] == ["Draft", "Review"]
+    assert [t["name"] for t in done["tasks"]] == ["Ship"]
+
+    # The group filter on the task list returns the same tasks
+    listed = client.get(f"/api/v1/tasks/?group_id={board['todo']['id']}", headers=auth_headers).json()
+    assert sorted(t["id"] for t in listed) == sorted(t["id"] for t in todo["tasks"])
+
+
+def test_snapshot_query_budget(client, auth_headers, board, assert_max_queries):
+    board_snapshots.clear()
+    _snapshot(client, board, auth_headers)  # warms the principal cache
+    board_snapshots.clear()
+
+    # Version, board, groups, tasks, subtasks
+    with assert_max_queries(5):
+        etag = _snapshot(client, board, auth_headers).headers["etag"]
+    # Cached body, then a current ETag: the version lookup only
+    with assert_max_queries(1):
+        assert _snapshot(client, board, auth_headers).status_code == 200
+    with assert_max_queries(1):
+        response = _snapshot(client, board, auth_headers, etag)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_every_change_to_the_board_invalidates_the_snapshot(client, auth_headers, board):
+    def etag():
+        return _snapshot(client, board, auth_headers).headers["etag"]
+
+    seen = [etag()]
+    snapshot = _snapshot(client, board, auth_headers).json()
+    task = snapshot["groups"][0]["tasks"][0]
+    subtask = task["subtasks"][0]
+
+    client.patch(f"/api/v1/tasks/subtasks/{subtask['id']}", json={"is_done": True}, headers=auth_headers)
+    seen.append(etag())
+    client.patch(f"/api/v1/tasks/{task['id']}", json={"group_id": board["done"]["id"]}, headers=auth_headers)
+    seen.append(etag())
+    client.patch(f"/api/v1/boards/groups/{board['done']['id']}", json={"name": "Shipped"}, headers=auth_headers)
+    seen.append(etag())
+    client.patch(f"/api/v1/boards/{board['id']}", json={"name": "Release 2"}, headers=auth_headers)
+    seen.append(etag())
+    client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+    seen.append(etag())
+    assert len(set(seen)) == len(seen)
+
+    # The served body follows, from the cache or not
+    snapshot = _snapshot(client, board, auth_headers).json()
+    assert snapshot["name"] == "Release 2"
+    assert [g["name"] for g in snapshot["groups"]] == ["To do", "Shipped"]
+    assert task["id"] not in [t["id"] for g in snapshot["groups"] for t in g["tasks"]]
+
+    # Tasks outside the board leave it alone
+    client.post("/api/v1/tasks/", json={"name": "Elsewhere"}, headers=auth_headers)
+    assert etag() == seen[-1]
+
+
+def test_moving_a_task_between_boards_changes_both(client, auth_headers, board):
+    other = client.post("/api/v1/boards/", json={"name": "Other"}, headers=auth_headers).json()
+    group = client.post(f"/api/v1/boards/{other['id']}/groups", json={"name": "Inbox"}, headers=auth_headers).json()
+    other_url = f"/api/v1/boards/{other['id']}/snapshot"
+    before = (_snapshot(client, board, auth_headers).headers["etag"], client.get(other_url, headers=auth_headers).headers["etag"])
+
+    task = client.get(f"/api/v1/tasks/?group_id={board['done']['id']}", headers=auth_headers).json()[0]
+    client.patch(f"/api/v1/tasks/{task['id']}", json={"group_id": group["id"]}, headers=auth_headers)
+
+    assert _snapshot(client, board, auth_headers).headers["etag"] != before[0]
+    moved = client.get(other_url, headers=auth_headers)
+    assert moved.headers["etag"] != before[1]
+    assert [t["id"] for t in moved.json()["groups"][0]["tasks"]] == [task["id"]]
+
+
+def test_snapshot_of_someone_elses_board_is_not_found(client, board, stranger_headers):
+    assert client.get(board["url"], headers=stranger_headers).status_code == 404
+
+
+def test_others_cannot_put_tasks_on_the_board(client, auth_headers, board, stranger_headers):
+    before = _snapshot(client, board, auth_headers)
+    group_id = board["todo"]["id"]
+
+    response = client.post("/api/v1/tasks/", json={"name": "Injected", "group_id": group_id}, headers=stranger_headers)
+    assert response.status_code == 404
+    theirs = client.post("/api/v1/tasks/", json={"name": "Theirs"}, headers=stranger_headers).json()
+    response = client.patch(f"/api/v1/tasks/{theirs['id']}", json={"group_id": group_id}, headers=stranger_headers)
+    assert response.status_code == 404
+
+    after = _snapshot(client, board, auth_headers)
+    assert after.headers["etag"] == before.headers["etag"]
+    assert after.json() == before.json()
+
+
+def test_cache_keeps_the_newest_version():
+    cache = SnapshotCache(max_size=2)
+    cache.put(1, "json", 3, b"v3", "application/json")
+    cache.put(1, "json", 2, b"v2", "application/json")
+    assert cache.get(1, "json", 3) == (b"v3", "application/json")
+    assert cache.get(1, "json", 2) is None
+    cache.put(2, "json", 1, b"a", "application/json")
+    cache.put(3, "json", 1, b"b", "application/json")
+    assert cache.get(1, "json", 3) is None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,127 @@
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.models.user import User
+
+URL = "/api/v1/tasks/bulk"
+
+
+@pytest.fixture
+def group(client, auth_headers):
+    board = client.post("/api/v1/boards/", json={"name": "Kanban"}, headers=auth_headers).json()
+    group = client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": "Done"}, headers=auth_headers).json()
+    return {**group, "snapshot": f"/api/v1/boards/{board['id']}/snapshot"}
+
+
+@pytest.fixture
+def stranger_headers(user):
+    db = SessionLocal()
+    stranger = User(email=f"bulk-stranger-{user.id}@example.com", hashed_password="x")
+    db.add(stranger)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(stranger.id)})}"}
+    db.close()
+    return headers
+
+
+def _create(client, headers, *names, **fields):
+    response = client.post(URL, json={"tasks": [{"name": name, **fields} for name in names]}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [result["task"] for result in response.json()["results"]]
+
+
+def test_bulk_create(client, auth_headers, group):
+    etag = client.get("/api/v1/tasks/", headers=auth_headers).headers["etag"]
+    response = client.post(URL, json={"tasks": [
+        {"name": "One", "subtasks": [{"name": "Draft"}, {"name": "Review", "order": 1}]},
+        {"name": "Misfiled", "group_id": 999999},
+        {"name": "Two", "group_id": group["id"], "status": "in_progress"},
+    ]}, headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    one, misfiled, two = body["results"]
+    assert one["ok"] and [s["name"] for s in one["task"]["subtasks"]] == ["Draft", "Review"]
+    assert misfiled == {"index": 1, "id": None, "ok": False, "error": "Group not found", "task": None}
+    assert two["task"]["group_id"] == group["id"] and two["task"]["status"] == "in_progress"
+
+    listed = client.get("/api/v1/tasks/", headers=auth_headers)
+    assert sorted(t["name"] for t in listed.json()) == ["One", "Two"]
+    assert listed.headers["etag"] != etag
+    assert [t["name"] for t in client.get(group["snapshot"], headers=auth_headers).json()["groups"][0]["tasks"]] == ["Two"]
+
+
+def test_bulk_create_query_budget(client, auth_headers, assert_max_queries):
+    client.get("/api/v1/tasks/", headers=auth_headers)  # warms the principal cache
+    tasks = [{"name": f"Task {n}", "subtasks": [{"name": "Step"}]} for n in range(50)]
+    # Tasks, subtasks, history, daily stats, change counter, change log, reload (tasks, subtasks)
+    with assert_max_queries(8):
+        response = client.post(URL, json={"tasks": tasks}, headers=auth_headers)
+    assert [r["task"]["name"] for r in response.json()["results"]] == [t["name"] for t in tasks]
+
+
+def test_bulk_move_to_done_is_one_update(client, auth_headers, group, assert_max_queries):
+    tasks = _create(client, auth_headers, *[f"Task {n}" for n in range(20)])
+    snapshot = client.get(group["snapshot"], headers=auth_headers).headers["etag"]
+    items = [{"id": t["id"], "status": "done", "group_id": group["id"]} for t in tasks]
+
+    # Ownership, groups, the group's last position, old values for the history, one UPDATE, history,
+    # daily stats, change counter, change log, board versions, reload (tasks, subtasks)
+    with assert_max_queries(12) as statements:
+        response = client.patch(URL, json={"tasks": items}, headers=auth_headers)
+    assert len([s for s in statements if s.startswith("UPDATE tasks")]) == 1
+    assert response.json()["succeeded"] == 20
+    assert all(r["task"]["status"] == "done" for r in response.json()["results"])
+
+    moved = client.get(group["snapshot"], headers=auth_headers)
+    assert moved.headers["etag"] != snapshot
+    # Appended in request order
+    assert [t["id"] for t in moved.json()["groups"][0]["tasks"]] == [t["id"] for t in tasks]
+
+
+def test_bulk_update_reports_each_item(client, auth_headers, stranger_headers, group):
+    mine = _create(client, auth_headers, "Mine", "Also mine")
+    theirs = _create(client, stranger_headers, "Theirs")[0]
+    response = client.patch(URL, json={"tasks": [
+        {"id": mine[0]["id"], "name": "Renamed"},
+        {"id": theirs["id"], "name": "Hijacked"},
+        {"id": mine[0]["id"], "name": "Twice"},
+        {"id": mine[1]["id"], "group_id": 999999},
+        {"id": mine[1]["id"], "status": None, "name": None, "date": None},
+        {"id": mine[1]["id"], "priority": "high"},
+    ]}, headers=auth_headers).json()
+    assert [(r["ok"], r["error"]) for r in response["results"]] == [
+        (True, None),
+        (False, "Task not found"),
+        (False, "Task appears more than once"),
+        (False, "Group not found"),
+        (False, "name, status cannot be null"),
+        (True, None),
+    ]
+    assert response["results"][5]["task"]["priority"] == "high"
+    assert client.get(f"/api/v1/tasks/{mine[0]['id']}", headers=auth_headers).json()["name"] == "Renamed"
+    assert client.get(f"/api/v1/tasks/{theirs['id']}", headers=stranger_headers).json()["name"] == "Theirs"
+
+
+def test_bulk_delete(client, auth_headers, stranger_headers, group):
+    tasks = _create(client, auth_headers, "A", "B", subtasks=[{"name": "Step"}], group_id=group["id"])
+    theirs = _create(client, stranger_headers, "Theirs")[0]
+    snapshot = client.get(group["snapshot"], headers=auth_headers).headers["etag"]
+
+    ids = [tasks[0]["id"], theirs["id"], tasks[1]["id"], tasks[1]["id"]]
+    response = client.request("DELETE", URL, json={"ids": ids}, headers=auth_headers).json()
+    assert [(r["id"], r["ok"]) for r in response["results"]] == [
+        (tasks[0]["id"], True), (theirs["id"], False), (tasks[1]["id"], True), (tasks[1]["id"], False),
+    ]
+    assert client.get("/api/v1/tasks/", headers=auth_headers).json() == []
+    assert client.get(f"/api/v1/tasks/{theirs['id']}", headers=stranger_headers).status_code == 200
+    assert client.get(group["snapshot"], headers=auth_headers).headers["etag"] != snapshot
+
+
+def test_bulk_size_limit(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_BULK_MAX_ITEMS", 2)
+    response = client.post(URL, json={"tasks": [{"name": str(n)} for n in range(3)]}, headers=auth_headers)
+    assert response.status_code == 400
+    assert client.get("/api/v1/tasks/", headers=auth_headers).json() == []
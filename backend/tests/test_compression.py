@@ -0,0 +1,129 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, compression_stats
+
+BODY = "task " * 2000
+
+
+def _app(**options):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, **options)
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((BODY for _ in range(3)), media_type="text/plain")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse((BODY for _ in range(2)), media_type="text/event-stream")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(BODY.encode()), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    return app
+
+
+@pytest.fixture
+def no_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "_brotli", lambda: None)
+
+
+def test_large_responses_are_gzipped_and_counted(no_brotli):
+    compression_stats.reset()
+    client = TestClient(_app())
+
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == BODY
+    assert int(response.headers["content-length"]) < len(BODY) // 10
+
+    stats = compression_stats.stats()["gzip"]
+    assert stats["responses"] == 1
+    assert stats["bytes_in"] == len(BODY)
+    assert stats["ratio"] > 10
+
+
+def test_small_and_unaccepted_responses_are_not_compressed(no_brotli):
+    client = TestClient(_app())
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+
+def test_streaming_responses_are_compressed_per_chunk(no_brotli):
+    client = TestClient(_app())
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).decode() == BODY * 3
+
+    # Each chunk is flushed, so the first one decodes without the rest
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        first = next(response.iter_raw())
+    assert decompressor.decompress(first).decode().startswith("task task")
+
+
+def test_excluded_and_encoded_responses_pass_through(no_brotli):
+    client = TestClient(_app())
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers and response.text == BODY * 2
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip" and response.text == BODY
+
+
+def test_large_bodies_are_compressed_off_the_event_loop(no_brotli):
+    client = TestClient(_app(thread_minimum_size=4096))
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip" and response.text == BODY
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert gzip.decompress(b"".join(response.iter_raw())).decode() == BODY * 3
+
+
+def test_brotli_is_preferred_when_available():
+    brotli = pytest.importorskip("brotli")
+    client = TestClient(_app())
+    response = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "br"}) as response:
+        assert brotli.decompress(b"".join(response.iter_raw())).decode() == BODY * 3
+
+
+def test_negotiation(no_brotli):
+    middleware = CompressionMiddleware(_app())
+    assert middleware.choose_encoding("gzip, deflate") == "gzip"
+    assert middleware.choose_encoding("*") == "gzip"
+    assert middleware.choose_encoding("br") is None
+    assert middleware.choose_encoding("gzip;q=0, *;q=1") is None
+    assert middleware.choose_encoding("") is None
+
+
+def test_app_compresses_lists_but_not_health_checks(client, auth_headers, metrics_headers):
+    for n in range(20):
+        client.post("/api/v1/tasks/", json={"name": f"Task {n}", "description": "details " * 10}, headers=auth_headers)
+
+    response = client.get("/api/v1/tasks/", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 20
+
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "compression" in client.get("/metrics", headers=metrics_headers).json()
@@ -0,0 +1,173 @@
+import socketserver
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.core.database import SessionLocal, engine
+from app.core.email import EmailDeliveryError, SMTPTransport, queue_email
+from app.core.email_sender import EmailSender
+from app.models.email_outbox import EmailOutbox, EmailStatus
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts every message and records it."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 localhost test SMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                data = []
+                for raw in iter(self.rfile.readline, b""):
+                    if raw == b".\r\n":
+                        break
+                    data.append(raw)
+                server.messages.append(b"".join(data).decode())
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                # MAIL FROM, RCPT TO, RSET, NOOP
+                self.reply("250 ok")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbox():
+    """Start each test from an empty outbox."""
+    with engine.begin() as connection:
+        connection.execute(delete(EmailOutbox))
+    yield
+    with engine.begin() as connection:
+        connection.execute(delete(EmailOutbox))
+
+
+def _queue(count, prefix="outbox"):
+    db = SessionLocal()
+    try:
+        for n in range(count):
+            queue_email(db, f"{prefix}-{n}@example.com", f"Message {n}", f"<p>{n}</p>")
+        db.commit()
+    finally:
+        db.close()
+
+
+def _rows():
+    db = SessionLocal()
+    try:
+        return db.scalars(select(EmailOutbox).order_by(EmailOutbox.id)).all()
+    finally:
+        db.close()
+
+
+class _FailingTransport:
+    def send(self, *args):
+        raise EmailDeliveryError("provider down")
+
+    def close(self):
+        pass
+
+
+def test_batches_are_sent_over_one_smtp_connection(outbox, smtp_server):
+    _queue(5)
+    transport = SMTPTransport("127.0.0.1", smtp_server.server_address[1], start_tls=False)
+    sender = EmailSender(engine, transport_factory=lambda: transport, batch_size=3)
+
+    assert sender.run_once() == 3
+    assert sender.run_once() == 2
+    assert sender.run_once() == 0
+    sender.close()
+
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 5
+    assert "Subject: Message 0" in smtp_server.messages[0]
+    rows = _rows()
+    assert {row.status for row in rows} == {EmailStatus.SENT}
+    assert all(row.sent_at is not None and row.attempts == 1 for row in rows)
+    assert sender.stats()["sent"] == 5
+
+
+def test_failures_back_off_then_give_up(outbox):
+    _queue(1)
+    sender = EmailSender(
+        engine,
+        transport_factory=_FailingTransport,
+        max_attempts=2,
+        retry_base_seconds=60,
+    )
+
+    before = datetime.now(timezone.utc)
+    assert sender.run_once() == 0
+    row = _rows()[0]
+    assert (row.status, row.attempts, row.last_error) == (EmailStatus.PENDING, 1, "provider down")
+    # Not due again until the backoff has passed
+    assert row.next_attempt_at.replace(tzinfo=timezone.utc) >= before + timedelta(seconds=60)
+    assert sender.run_once() == 0
+    assert _rows()[0].attempts == 1
+
+    with engine.begin() as connection:
+        connection.execute(update(EmailOutbox).values(next_attempt_at=before))
+    sender.run_once()
+    row = _rows()[0]
+    assert (row.status, row.attempts) == (EmailStatus.FAILED, 2)
+    assert sender.stats()["retried"] == 1
+    assert sender.stats()["failed"] == 1
+
+
+def test_backoff_doubles_up_to_the_cap():
+    sender = EmailSender(engine, retry_base_seconds=30, retry_max_seconds=100)
+    assert [sender.backoff(n).total_seconds() for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+def test_claimed_rows_are_not_claimed_twice(outbox):
+    _queue(2)
+    first = EmailSender(engine, lease_seconds=300)
+    second = EmailSender(engine, lease_seconds=300)
+    now = datetime.now(timezone.utc)
+
+    assert len(first._claim(now)) == 2
+    assert second._claim(now) == []
+
+
+def test_endpoints_only_enqueue(client, outbox):
+    email = f"queued-{uuid.uuid4().hex[:8]}@example.com"
+    response = client.post("/api/v1/auth/signup", json={"email": email, "password": "secret-pw"})
+    assert response.status_code == 201
+
+    response = client.post("/api/v1/auth/forgot-password", json={"email": email})
+    assert response.status_code == 200
+
+    rows = _rows()
+    assert [(row.to_email, row.status) for row in rows] == [
+        (email, EmailStatus.PENDING),
+        (email, EmailStatus.PENDING),
+    ]
+    assert "verify-email?token=" in rows[0].html_content
+    assert "reset-password?token=" in rows[1].html_content
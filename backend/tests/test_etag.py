@@ -0,0 +1,89 @@
+from sqlalchemy import event
+
+from app.core.database import async_engine
+
+
+def _conditional(client, url, headers, etag):
+    return client.get(url, headers={**headers, "If-None-Match": etag})
+
+
+def test_unchanged_task_list_is_not_modified_without_loading_rows(client, auth_headers):
+    client.post("/api/v1/tasks/", json={"name": "Cached", "subtasks": [{"name": "Step"}]}, headers=auth_headers)
+    response = client.get("/api/v1/tasks/", headers=auth_headers)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = _conditional(client, "/api/v1/tasks/", auth_headers, etag)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    # Only the counter lookup: no tasks or subtasks were queried
+    assert not [s for s in statements if "FROM tasks" in s or "FROM subtasks" in s]
+
+
+def test_every_kind_of_write_changes_the_etag(client, auth_headers):
+    def etag():
+        return client.get("/api/v1/tasks/", headers=auth_headers).headers["etag"]
+
+    seen = [etag()]
+    task = client.post("/api/v1/tasks/", json={"name": "Tracked"}, headers=auth_headers).json()
+    seen.append(etag())
+    client.patch(f"/api/v1/tasks/{task['id']}", json={"status": "done"}, headers=auth_headers)
+    seen.append(etag())
+    subtask = client.post(f"/api/v1/tasks/{task['id']}/subtasks", json={"name": "Step"}, headers=auth_headers).json()
+    seen.append(etag())
+    client.patch(f"/api/v1/tasks/subtasks/{subtask['id']}", json={"is_done": True}, headers=auth_headers)
+    seen.append(etag())
+    client.delete(f"/api/v1/tasks/subtasks/{subtask['id']}", headers=auth_headers)
+    seen.append(etag())
+    client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+    seen.append(etag())
+
+    assert len(set(seen)) == len(seen)
+    # Reads alone leave it alone
+    assert etag() == seen[-1]
+
+
+def test_board_and_plan_etags(client, auth_headers):
+    board = client.post("/api/v1/boards/", json={"name": "Conditional"}, headers=auth_headers).json()
+    url = f"/api/v1/boards/{board['id']}"
+    etag = client.get(url, headers=auth_headers).headers["etag"]
+    assert _conditional(client, url, auth_headers, etag).status_code == 304
+
+    client.post(f"{url}/groups", json={"name": "Doing"}, headers=auth_headers)
+    response = _conditional(client, url, auth_headers, etag)
+    assert response.status_code == 200
+    assert [g["name"] for g in response.json()["groups"]] == ["Doing"]
+
+    etag = client.get("/api/v1/plans/", headers=auth_headers).headers["etag"]
+    assert _conditional(client, "/api/v1/plans/", auth_headers, etag).status_code == 304
+    client.post("/api/v1/plans/", json={"date": "2026-10-18"}, headers=auth_headers)
+    assert _conditional(client, "/api/v1/plans/", auth_headers, etag).status_code == 200
+
+
+def test_etags_differ_per_user(client, auth_headers, user):
+    from app.core.security import create_access_token
+    from app.core.database import SessionLocal
+    from app.models.user import User
+
+    db = SessionLocal()
+    other = User(email=f"other-{user.id}@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(other.id)})}"}
+    db.close()
+
+    mine = client.get("/api/v1/tasks/", headers=auth_headers).headers["etag"]
+    assert client.get("/api/v1/tasks/", headers=other_headers).headers["etag"] != mine
+    assert _conditional(client, "/api/v1/tasks/", other_headers, mine).status_code == 200
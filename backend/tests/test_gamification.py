@@ -0,0 +1,86 @@
+def test_summary_creates_default_stats(client, auth_headers):
+    """A new user gets level-1 stats and no daily progress yet."""
+    response = client.get("/api/v1/gamification/summary", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["user_stats"]["level"] == 1
+    assert data["user_stats"]["xp_to_next_level"] == 500
+    assert data["daily_progress"] is None
+
+
+def test_focus_session_lifecycle(client, auth_headers):
+    """Starting and completing a focus session awards XP."""
+    session = client.post(
+        "/api/v1/gamification/sessions", json={"planned_duration": 25}, headers=auth_headers
+    ).json()
+
+    response = client.patch(
+        f"/api/v1/gamification/sessions/{session['id']}",
+        json={"was_completed": False, "duration_minutes": 10},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["xp_earned"] == 0
+
+
+def _today(client, headers):
+    return client.get("/api/v1/gamification/summary", headers=headers).json()["daily_progress"]
+
+
+def test_completed_focus_sessions_add_to_daily_stats(client, auth_headers):
+    for duration in (25, 15):
+        session = client.post(
+            "/api/v1/gamification/sessions", json={"planned_duration": duration}, headers=auth_headers
+        ).json()
+        response = client.patch(
+            f"/api/v1/gamification/sessions/{session['id']}",
+            json={"was_completed": True, "duration_minutes": duration},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200 and response.json()["xp_earned"] == 16
+
+    today = _today(client, auth_headers)
+    assert (today["focus_sessions_count"], today["completed_focus_sessions"]) == (2, 2)
+    assert (today["total_focus_minutes"], today["xp_earned"]) == (40, 32)
+
+
+def test_task_writes_keep_daily_stats(client, auth_headers, assert_max_queries):
+    tasks = [client.post("/api/v1/tasks/", json={"name": f"T{n}"}, headers=auth_headers).json() for n in range(3)]
+    client.post("/api/v1/tasks/bulk", json={"tasks": [{"name": "Bulk", "status": "done"}]}, headers=auth_headers)
+
+    with assert_max_queries(20) as statements:
+        client.patch(f"/api/v1/tasks/{tasks[0]['id']}", json={"status": "done"}, headers=auth_headers)
+    assert len([s for s in statements if s.startswith("INSERT INTO daily_stats")]) == 1
+    client.patch("/api/v1/tasks/bulk", json={"tasks": [{"id": tasks[1]["id"], "status": "postponed"}]}, headers=auth_headers)
+    # Neither an edit nor deleting an unfinished task changes the day's counts
+    client.patch(f"/api/v1/tasks/{tasks[2]['id']}", json={"name": "Renamed"}, headers=auth_headers)
+    client.delete(f"/api/v1/tasks/{tasks[2]['id']}", headers=auth_headers)
+
+    today = _today(client, auth_headers)
+    assert (today["tasks_created"], today["tasks_completed"], today["tasks_postponed"]) == (4, 2, 1)
+    assert today["completion_rate"] == 50
+
+
+def test_reopened_tasks_are_counted_once(client, auth_headers):
+    task = client.post("/api/v1/tasks/", json={"name": "Flaky"}, headers=auth_headers).json()
+    url = f"/api/v1/tasks/{task['id']}"
+    for status in ("done", "in_progress", "done", "postponed", "in_progress", "postponed"):
+        client.patch(url, json={"status": status}, headers=auth_headers)
+
+    today = _today(client, auth_headers)
+    assert (today["tasks_created"], today["tasks_completed"], today["tasks_postponed"]) == (1, 0, 1)
+    client.patch(url, json={"status": "done"}, headers=auth_headers)
+    today = _today(client, auth_headers)
+    assert (today["tasks_completed"], today["tasks_postponed"], today["completion_rate"]) == (1, 0, 100)
+
+
+def test_deleting_finished_tasks_takes_them_off(client, auth_headers):
+    tasks = [client.post("/api/v1/tasks/", json={"name": f"T{n}"}, headers=auth_headers).json() for n in range(4)]
+    for task, status in zip(tasks, ("done", "done", "done", "postponed")):
+        client.patch(f"/api/v1/tasks/{task['id']}", json={"status": status}, headers=auth_headers)
+    client.delete(f"/api/v1/tasks/{tasks[0]['id']}", headers=auth_headers)
+    client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": [tasks[1]["id"], tasks[3]["id"]]}, headers=auth_headers)
+
+    today = _today(client, auth_headers)
+    assert (today["tasks_created"], today["tasks_completed"], today["tasks_postponed"]) == (4, 1, 0)
+    assert today["completion_rate"] == 25
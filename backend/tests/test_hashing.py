@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.hashing import PasswordHasher, PasswordHashingBusy, password_hasher
+from app.core.security import verify_password
+
+
+def test_signup_and_login_hash_on_the_process_pool(client):
+    email = f"hash-{uuid.uuid4().hex[:8]}@example.com"
+    completed = password_hasher.stats()["completed"]
+
+    response = client.post("/api/v1/auth/signup", json={"email": email, "password": "secret-pw"})
+    assert response.status_code == 201
+
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": "secret-pw"})
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+    response = client.post("/api/v1/auth/login/json", json={"email": email, "password": "wrong-pw"})
+    assert response.status_code == 401
+
+    assert password_hasher.stats()["completed"] - completed == 3
+
+
+def test_full_queue_is_rejected_with_503(client, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = client.post(
+        "/api/v1/auth/login/json",
+        json={"email": "nobody@example.com", "password": "whatever"},
+    )
+    # Unknown users never reach the hasher
+    assert response.status_code == 401
+
+    email = f"busy-{uuid.uuid4().hex[:8]}@example.com"
+    response = client.post("/api/v1/auth/signup", json={"email": email, "password": "secret-pw"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_hasher_bounds_pending_work():
+    hasher = PasswordHasher(workers=0, max_pending=2)
+
+    async def burst():
+        return await asyncio.gather(
+            *(hasher.hash("pw") for _ in range(4)), return_exceptions=True
+        )
+
+    results = asyncio.run(burst())
+    hashes = [r for r in results if isinstance(r, str)]
+    assert len(hashes) == 2
+    assert sum(isinstance(r, PasswordHashingBusy) for r in results) == 2
+    assert verify_password("pw", hashes[0])
+    assert hasher.stats()["rejected"] == 2
+    assert hasher.stats()["pending"] == 0
+
+
+def test_cancelled_caller_keeps_the_slot_until_the_hash_finishes():
+    hasher = PasswordHasher(workers=0, max_pending=1)
+
+    async def cancel_then_retry():
+        caller = asyncio.create_task(hasher.hash("pw"))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        # bcrypt is still running for the cancelled request
+        assert hasher.stats()["pending"] == 1
+        with pytest.raises(PasswordHashingBusy):
+            await hasher.hash("pw")
+        while hasher.stats()["pending"]:
+            await asyncio.sleep(0.01)
+        return await hasher.hash("pw")
+
+    assert verify_password("pw", asyncio.run(cancel_then_retry()))
+    assert hasher.stats()["completed"] == 2
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_verify_round_trip(workers):
+    hasher = PasswordHasher(workers=workers, max_pending=4)
+
+    async def round_trip():
+        hashed = await hasher.hash("correct horse")
+        return await hasher.verify("correct horse", hashed), await hasher.verify("wrong", hashed)
+
+    try:
+        assert asyncio.run(round_trip()) == (True, False)
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,77 @@
+import pytest
+
+HISTORY = "/api/v1/history/tasks"
+
+
+def _events(client, headers, task_id):
+    rows = client.get(HISTORY, params={"task_id": task_id}, headers=headers).json()
+    return [(row["event_type"], row["old_status"], row["new_status"], row["changes"]) for row in reversed(rows)]
+
+
+@pytest.fixture
+def task(client, auth_headers):
+    return client.post("/api/v1/tasks/", json={"name": "Write report"}, headers=auth_headers).json()
+
+
+def test_task_lifecycle_is_recorded(client, auth_headers, task):
+    url = f"/api/v1/tasks/{task['id']}"
+    client.patch(url, json={"status": "in_progress", "priority": "high"}, headers=auth_headers)
+    # No status change, no event
+    client.patch(url, json={"name": "Write the report"}, headers=auth_headers)
+    client.patch(url, json={"status": "done", "date": "2026-03-01"}, headers=auth_headers)
+    client.delete(url, headers=auth_headers)
+
+    assert _events(client, auth_headers, task["id"]) == [
+        ("created", None, "not_started", {"name": [None, "Write report"]}),
+        ("status_changed", "not_started", "in_progress", {
+            "status": ["not_started", "in_progress"], "priority": ["medium", "high"],
+        }),
+        ("completed", "in_progress", "done", {"status": ["in_progress", "done"], "date": [None, "2026-03-01"]}),
+        ("deleted", "done", None, {"name": ["Write the report", None]}),
+    ]
+
+
+def test_status_update_adds_one_insert(client, auth_headers, task, assert_max_queries):
+    url = f"/api/v1/tasks/{task['id']}"
+    client.get(url, headers=auth_headers)  # warms the principal cache
+    with assert_max_queries(20) as plain:
+        client.patch(url, json={"priority": "high"}, headers=auth_headers)
+    with assert_max_queries(len(plain) + 1) as statements:
+        client.patch(url, json={"status": "in_progress"}, headers=auth_headers)
+    assert len([s for s in statements if s.startswith("INSERT INTO task_history")]) == 1
+    assert not [s for s in plain if s.startswith("INSERT INTO task_history")]
+
+
+def test_one_insert_per_flush(client, auth_headers, assert_max_queries):
+    board = client.post("/api/v1/boards/", json={"name": "Doomed"}, headers=auth_headers).json()
+    group = client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": "G"}, headers=auth_headers).json()
+    tasks = [
+        client.post("/api/v1/tasks/", json={"name": f"T{n}", "group_id": group["id"]}, headers=auth_headers).json()
+        for n in range(3)
+    ]
+    with assert_max_queries(20) as statements:
+        client.delete(f"/api/v1/boards/{board['id']}", headers=auth_headers)
+    assert len([s for s in statements if s.startswith("INSERT INTO task_history")]) == 1
+    for task in tasks:
+        assert _events(client, auth_headers, task["id"])[-1][0] == "deleted"
+
+
+def test_bulk_writes_are_recorded(client, auth_headers):
+    created = client.post("/api/v1/tasks/bulk", json={"tasks": [
+        {"name": "A"}, {"name": "B", "status": "in_progress"},
+    ]}, headers=auth_headers).json()["results"]
+    first, second = (result["id"] for result in created)
+    client.patch("/api/v1/tasks/bulk", json={"tasks": [
+        {"id": first, "status": "done"},
+        {"id": second, "status": "in_progress", "name": "B2"},
+    ]}, headers=auth_headers)
+    client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": [first, second]}, headers=auth_headers)
+
+    assert _events(client, auth_headers, first) == [
+        ("created", None, "not_started", {"name": [None, "A"]}),
+        ("completed", "not_started", "done", {"status": ["not_started", "done"]}),
+        ("deleted", "done", None, {"name": ["A", None]}),
+    ]
+    # Renamed without a status change: no event
+    assert [event[0] for event in _events(client, auth_headers, second)] == ["created", "deleted"]
+    assert _events(client, auth_headers, second)[-1][3] == {"name": ["B2", None]}
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+from benchmarks.import_time import DEFAULT_BUDGET_MS, import_once, measure
+
+
+def test_provider_sdks_are_not_imported_at_startup():
+    _, _, loaded = import_once("app.main")
+    assert loaded == [], f"{loaded} should only be imported on first use"
+
+
+# Wall-clock, so only where a budget was set for the machine (python -m benchmarks.import_time otherwise)
+@pytest.mark.skipif("IMPORT_TIME_BUDGET_MS" not in os.environ, reason="set IMPORT_TIME_BUDGET_MS to check the budget")
+def test_app_import_is_within_budget():
+    result = measure(runs=3)
+    assert result["median_ms"] <= DEFAULT_BUDGET_MS, result
+
+
+def test_lazy_sdks_still_load_on_first_use():
+    from app.api.v1.endpoints.auth import get_oauth
+    from app.api.v1.endpoints.payments import get_stripe
+
+    assert get_stripe().__name__ == "stripe"
+    assert get_oauth() is get_oauth()
@@ -0,0 +1,122 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.models.plan import Plan
+from app.models.task import Task
+from app.models.task_history import TaskHistory
+
+
+def _walk(client, url, headers, limit, **filters):
+    """Follow X-Next-Cursor from the first page to the last; return all ids and the page count."""
+    ids, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": limit, **filters, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        ids += [item["id"] for item in response.json()]
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids, pages
+
+
+def test_task_cursor_pages_match_offset_pages(client, auth_headers, user):
+    db = SessionLocal()
+    # Server-default timestamps (many within the same second) and explicit
+    # ones on and off whole seconds, which SQLite stores as different text
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    db.add_all([Task(name=f"Now {n}", user_id=user.id) for n in range(7)])
+    db.add_all([Task(name=f"Whole {n}", user_id=user.id, created_at=base) for n in range(3)])
+    db.add_all([
+        Task(name=f"Fraction {n}", user_id=user.id, created_at=base + timedelta(microseconds=n + 1))
+        for n in range(3)
+    ])
+    db.commit()
+    db.close()
+
+    everything = [t["id"] for t in client.get("/api/v1/tasks/", headers=auth_headers).json()]
+    assert len(everything) == 13
+
+    ids, pages = _walk(client, "/api/v1/tasks/", auth_headers, limit=3)
+    assert ids == everything
+    assert pages == 5
+
+    offset_ids = []
+    for skip in range(0, 13, 3):
+        offset_ids += [t["id"] for t in client.get(f"/api/v1/tasks/?skip={skip}&limit=3", headers=auth_headers).json()]
+    assert offset_ids == everything
+
+
+def test_last_page_has_no_cursor(client, auth_headers):
+    for n in range(2):
+        client.post("/api/v1/tasks/", json={"name": f"Task {n}"}, headers=auth_headers)
+    assert "x-next-cursor" not in client.get("/api/v1/tasks/?limit=2", headers=auth_headers).headers
+    assert "x-next-cursor" in client.get("/api/v1/tasks/?limit=1", headers=auth_headers).headers
+
+
+def test_cursor_respects_filters(client, auth_headers):
+    for n in range(6):
+        client.post(
+            "/api/v1/tasks/",
+            json={"name": f"Task {n}", "status": "done" if n % 2 else "not_started"},
+            headers=auth_headers,
+        )
+    ids, _ = _walk(client, "/api/v1/tasks/", auth_headers, limit=2, status_filter="done")
+    assert len(ids) == 3
+
+
+def test_plan_and_board_pages(client, auth_headers, user):
+    db = SessionLocal()
+    db.add_all([Plan(user_id=user.id, date=date(2026, 3, 1) + timedelta(days=n)) for n in range(5)])
+    db.commit()
+    db.close()
+    ids, pages = _walk(client, "/api/v1/plans/", auth_headers, limit=2)
+    plans = client.get("/api/v1/plans/", headers=auth_headers).json()
+    assert ids == [p["id"] for p in plans]
+    assert [p["date"] for p in plans] == sorted((p["date"] for p in plans), reverse=True)
+    assert pages == 3
+
+    for n in range(3):
+        client.post("/api/v1/boards/", json={"name": f"Board {n}"}, headers=auth_headers)
+    ids, _ = _walk(client, "/api/v1/boards/", auth_headers, limit=2)
+    assert len(ids) == len(set(ids)) == 3
+
+
+def test_history_pages(client, auth_headers, user):
+    db = SessionLocal()
+    task = Task(name="Audited", user_id=user.id)
+    db.add(task)
+    db.flush()
+    db.add_all([TaskHistory(task_id=task.id, user_id=user.id, event_type="updated") for _ in range(5)])
+    db.commit()
+    db.close()
+
+    ids, pages = _walk(client, "/api/v1/history/tasks", auth_headers, limit=2)
+    assert len(ids) == len(set(ids)) >= 5
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_bad_cursors_are_rejected(client, auth_headers):
+    client.post("/api/v1/tasks/", json={"name": "One"}, headers=auth_headers)
+    client.post("/api/v1/tasks/", json={"name": "Two"}, headers=auth_headers)
+    cursor = client.get("/api/v1/tasks/?limit=1", headers=auth_headers).headers["x-next-cursor"]
+
+    assert client.get("/api/v1/tasks/?cursor=not-a-cursor", headers=auth_headers).status_code == 400
+    assert client.get(f"/api/v1/tasks/?cursor={cursor}&skip=1", headers=auth_headers).status_code == 400
+    # A tasks cursor means nothing to another list
+    assert client.get(f"/api/v1/boards/?cursor={cursor}", headers=auth_headers).status_code == 400
+
+
+def test_cursor_query_seeks_the_composite_index():
+    db = SessionLocal()
+    plan = db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM tasks "
+        "WHERE user_id = 1 AND (created_at, id) < ('2026-01-01 00:00:00', 5) "
+        "ORDER BY created_at DESC, id DESC LIMIT 11"
+    )).fetchall()
+    db.close()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_tasks_user_id_created_at_id" in detail
+    assert "TEMP B-TREE" not in detail
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_engine, get_pool_stats
+from app.core.principals import principal_cache
+from app.models.user import User
+
+
+def test_pool_metrics_track_usage_and_timeouts(tmp_path):
+    """Checkouts, peak usage and checkout timeouts are recorded."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = instrument_engine(engine, "test_pool")
+
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+
+    with engine.connect():
+        pass
+
+    stats = get_pool_stats()["test_pool"]
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["peak_in_use"] == 1
+    assert stats["in_use"] == 0
+    assert stats["size"] == 1
+    assert metrics.max_wait >= 0.0
+
+    # Metrics keep flowing to the same object after the pool is recreated
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert metrics.checkouts == 3
+    engine.dispose()
+
+
+def test_metrics_endpoint_lists_primary_pools(client, metrics_headers):
+    response = client.get("/metrics", headers=metrics_headers)
+    assert response.status_code == 200
+    assert {"primary", "primary_async"} <= set(response.json()["db_pools"])
+
+
+def test_metrics_endpoint_needs_the_token_or_a_superuser(client, auth_headers, user, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer guess"}).status_code == 401
+    assert client.get("/metrics", headers=auth_headers).status_code == 403
+
+    db = SessionLocal()
+    db.get(User, user.id).is_superuser = True
+    db.commit()
+    db.close()
+    principal_cache.invalidate(user.id)
+    assert client.get("/metrics", headers=auth_headers).status_code == 200
@@ -0,0 +1,98 @@
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.core.database import SessionLocal, engine
+from app.core.principals import Principal, PrincipalCache, principal_cache
+from app.models.user import User
+
+
+class _UserQueries:
+    """Counts SELECTs against the users table on the sync engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            self.count += 1
+
+
+def _principal(user_id: int) -> Principal:
+    now = datetime.utcnow()
+    return Principal(
+        id=user_id, email=f"{user_id}@example.com", username=None, full_name=None,
+        is_active=True, is_superuser=False, email_verified=False, provider="local",
+        created_at=now, updated_at=now,
+    )
+
+
+def test_repeat_requests_skip_the_user_lookup(client, user, auth_headers):
+    queries = _UserQueries()
+    event.listen(engine, "before_cursor_execute", queries)
+    try:
+        hits = principal_cache.hits
+        for _ in range(3):
+            response = client.get("/api/v1/auth/me", headers=auth_headers)
+            assert response.status_code == 200
+            assert response.json()["email"] == user.email
+    finally:
+        event.remove(engine, "before_cursor_execute", queries)
+
+    assert queries.count == 1
+    assert principal_cache.hits - hits == 2
+
+
+def test_password_reset_invalidates_the_cached_user(client, user, auth_headers):
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+    assert principal_cache.get(user.id) is not None
+
+    db = SessionLocal()
+    db_user = db.get(User, user.id)
+    db_user.reset_token = f"reset-{user.id}"
+    db.commit()
+    db.close()
+
+    response = client.post(
+        "/api/v1/auth/reset-password",
+        json={"token": f"reset-{user.id}", "new_password": "a-new-password"},
+    )
+    assert response.status_code == 200
+    assert principal_cache.get(user.id) is None
+
+
+def test_deactivated_user_is_rejected_once_invalidated(client, user, auth_headers):
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    db = SessionLocal()
+    db.get(User, user.id).is_active = False
+    db.commit()
+    db.close()
+    principal_cache.invalidate(user.id)
+
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 403
+    # Async endpoints share the cache
+    assert client.get("/api/v1/tasks/", headers=auth_headers).status_code == 403
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    for user_id in (1, 2):
+        cache.put(_principal(user_id))
+    assert cache.get(1) is not None  # 2 is now the least recently used
+    cache.put(_principal(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_entries_expire():
+    cache = PrincipalCache(max_size=10, ttl_seconds=0.05)
+    cache.put(_principal(1))
+    assert cache.get(1) is not None
+    time.sleep(0.06)
+    assert cache.get(1) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,108 @@
+"""
+Query budgets per endpoint.
+
+Each test fills a list with several rows that have nested rows of their own
+and checks the endpoint still runs a fixed number of statements, so lazy
+loads during serialization (N+1 queries) show up as failures.
+"""
+
+import uuid
+
+from app.core.database import SessionLocal
+from app.models.gamification import Achievement, UserAchievement
+from app.models.user import User
+
+
+def _warm(client, url, headers):
+    # The first request of a user fills the principal cache
+    assert client.get(url, headers=headers).status_code == 200
+
+
+def test_task_list(client, auth_headers, assert_max_queries):
+    for n in range(10):
+        client.post(
+            "/api/v1/tasks/",
+            json={"name": f"Task {n}", "subtasks": [{"name": "One"}, {"name": "Two"}]},
+            headers=auth_headers,
+        )
+    _warm(client, "/api/v1/tasks/", auth_headers)
+    # Change counter, tasks, subtasks
+    with assert_max_queries(3):
+        response = client.get("/api/v1/tasks/?limit=1000", headers=auth_headers)
+    assert sum(len(t["subtasks"]) for t in response.json()) == 20
+
+
+def test_board_list_and_board(client, auth_headers, assert_max_queries):
+    # Free plan maximum
+    for n in range(3):
+        board = client.post("/api/v1/boards/", json={"name": f"Board {n}"}, headers=auth_headers).json()
+        for g in range(3):
+            client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": f"Group {g}"}, headers=auth_headers)
+    _warm(client, "/api/v1/boards/", auth_headers)
+    with assert_max_queries(3):
+        response = client.get("/api/v1/boards/", headers=auth_headers)
+    assert sum(len(b["groups"]) for b in response.json()) == 9
+    with assert_max_queries(3):
+        client.get(f"/api/v1/boards/{board['id']}", headers=auth_headers)
+
+
+def test_deleting_a_board_loads_its_tasks_in_bulk(client, auth_headers, assert_max_queries):
+    board = client.post("/api/v1/boards/", json={"name": "Doomed"}, headers=auth_headers).json()
+    for g in range(3):
+        group = client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": f"G{g}"}, headers=auth_headers).json()
+        for t in range(4):
+            client.post(
+                "/api/v1/tasks/",
+                json={"name": f"T{t}", "group_id": group["id"], "subtasks": [{"name": "S"}]},
+                headers=auth_headers,
+            )
+    _warm(client, "/api/v1/boards/", auth_headers)
+    # Board, groups, tasks, subtasks, focus sessions; the change counter,
+    # change log and board version; one DELETE per table; the tasks' history
+    with assert_max_queries(13) as statements:
+        assert client.delete(f"/api/v1/boards/{board['id']}", headers=auth_headers).status_code == 204
+    assert not [s for s in statements if s.startswith("SELECT tasks.id")]
+    assert client.get("/api/v1/tasks/", headers=auth_headers).json() == []
+
+
+def test_achievements(client, auth_headers, user, assert_max_queries):
+    db = SessionLocal()
+    suffix = uuid.uuid4().hex[:8]
+    achievements = [
+        Achievement(
+            name=f"Badge {suffix}-{n}", description="Earned", criteria_type="tasks_completed", criteria_value=n
+        )
+        for n in range(4)
+    ]
+    db.add_all(achievements)
+    db.flush()
+    db.add_all([UserAchievement(user_id=user.id, achievement_id=a.id) for a in achievements])
+    db.commit()
+    db.close()
+
+    _warm(client, "/api/v1/gamification/achievements", auth_headers)
+    with assert_max_queries(2):
+        response = client.get("/api/v1/gamification/achievements", headers=auth_headers)
+    assert len(response.json()) == 4
+    assert all(item["achievement"]["name"] for item in response.json())
+
+
+def test_teams(client, auth_headers, assert_max_queries):
+    db = SessionLocal()
+    emails = [f"member-{uuid.uuid4().hex[:12]}@example.com" for _ in range(3)]
+    db.add_all([User(email=email, hashed_password="x") for email in emails])
+    db.commit()
+    db.close()
+
+    for n in range(3):
+        team = client.post("/api/v1/teams/", json={"name": f"Team {n}"}, headers=auth_headers).json()
+        for email in emails:
+            client.post(f"/api/v1/teams/{team['id']}/members", json={"email": email}, headers=auth_headers)
+
+    _warm(client, "/api/v1/teams/", auth_headers)
+    # Teams, members, member users
+    with assert_max_queries(3):
+        response = client.get("/api/v1/teams/", headers=auth_headers)
+    teams = response.json()
+    assert len(teams) == 3
+    assert all(len(team["members"]) == 4 and all(m["user_email"] for m in team["members"]) for team in teams)
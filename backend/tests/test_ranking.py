@@ -0,0 +1,170 @@
+import random
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.ranking import key_between, keys_between
+from app.core.security import create_access_token
+from app.models.task import Task
+from app.models.user import User
+
+
+def test_key_between_keeps_order():
+    rng = random.Random(7)
+    keys = [key_between(None, None)]
+    for _ in range(2000):
+        n = rng.randrange(len(keys) + 1)
+        key = key_between(keys[n - 1] if n else None, keys[n] if n < len(keys) else None)
+        keys.insert(n, key)
+        assert not key.endswith("0")
+    assert keys == sorted(keys) and len(set(keys)) == len(keys)
+
+
+def test_key_between_edges():
+    assert key_between(None, None) == "a0"
+    assert key_between("a0", None) == "a1"
+    assert key_between("az", None) == "b00"
+    assert key_between(None, "a0") == "9z"
+    assert key_between(None, "90") == "8zz"
+    assert key_between("a0", "a1") == "a0i"
+    assert key_between("a0", "a0i") == "a09"
+    with pytest.raises(ValueError):
+        key_between("a1", "a0")
+
+
+def test_keys_stay_short():
+    appended = keys_between(None, None, 1332)
+    assert appended == sorted(appended) and max(map(len, appended)) == 3
+    prepended = [None]
+    for _ in range(100):
+        prepended.insert(0, key_between(None, prepended[0]))
+    assert prepended[:-1] == sorted(prepended[:-1]) and max(map(len, prepended[:-1])) == 3
+    between = keys_between("a0", "a1", 100)
+    assert between == sorted(between) and "a0" < between[0] and between[-1] < "a1"
+    assert max(map(len, between)) <= 5
+
+
+@pytest.fixture
+def board(client, auth_headers):
+    board = client.post("/api/v1/boards/", json={"name": "Ranked"}, headers=auth_headers).json()
+    url = f"/api/v1/boards/{board['id']}"
+    groups = [
+        client.post(f"{url}/groups", json={"name": name}, headers=auth_headers).json() for name in ("To do", "Done")
+    ]
+    tasks = [
+        client.post("/api/v1/tasks/", json={"name": f"Task {n}", "group_id": groups[0]["id"]}, headers=auth_headers).json()
+        for n in range(4)
+    ]
+    return {"snapshot": f"{url}/snapshot", "groups": groups, "tasks": tasks}
+
+
+def _names(client, board, headers):
+    groups = client.get(board["snapshot"], headers=headers).json()["groups"]
+    return {group["name"]: [task["name"] for task in group["tasks"]] for group in groups}
+
+
+def test_new_rows_go_last(client, auth_headers, board):
+    assert [g["name"] for g in client.get(board["snapshot"], headers=auth_headers).json()["groups"]] == ["To do", "Done"]
+    assert _names(client, board, auth_headers)["To do"] == ["Task 0", "Task 1", "Task 2", "Task 3"]
+
+
+def test_move_writes_one_row(client, auth_headers, board, assert_max_queries):
+    first, second, third, _ = board["tasks"]
+    # Task (and subtasks), neighbours, change counter, board, board version, the UPDATE, change log, reload (2)
+    with assert_max_queries(10) as statements:
+        response = client.post(
+            f"/api/v1/tasks/{third['id']}/move",
+            json={"after_id": first["id"], "before_id": second["id"]},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    assert first["position"] < response.json()["position"] < second["position"]
+    updates = [s for s in statements if s.startswith("UPDATE tasks")]
+    assert len(updates) == 1
+    assert _names(client, board, auth_headers)["To do"] == ["Task 0", "Task 2", "Task 1", "Task 3"]
+
+
+def test_move_to_another_group(client, auth_headers, board):
+    todo, done = board["groups"]
+    tasks = board["tasks"]
+    client.post(f"/api/v1/tasks/{tasks[0]['id']}/move", json={"group_id": done["id"]}, headers=auth_headers)
+    client.post(
+        f"/api/v1/tasks/{tasks[1]['id']}/move", json={"group_id": done["id"], "before_id": tasks[0]["id"]},
+        headers=auth_headers,
+    )
+    # To the top of its own group: only a before_id
+    client.post(f"/api/v1/tasks/{tasks[3]['id']}/move", json={"before_id": tasks[2]["id"]}, headers=auth_headers)
+    assert _names(client, board, auth_headers) == {"To do": ["Task 3", "Task 2"], "Done": ["Task 1", "Task 0"]}
+
+    # PATCHing group_id appends to the new group
+    client.patch(f"/api/v1/tasks/{tasks[3]['id']}", json={"group_id": done["id"]}, headers=auth_headers)
+    assert _names(client, board, auth_headers)["Done"] == ["Task 1", "Task 0", "Task 3"]
+
+
+def test_move_rejects_bad_neighbours(client, auth_headers, board):
+    todo, done = board["groups"]
+    first, second = board["tasks"][:2]
+    url = f"/api/v1/tasks/{first['id']}/move"
+    for body in (
+        {"after_id": first["id"]},
+        {"group_id": done["id"], "after_id": second["id"]},
+        {"after_id": board["tasks"][3]["id"], "before_id": second["id"]},
+    ):
+        assert client.post(url, json=body, headers=auth_headers).status_code == 400
+    assert client.post(url, json={"group_id": 999999}, headers=auth_headers).status_code == 404
+
+    loose = client.post("/api/v1/tasks/", json={"name": "Loose"}, headers=auth_headers).json()
+    assert loose["position"] is None
+    assert client.post(f"/api/v1/tasks/{loose['id']}/move", json={}, headers=auth_headers).status_code == 400
+
+
+def test_move_group(client, auth_headers, board):
+    todo, done = board["groups"]
+    response = client.post(f"/api/v1/boards/groups/{done['id']}/move", json={"before_id": todo["id"]}, headers=auth_headers)
+    assert response.status_code == 200 and response.json()["position"] < todo["position"]
+    assert [g["name"] for g in client.get(board["snapshot"], headers=auth_headers).json()["groups"]] == ["Done", "To do"]
+
+
+def test_deprecated_group_order_follows_positions(client, auth_headers, board):
+    todo, done = board["groups"]
+    url = board["snapshot"].rsplit("/", 1)[0]
+    assert [(g["name"], g["order"]) for g in client.get(f"{url}/groups", headers=auth_headers).json()] == [
+        ("To do", 0), ("Done", 1),
+    ]
+    # Older clients still reorder with `order`, an index on the board
+    first = client.post(f"{url}/groups", json={"name": "Backlog", "order": 0}, headers=auth_headers).json()
+    assert first["order"] == 0
+    response = client.patch(f"/api/v1/boards/groups/{done['id']}", json={"order": 1}, headers=auth_headers)
+    assert response.status_code == 200 and response.json()["order"] == 1
+    assert [(g["name"], g["order"]) for g in client.get(board["snapshot"], headers=auth_headers).json()["groups"]] == [
+        ("Backlog", 0), ("Done", 1), ("To do", 2),
+    ]
+
+
+def test_tasks_cannot_join_foreign_groups(client, board, user):
+    db = SessionLocal()
+    stranger = User(email=f"ranked-stranger-{user.id}@example.com", hashed_password="x")
+    db.add(stranger)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(stranger.id)})}"}
+    db.close()
+
+    theirs = client.post("/api/v1/tasks/", json={"name": "Theirs"}, headers=headers).json()
+    response = client.patch(f"/api/v1/tasks/{theirs['id']}", json={"group_id": board["groups"][0]["id"]}, headers=headers)
+    assert response.status_code == 404
+    with SessionLocal() as db:
+        task = db.get(Task, theirs["id"])
+        assert (task.group_id, task.position) == (None, None)
+
+
+def test_long_keys_are_rebalanced(client, auth_headers, board, monkeypatch):
+    monkeypatch.setattr(settings, "RANK_REBALANCE_LENGTH", 3)
+    first, second, third, fourth = board["tasks"]
+    # Keep moving into the gap right after the first task
+    for task in (second, third, fourth, second, third, fourth, second, third):
+        client.post(f"/api/v1/tasks/{task['id']}/move", json={"after_id": first["id"]}, headers=auth_headers)
+    groups = client.get(board["snapshot"], headers=auth_headers).json()["groups"]
+    tasks = groups[0]["tasks"]
+    assert [t["name"] for t in tasks] == ["Task 0", "Task 2", "Task 1", "Task 3"]
+    assert max(len(t["position"]) for t in tasks) <= 3
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.database import SessionLocal
+from app.core.realtime import BoardEventHub, LocalBroadcast, PostgresBroadcast, board_events
+from app.core.security import create_access_token
+from app.models.board import Board
+from app.models.team import Team, TeamMember
+from app.models.user import User
+
+
+@pytest.fixture
+def token(user):
+    return create_access_token(data={"sub": str(user.id)})
+
+
+@pytest.fixture
+def board(client, auth_headers):
+    return client.post("/api/v1/boards/", json={"name": "Live"}, headers=auth_headers).json()
+
+
+def _url(board_id, token):
+    return f"/api/v1/ws/boards/{board_id}?token={token}"
+
+
+def _changes(event):
+    return [(c["entity"], c["op"]) for c in event["changes"]]
+
+
+def test_subscribe_and_receive_changes(client, auth_headers, token, board):
+    base = f"/api/v1/boards/{board['id']}"
+    with client.websocket_connect(_url(board["id"], token)) as ws:
+        subscribed = ws.receive_json()
+        assert subscribed == {"type": "subscribed", "board_id": board["id"], "version": subscribed["version"]}
+
+        group = client.post(f"{base}/groups", json={"name": "Doing"}, headers=auth_headers).json()
+        event = ws.receive_json()
+        assert event["type"] == "board.changed" and event["version"] > subscribed["version"]
+        assert ("group", "created") in _changes(event)
+
+        task = client.post(
+            "/api/v1/tasks/", json={"name": "Ship", "group_id": group["id"]}, headers=auth_headers
+        ).json()
+        assert {"entity": "task", "id": task["id"], "op": "created"} in ws.receive_json()["changes"]
+
+        client.patch(f"/api/v1/tasks/{task['id']}", json={"status": "done"}, headers=auth_headers)
+        updated = ws.receive_json()
+        assert {"entity": "task", "id": task["id"], "op": "updated"} in updated["changes"]
+
+        # The event's version is the snapshot's
+        assert client.get(f"{base}/snapshot", headers=auth_headers).json()["version"] == updated["version"]
+
+
+def test_bulk_writes_are_published(client, auth_headers, token, board):
+    group = client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": "Todo"}, headers=auth_headers).json()
+    with client.websocket_connect(_url(board["id"], token)) as ws:
+        ws.receive_json()
+        created = client.post("/api/v1/tasks/bulk", json={"tasks": [
+            {"name": "A", "group_id": group["id"], "subtasks": [{"name": "Step"}]},
+            {"name": "Loose"},
+        ]}, headers=auth_headers).json()["results"]
+        assert sorted(_changes(ws.receive_json())) == [("subtask", "created"), ("task", "created")]
+
+        client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": [r["id"] for r in created]}, headers=auth_headers)
+        assert sorted(_changes(ws.receive_json())) == [("subtask", "deleted"), ("task", "deleted")]
+
+
+def test_large_changes_become_resync(client, auth_headers, token, board, monkeypatch):
+    monkeypatch.setattr(board_events, "max_changes", 2)
+    group = client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": "Todo"}, headers=auth_headers).json()
+    with client.websocket_connect(_url(board["id"], token)) as ws:
+        ws.receive_json()
+        client.post("/api/v1/tasks/bulk", json={
+            "tasks": [{"name": str(n), "group_id": group["id"]} for n in range(3)]
+        }, headers=auth_headers)
+        event = ws.receive_json()
+        assert event["type"] == "resync" and "changes" not in event
+
+
+def test_board_delete_closes_the_socket(client, auth_headers, token, board):
+    with client.websocket_connect(_url(board["id"], token)) as ws:
+        ws.receive_json()
+        client.delete(f"/api/v1/boards/{board['id']}", headers=auth_headers)
+        assert ("board", "deleted") in _changes(ws.receive_json())
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_json()
+
+
+def test_rejects_missing_token_and_other_users(client, board):
+    db = SessionLocal()
+    stranger = User(email=f"ws-stranger-{board['id']}@example.com", hashed_password="x")
+    db.add(stranger)
+    db.commit()
+    stranger_token = create_access_token(data={"sub": str(stranger.id)})
+    db.close()
+
+    for url in (f"/api/v1/ws/boards/{board['id']}", _url(board["id"], stranger_token), _url(999999, stranger_token)):
+        with pytest.raises(WebSocketDisconnect) as closed:
+            with client.websocket_connect(url) as ws:
+                ws.receive_json()
+        assert closed.value.code == 1008
+
+
+def test_team_members_may_subscribe(client, user):
+    db = SessionLocal()
+    member = User(email=f"ws-member-{user.id}@example.com", hashed_password="x")
+    team = Team(name="Crew")
+    db.add_all([member, team])
+    db.flush()
+    db.add(TeamMember(team_id=team.id, user_id=member.id))
+    board = Board(name="Shared", user_id=user.id, team_id=team.id)
+    db.add(board)
+    db.commit()
+    board_id, member_id = board.id, member.id
+    db.close()
+
+    with client.websocket_connect(_url(board_id, create_access_token(data={"sub": str(member_id)}))) as ws:
+        assert ws.receive_json()["type"] == "subscribed"
+
+
+def test_removed_members_cannot_subscribe_with_stale_claims(client, board):
+    db = SessionLocal()
+    team = Team(name="Former crew")
+    former = User(email=f"ws-former-{board['id']}@example.com", hashed_password="x")
+    db.add_all([team, former])
+    db.flush()
+    db.get(Board, board["id"]).team_id = team.id
+    db.commit()
+    token = create_access_token(data={"sub": str(former.id), "active": True, "su": False, "teams": {str(team.id): "member"}})
+    db.close()
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(_url(board["id"], token)) as ws:
+            ws.receive_json()
+    assert closed.value.code == 1008
+
+
+def test_slow_subscriber_gets_a_resync():
+    hub = BoardEventHub(LocalBroadcast(), queue_size=2)
+
+    async def scenario():
+        async with hub.subscribe(7) as queue, hub.subscribe(8) as other:
+            for version in range(1, 5):
+                hub.publish(7, version, [{"entity": "task", "id": version, "op": "updated"}])
+            await asyncio.sleep(0.01)
+            events = [queue.get_nowait() for _ in range(queue.qsize())]
+            assert other.empty()
+        await hub.close()
+        return events
+
+    events = asyncio.run(scenario())
+    assert events[0] == {"type": "resync", "board_id": 7, "version": 3}
+    assert events[-1]["version"] == 4
+    assert hub.stats()["resyncs"] == 1 and hub.stats()["subscribers"] == 0
+
+
+def test_unstarted_hub_drops_events():
+    hub = BoardEventHub(LocalBroadcast())
+    hub.publish(1, 1, [])
+    assert hub.stats()["published"] == 0
+
+
+class _FakeConnection:
+    """A psycopg connection whose notifies() yields `payloads`, then drops (or waits, if `last`)."""
+
+    def __init__(self, payloads, last=False):
+        self.payloads = payloads
+        self.last = last
+        self.closed = False
+        self.executed = []
+
+    async def execute(self, query, params=None):
+        self.executed.append(query)
+
+    async def notifies(self):
+        for payload in self.payloads:
+            yield SimpleNamespace(payload=payload)
+        if self.last:
+            await asyncio.Event().wait()
+        raise OSError("server closed the connection unexpectedly")
+
+    async def close(self):
+        self.closed = True
+
+
+def test_postgres_listener_reconnects_after_a_drop(caplog):
+    event = '{"board_id": 7, "version": %d, "type": "board.changed", "changes": []}'
+    listeners = [
+        _FakeConnection([event % 1]),
+        _FakeConnection([event % 2], last=True),
+    ]
+    # Publisher, first listener, a failed reconnect attempt, second listener
+    connections = [_FakeConnection([]), listeners[0], OSError("connection refused"), listeners[1]]
+
+    async def connect():
+        connection = connections.pop(0)
+        if isinstance(connection, Exception):
+            raise connection
+        return connection
+
+    backend = PostgresBroadcast("postgresql+psycopg://localhost/planner")
+    backend.RETRY_INITIAL = 0.01
+    backend._connect = connect
+    hub = BoardEventHub(backend)
+
+    async def scenario():
+        async with hub.subscribe(7) as queue:
+            received = [await asyncio.wait_for(queue.get(), 2) for _ in range(3)]
+        await hub.close()
+        return received
+
+    with caplog.at_level(logging.WARNING, logger="app.core.realtime"):
+        received = asyncio.run(scenario())
+    assert [(e["type"], e["version"]) for e in received] == [("board.changed", 1), ("resync", None), ("board.changed", 2)]
+    assert all(listener.executed == ["LISTEN board_events"] for listener in listeners)
+    assert listeners[0].closed
+    assert "Board event listener lost" in caplog.text
@@ -0,0 +1,75 @@
+import time
+
+from sqlalchemy import text
+
+from app.api import deps
+from app.core import replicas
+from app.core.replicas import PIN_COOKIE, PIN_HEADER, ReplicaRouter
+
+
+def _database_name(session):
+    return session.execute(text("PRAGMA database_list")).fetchone()[2]
+
+
+def test_reads_rotate_over_replicas_and_fall_back(tmp_path):
+    """Round-robin over replicas, skipping one that cannot connect."""
+    healthy = tmp_path / "replica.db"
+    broken = tmp_path / "missing-dir" / "replica.db"
+    router = ReplicaRouter(
+        [f"sqlite:///{healthy}", f"sqlite:///{broken}"],
+        retry_seconds=60,
+    )
+
+    names = set()
+    for _ in range(3):
+        session = router.read_session()
+        names.add(_database_name(session))
+        session.close()
+
+    assert names == {str(healthy)}
+    # The broken replica is skipped until its retry window passes
+    assert router._healthy_replicas() == [0]
+
+
+def test_pinned_client_reads_from_primary(tmp_path):
+    replica = tmp_path / "replica.db"
+    router = ReplicaRouter([f"sqlite:///{replica}"], read_your_writes_seconds=60)
+
+    session = router.read_session(pin=str(time.time() + 30))
+    assert _database_name(session) != str(replica)
+    session.close()
+
+    # Expired, unparseable, or farther out than any pin this router hands out
+    for pin in (None, str(time.time() - 1), "soon", str(time.time() + 3600)):
+        session = router.read_session(pin=pin)
+        assert _database_name(session) == str(replica)
+        session.close()
+
+
+def test_writes_pin_the_client(client, auth_headers, monkeypatch, tmp_path):
+    router = ReplicaRouter([f"sqlite:///{tmp_path / 'replica.db'}"], read_your_writes_seconds=60)
+    monkeypatch.setattr(replicas, "replica_router", router)
+    monkeypatch.setattr(deps, "replica_router", router)
+
+    response = client.post(
+        "/api/v1/tasks/", json={"name": "Pinned", "subtasks": [{"name": "One"}]}, headers=auth_headers
+    )
+    assert response.status_code == 201
+    assert router.is_pinned(response.headers[PIN_HEADER])
+    cookies = [c for c in response.headers.get_list("set-cookie") if c.startswith(f"{PIN_COOKIE}=")]
+    assert len(cookies) == 1
+
+    # The cookie comes back, so the (empty) replica is not used: the new task is there
+    listed = client.get("/api/v1/tasks/", headers=auth_headers)
+    assert "Pinned" in [task["name"] for task in listed.json()]
+    client.cookies.clear()
+
+    # Reads do not pin
+    assert PIN_HEADER not in client.get("/api/v1/auth/me", headers=auth_headers).headers
+
+
+def test_history_endpoints_read_without_replicas(client, auth_headers):
+    """With no replicas configured, read endpoints are served by the primary."""
+    assert client.get("/api/v1/history/tasks", headers=auth_headers).status_code == 200
+    assert client.get("/api/v1/history/daily-stats", headers=auth_headers).status_code == 200
+    assert client.get("/api/v1/gamification/summary", headers=auth_headers).status_code == 200
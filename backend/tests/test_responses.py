@@ -0,0 +1,85 @@
+from datetime import date, datetime, timezone
+from typing import List
+
+import orjson
+import pytest
+from pydantic import TypeAdapter
+
+from app.core import responses
+from app.core.responses import serialize_rows
+from app.models.task import Subtask, Task
+from app.models.task_history import TaskHistory
+from app.schemas.gamification import TaskHistoryResponse
+from app.schemas.task import TaskResponse
+
+
+def _validated_json(rows, schema):
+    adapter = TypeAdapter(List[schema])
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def test_rows_serialize_like_the_response_model():
+    now = datetime(2026, 10, 17, 9, 30, 0, 120000, tzinfo=timezone.utc)
+    naive = datetime(2026, 10, 17, 9, 30)
+    task = Task(
+        id=1, name="Write report", description=None, status="done", priority="high",
+        date=date(2026, 10, 17), estimated_time=30, actual_time=None, points_value=5,
+        user_id=7, group_id=None, completed_at=now, created_at=naive, updated_at=naive,
+    )
+    task.subtasks = [
+        Subtask(id=3, name="Outline", is_done=True, order=0, task_id=1, created_at=now, updated_at=now),
+    ]
+    history = TaskHistory(
+        id=2, task_id=1, user_id=7, event_type="completed", old_status="in_progress",
+        new_status="done", changes={"status": {"old": "in_progress", "new": "done"}}, notes=None, created_at=now,
+    )
+
+    for rows, schema in (([task], TaskResponse), ([history], TaskHistoryResponse)):
+        fast = orjson.dumps(serialize_rows(rows, schema), option=responses._ORJSON_OPTIONS)
+        assert orjson.loads(fast) == orjson.loads(_validated_json(rows, schema))
+        # Byte for byte, including datetime formatting
+        assert fast == _validated_json(rows, schema)
+
+
+def test_task_list_items_match_task_detail(client, auth_headers):
+    created = client.post(
+        "/api/v1/tasks/",
+        json={"name": "Dated", "date": "2026-10-17", "subtasks": [{"name": "One"}, {"name": "Two", "order": 1}]},
+        headers=auth_headers,
+    ).json()
+    client.post("/api/v1/tasks/", json={"name": "Undated"}, headers=auth_headers)
+
+    response = client.get("/api/v1/tasks/", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    listed = {task["id"]: task for task in response.json()}
+    assert listed[created["id"]] == client.get(f"/api/v1/tasks/{created['id']}", headers=auth_headers).json()
+    assert listed[created["id"]]["date"] == "2026-10-17"
+
+
+def test_board_and_plan_lists_match_detail(client, auth_headers):
+    board = client.post("/api/v1/boards/", json={"name": "Listed"}, headers=auth_headers).json()
+    client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": "To Do"}, headers=auth_headers)
+    boards = client.get("/api/v1/boards/", headers=auth_headers).json()
+    assert boards == [client.get(f"/api/v1/boards/{board['id']}", headers=auth_headers).json()]
+
+    client.post("/api/v1/plans/", json={"date": "2026-10-17", "sleep_time": 7.5}, headers=auth_headers)
+    plans = client.get("/api/v1/plans/", headers=auth_headers).json()
+    assert plans == [client.get("/api/v1/plans/2026-10-17", headers=auth_headers).json()]
+
+
+def test_msgpack_falls_back_to_json_when_unavailable(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(responses, "_msgpack", lambda: None)
+    response = client.get("/api/v1/tasks/", headers={**auth_headers, "Accept": "application/msgpack"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "Accept" in response.headers["vary"]
+
+
+def test_msgpack_is_negotiated(client, auth_headers):
+    msgpack = pytest.importorskip("msgpack")
+    client.post("/api/v1/tasks/", json={"name": "Packed", "date": "2026-10-17"}, headers=auth_headers)
+
+    response = client.get("/api/v1/tasks/", headers={**auth_headers, "Accept": "application/msgpack"})
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == client.get("/api/v1/tasks/", headers=auth_headers).json()
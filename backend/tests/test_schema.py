@@ -0,0 +1,146 @@
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.database import Base, engine as app_engine
+from app.core.schema import (
+    ALEMBIC_INI,
+    SchemaVersionError,
+    check_schema_version,
+    get_head_revisions,
+)
+from app.main import app
+
+
+def test_test_database_is_at_head():
+    check_schema_version(app_engine)
+
+
+def test_baseline_matches_models():
+    """Every model table and column exists in the migrated database."""
+    inspector = inspect(app_engine)
+    assert set(Base.metadata.tables) <= set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert {column.name for column in table.columns} <= columns
+
+
+def test_unmigrated_database_is_rejected(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/empty.db")
+    with pytest.raises(SchemaVersionError, match="no schema version"):
+        check_schema_version(engine)
+
+
+def test_outdated_database_is_rejected(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/old.db")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES ('0000')"))
+    with pytest.raises(SchemaVersionError, match="expected"):
+        check_schema_version(engine)
+
+
+def test_downgrade_and_upgrade_round_trip(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/roundtrip.db")
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        command.downgrade(config, "base")
+        assert inspect(connection).get_table_names() == ["alembic_version"]
+        command.upgrade(config, "head")
+    check_schema_version(engine)
+    assert get_head_revisions()
+
+
+def test_startup_runs_schema_check():
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+
+
+def test_unique_indexes_merge_existing_duplicates(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/duplicates.db")
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0005")
+        # Foreign keys are not enforced on this plain engine; no parent rows needed
+        for _ in range(2):
+            connection.execute(text("INSERT INTO plans (user_id, date) VALUES (1, '2026-01-01')"))
+            connection.execute(text("INSERT INTO team_members (team_id, user_id, role) VALUES (1, 1, 'member')"))
+        for created, rate in ((2, 40), (3, 75)):
+            connection.execute(text(
+                "INSERT INTO daily_stats (user_id, date, tasks_created, tasks_completed, tasks_postponed, "
+                "focus_sessions_count, total_focus_minutes, completed_focus_sessions, xp_earned, "
+                "achievements_unlocked, completion_rate, daily_goal_met) "
+                f"VALUES (1, '2026-01-01', {created}, 1, 0, 0, 0, 0, 10, 0, {rate}, 0)"
+            ))
+        command.upgrade(config, "head")
+
+        assert connection.execute(text("SELECT COUNT(*) FROM plans")).scalar() == 1
+        assert connection.execute(text("SELECT COUNT(*) FROM team_members")).scalar() == 1
+        stats = connection.execute(text(
+            "SELECT tasks_created, tasks_completed, xp_earned, completion_rate FROM daily_stats"
+        )).all()
+        assert stats == [(5, 2, 20, 75)]
+        with pytest.raises(Exception, match="UNIQUE"):
+            connection.execute(text("INSERT INTO plans (user_id, date) VALUES (1, '2026-01-01')"))
+
+
+def test_change_log_is_backfilled(tmp_path):
+    from app.models.board import Board
+    from app.models.task import Subtask, Task
+    from app.models.user import User
+
+    engine = create_engine(f"sqlite:///{tmp_path}/backfill.db")
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0006")
+        connection.execute(User.__table__.insert().values(id=1, email="a@example.com", hashed_password="x"))
+        connection.execute(Board.__table__.insert().values(id=1, name="Board", user_id=1))
+        # groups.order was replaced in 0008
+        connection.execute(text('INSERT INTO groups (id, name, color, "order", board_id) VALUES (1, \'Group\', \'#579bfc\', 0, 1)'))
+        connection.execute(Task.__table__.insert().values(id=1, name="Task", user_id=1, group_id=1))
+        connection.execute(Subtask.__table__.insert().values(id=1, name="Subtask", task_id=1))
+        command.upgrade(config, "head")
+
+        assert connection.execute(text("SELECT seq FROM change_counters WHERE user_id = 1")).scalar() == 1
+        entries = connection.execute(text("SELECT entity, entity_id, seq, deleted FROM change_log ORDER BY entity")).all()
+        assert entries == [("board", 1, 1, 0), ("group", 1, 1, 0), ("subtask", 1, 1, 0), ("task", 1, 1, 0)]
+
+
+def test_positions_are_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/positions.db")
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0007")
+        for statement in (
+            "INSERT INTO users (id, email, hashed_password, provider, is_active, is_superuser, email_verified, "
+            "created_at, updated_at) VALUES (1, 'a@example.com', 'x', 'local', 1, 0, 0, '2026-01-01', '2026-01-01')",
+            "INSERT INTO boards (id, name, user_id, version, created_at, updated_at) "
+            "VALUES (1, 'Board', 1, 0, '2026-01-01', '2026-01-01')",
+            'INSERT INTO groups (id, name, color, "order", board_id, created_at, updated_at) VALUES '
+            "(1, 'Done', 'c', 2, 1, '2026-01-01', '2026-01-01'), (2, 'To do', 'c', 1, 1, '2026-01-01', '2026-01-01')",
+            "INSERT INTO tasks (id, name, status, priority, points_value, user_id, group_id, created_at, updated_at) VALUES "
+            "(1, 'Newer', 'n', 'm', 0, 1, 2, '2026-01-02', '2026-01-02'), "
+            "(2, 'Older', 'n', 'm', 0, 1, 2, '2026-01-01', '2026-01-01'), "
+            "(3, 'Loose', 'n', 'm', 0, 1, NULL, '2026-01-01', '2026-01-01')",
+        ):
+            connection.execute(text(statement))
+        command.upgrade(config, "head")
+
+        groups = connection.execute(text("SELECT name FROM groups ORDER BY position")).scalars().all()
+        assert groups == ["To do", "Done"]
+        tasks = connection.execute(text("SELECT name, position IS NULL FROM tasks ORDER BY position")).all()
+        assert tasks == [("Loose", 1), ("Older", 0), ("Newer", 0)]
+
+        command.downgrade(config, "0007")
+        assert connection.execute(text('SELECT name, "order" FROM groups ORDER BY id')).all() == [("Done", 1), ("To do", 0)]
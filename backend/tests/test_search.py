@@ -0,0 +1,148 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.search import MAX_TERMS, hits, search_terms
+from app.core.security import create_access_token
+from app.models.task import Task
+
+URL = "/api/v1/tasks/search"
+
+
+@pytest.fixture
+def tasks(client, auth_headers):
+    created = {}
+    for body in (
+        {"name": "Write quarterly report", "description": "Numbers for the board"},
+        {"name": "Groceries", "description": "Milk, eggs and a report card folder"},
+        {"name": "Plan trip", "subtasks": [{"name": "Book hotel"}, {"name": "Report expenses"}]},
+        {"name": "Café visit"},
+    ):
+        task = client.post("/api/v1/tasks/", json={k: v for k, v in body.items() if k != "subtasks"}, headers=auth_headers).json()
+        for subtask in body.get("subtasks", []):
+            client.post(f"/api/v1/tasks/{task['id']}/subtasks", json=subtask, headers=auth_headers)
+        created[task["name"]] = task
+    return created
+
+
+def _search(client, headers, q, **params):
+    response = client.get(URL, params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200
+    return [task["name"] for task in response.json()]
+
+
+def test_search_terms():
+    assert search_terms("  Report, EXPENSES!") == ["report", "expenses"]
+    assert search_terms("\"*) OR (snake_case") == ["or", "snake", "case"]
+    assert len(search_terms("a " * 50)) == MAX_TERMS
+
+
+def test_matches_name_description_and_subtasks_by_rank(client, auth_headers, tasks):
+    # Name before subtask before description
+    assert _search(client, auth_headers, "report") == ["Write quarterly report", "Plan trip", "Groceries"]
+    assert _search(client, auth_headers, "hotel") == ["Plan trip"]
+    assert _search(client, auth_headers, "report expenses") == ["Plan trip"]
+    assert _search(client, auth_headers, "nothing") == []
+
+
+def test_prefixes_and_diacritics(client, auth_headers, tasks):
+    assert _search(client, auth_headers, "quart") == ["Write quarterly report"]
+    assert _search(client, auth_headers, "gro") == ["Groceries"]
+    assert _search(client, auth_headers, "cafe") == ["Café visit"]
+    assert _search(client, auth_headers, "rep ho") == ["Plan trip"]
+    assert _search(client, auth_headers, "!!!") == []
+    assert client.get(URL, params={"q": ""}, headers=auth_headers).status_code == 422
+
+
+def test_other_users_tasks_are_not_found(client, auth_headers, tasks):
+    from app.core.database import SessionLocal
+    from app.models.user import User
+
+    db = SessionLocal()
+    other = User(email=f"search-other-{tasks['Groceries']['id']}@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(other.id)})}"}
+    db.close()
+
+    assert _search(client, headers, "report") == []
+    client.post("/api/v1/tasks/", json={"name": "My report"}, headers=headers)
+    assert _search(client, headers, "report") == ["My report"]
+    assert "My report" not in _search(client, auth_headers, "report")
+
+
+def test_index_follows_writes(client, auth_headers, tasks):
+    trip = tasks["Plan trip"]
+    client.patch(f"/api/v1/tasks/{trip['id']}", json={"name": "Plan holiday"}, headers=auth_headers)
+    assert _search(client, auth_headers, "trip") == []
+    assert _search(client, auth_headers, "holiday") == ["Plan holiday"]
+
+    subtask = client.get(f"/api/v1/tasks/{trip['id']}", headers=auth_headers).json()["subtasks"][0]
+    client.patch(f"/api/v1/tasks/subtasks/{subtask['id']}", json={"name": "Book flights"}, headers=auth_headers)
+    assert _search(client, auth_headers, "hotel") == []
+    assert _search(client, auth_headers, "flights") == ["Plan holiday"]
+    client.delete(f"/api/v1/tasks/subtasks/{subtask['id']}", headers=auth_headers)
+    assert _search(client, auth_headers, "flights") == []
+
+    client.delete(f"/api/v1/tasks/{tasks['Groceries']['id']}", headers=auth_headers)
+    assert _search(client, auth_headers, "report") == ["Write quarterly report", "Plan holiday"]
+
+
+def test_index_follows_bulk_writes(client, auth_headers):
+    created = client.post("/api/v1/tasks/bulk", json={"tasks": [
+        {"name": "Bulk alpha", "subtasks": [{"name": "Nested zebra"}]},
+        {"name": "Bulk beta"},
+    ]}, headers=auth_headers).json()["results"]
+    assert _search(client, auth_headers, "zebra") == ["Bulk alpha"]
+
+    ids = [result["id"] for result in created]
+    client.patch("/api/v1/tasks/bulk", json={"tasks": [{"id": ids[1], "description": "striped zebra"}]}, headers=auth_headers)
+    assert _search(client, auth_headers, "zebra") == ["Bulk alpha", "Bulk beta"]
+
+    client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": ids}, headers=auth_headers)
+    assert _search(client, auth_headers, "zebra") == []
+
+
+def test_cursor_pagination(client, auth_headers):
+    client.post("/api/v1/tasks/bulk", json={"tasks": [
+        {"name": f"Sprint item {n}", "description": "sprint " * (n % 3)} for n in range(7)
+    ]}, headers=auth_headers)
+    everything = _search(client, auth_headers, "sprint", limit=50)
+    assert len(everything) == 7
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "sprint", "limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get(URL, params=params, headers=auth_headers)
+        seen += [task["name"] for task in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == everything
+
+    assert client.get(URL, params={"q": "sprint", "cursor": "nonsense"}, headers=auth_headers).status_code == 400
+
+
+def test_not_modified(client, auth_headers, tasks):
+    response = client.get(URL, params={"q": "report"}, headers=auth_headers)
+    etag = response.headers["ETag"]
+    again = client.get(URL, params={"q": "report"}, headers={**auth_headers, "If-None-Match": etag})
+    assert again.status_code == 304
+
+
+def test_search_query_budget(client, auth_headers, tasks, assert_max_queries):
+    # Change counter (ETag), the search, subtasks
+    with assert_max_queries(3):
+        assert client.get(URL, params={"q": "report"}, headers=auth_headers).status_code == 200
+
+
+def test_other_databases_fall_back_to_scans(tasks, user):
+    with SessionLocal() as db:
+        def search(q):
+            matches = hits("mysql", search_terms(q), user.id)
+            ranked = select(Task.name).join(matches, matches.c.id == Task.id).order_by(matches.c.rank.desc(), Task.id)
+            return db.scalars(ranked).all()
+
+        assert search("report") == ["Write quarterly report", "Plan trip", "Groceries"]
+        assert search("REP quart") == ["Write quarterly report"]
+        assert search("port") == []
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+from sqlalchemy import Column, Integer, create_engine, event, func, insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.database import engine as app_engine
+from app.core.sqlite import apply_sqlite_pragmas, serialize_sqlite_writes
+
+Base = declarative_base()
+
+
+class Counter(Base):
+    __tablename__ = "counters"
+    id = Column(Integer, primary_key=True)
+
+
+def test_app_engine_runs_in_wal_mode():
+    with app_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_writers_are_serialized_per_engine(tmp_path):
+    """A second session's flush waits until the first session's transaction ends."""
+    engine = create_engine(f"sqlite:///{tmp_path}/locks.db")
+    apply_sqlite_pragmas(engine, busy_timeout_ms=2000)
+    lock = serialize_sqlite_writes(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    first = Session()
+    first.add(Counter())
+    first.flush()
+    assert lock.locked()
+
+    flushed = threading.Event()
+
+    def second_writer():
+        session = Session()
+        session.add(Counter())
+        session.flush()
+        flushed.set()
+        session.commit()
+        session.close()
+
+    worker = threading.Thread(target=second_writer)
+    worker.start()
+    time.sleep(0.1)
+    assert not flushed.is_set()
+
+    first.commit()
+    first.close()
+    worker.join(timeout=5)
+
+    assert flushed.is_set()
+    assert not lock.locked()
+    with Session() as session:
+        assert session.query(Counter).count() == 2
+    engine.dispose()
+
+
+def test_async_writers_are_serialized(tmp_path):
+    """An AsyncSession's write waits on the event loop until the first writer commits."""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/async-locks.db")
+    apply_sqlite_pragmas(async_engine.sync_engine, busy_timeout_ms=2000)
+    lock = serialize_sqlite_writes(async_engine)
+    Session = async_sessionmaker(bind=async_engine)
+    order = []
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            order.append("insert")
+
+    async def first_writer(written):
+        async with Session() as session:
+            session.add(Counter())
+            await session.flush()
+            assert lock.locked()
+            written.set()
+            await asyncio.sleep(0.1)
+            order.append("first commit")
+            await session.commit()
+
+    async def second_writer(written):
+        await written.wait()
+        async with Session() as session:
+            # A Core statement, not only flushes, takes the lock
+            await session.execute(insert(Counter))
+            await session.commit()
+
+    async def run():
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        written = asyncio.Event()
+        await asyncio.gather(first_writer(written), second_writer(written))
+        assert not lock.locked()
+        async with Session() as session:
+            assert await session.scalar(select(func.count()).select_from(Counter)) == 2
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    # Without the lock the second INSERT would reach SQLite (and its busy handler) first
+    assert order == ["insert", "first commit", "insert"]
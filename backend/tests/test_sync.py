@@ -0,0 +1,110 @@
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.models.user import User
+
+URL = "/api/v1/sync/"
+
+
+def _sync(client, headers, since, **params):
+    response = client.get(URL, params={"since": since, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _ids(items):
+    return sorted(item["id"] for item in items)
+
+
+def test_first_sync_then_only_changes(client, auth_headers, assert_max_queries):
+    task = client.post("/api/v1/tasks/", json={"name": "Write", "subtasks": [{"name": "Draft"}]}, headers=auth_headers).json()
+    board = client.post("/api/v1/boards/", json={"name": "Board"}, headers=auth_headers).json()
+    group = client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": "To do"}, headers=auth_headers).json()
+    plan = client.post("/api/v1/plans/", json={"date": "2026-03-01", "work_time": 8}, headers=auth_headers).json()
+
+    # Change log, then one query per kind of row
+    with assert_max_queries(6):
+        first = _sync(client, auth_headers, 0)
+    assert not first["has_more"]
+    assert _ids(first["tasks"]) == [task["id"]]
+    assert "subtasks" not in first["tasks"][0]
+    assert _ids(first["subtasks"]) == [task["subtasks"][0]["id"]]
+    assert _ids(first["boards"]) == [board["id"]] and _ids(first["groups"]) == [group["id"]]
+    assert first["plans"][0]["work_time"] == 8
+
+    # Nothing new: empty lists and the same cursor
+    idle = _sync(client, auth_headers, first["cursor"])
+    assert idle["cursor"] == first["cursor"]
+    assert idle["tasks"] == idle["boards"] == [] and idle["deleted"]["tasks"] == []
+
+    client.patch(f"/api/v1/tasks/{task['id']}", json={"status": "done"}, headers=auth_headers)
+    client.patch(f"/api/v1/tasks/{task['id']}", json={"priority": "high"}, headers=auth_headers)
+    client.delete(f"/api/v1/tasks/subtasks/{task['subtasks'][0]['id']}", headers=auth_headers)
+    delta = _sync(client, auth_headers, first["cursor"])
+    assert delta["cursor"] > first["cursor"]
+    # Changed twice, sent once in its latest state
+    assert [(t["id"], t["status"], t["priority"]) for t in delta["tasks"]] == [(task["id"], "done", "high")]
+    assert delta["deleted"]["subtasks"] == [task["subtasks"][0]["id"]]
+    assert delta["boards"] == delta["plans"] == delta["subtasks"] == []
+
+
+def test_deletes_leave_tombstones(client, auth_headers):
+    board = client.post("/api/v1/boards/", json={"name": "Doomed"}, headers=auth_headers).json()
+    group = client.post(f"/api/v1/boards/{board['id']}/groups", json={"name": "G"}, headers=auth_headers).json()
+    task = client.post("/api/v1/tasks/", json={"name": "T", "group_id": group["id"], "subtasks": [{"name": "S"}]}, headers=auth_headers).json()
+    cursor = _sync(client, auth_headers, 0)["cursor"]
+
+    client.delete(f"/api/v1/boards/{board['id']}", headers=auth_headers)
+    deleted = _sync(client, auth_headers, cursor)["deleted"]
+    assert deleted["boards"] == [board["id"]]
+    assert deleted["groups"] == [group["id"]]
+    assert deleted["tasks"] == [task["id"]]
+    assert deleted["subtasks"] == [task["subtasks"][0]["id"]]
+
+
+def test_bulk_writes_are_synced(client, auth_headers):
+    created = client.post(
+        "/api/v1/tasks/bulk", json={"tasks": [{"name": "A", "subtasks": [{"name": "S"}]}, {"name": "B"}]}, headers=auth_headers
+    ).json()["results"]
+    ids = [result["id"] for result in created]
+    first = _sync(client, auth_headers, 0)
+    assert _ids(first["tasks"]) == ids and len(first["subtasks"]) == 1
+
+    client.patch("/api/v1/tasks/bulk", json={"tasks": [{"id": ids[1], "status": "done"}]}, headers=auth_headers)
+    assert [t["status"] for t in _sync(client, auth_headers, first["cursor"])["tasks"]] == ["done"]
+
+    client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": ids}, headers=auth_headers)
+    delta = _sync(client, auth_headers, first["cursor"])
+    assert delta["tasks"] == []
+    assert sorted(delta["deleted"]["tasks"]) == ids
+    assert delta["deleted"]["subtasks"] == [created[0]["task"]["subtasks"][0]["id"]]
+
+
+def test_pages_never_split_a_write(client, auth_headers):
+    for n in range(3):
+        client.post("/api/v1/tasks/", json={"name": f"Single {n}"}, headers=auth_headers)
+    # One write (one sequence number) with four rows, more than a page
+    client.post("/api/v1/tasks/", json={"name": "Big", "subtasks": [{"name": str(n)} for n in range(3)]}, headers=auth_headers)
+
+    seen, since, pages = [], 0, 0
+    while True:
+        page = _sync(client, auth_headers, since, limit=2)
+        seen += [("task", t["id"]) for t in page["tasks"]] + [("subtask", s["id"]) for s in page["subtasks"]]
+        since, pages = page["cursor"], pages + 1
+        if not page["has_more"]:
+            break
+    assert len(seen) == len(set(seen)) == 7
+    assert pages == 3
+
+
+def test_other_users_changes_are_not_synced(client, auth_headers, user):
+    client.post("/api/v1/tasks/", json={"name": "Private"}, headers=auth_headers)
+    db = SessionLocal()
+    other = User(email=f"sync-other-{user.id}@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(other.id)})}"}
+    db.close()
+    assert _sync(client, headers, 0) == {
+        "cursor": 0, "has_more": False, "tasks": [], "subtasks": [], "boards": [], "groups": [], "plans": [],
+        "deleted": {"tasks": [], "subtasks": [], "boards": [], "groups": [], "plans": []},
+    }
@@ -0,0 +1,45 @@
+def test_task_crud_with_subtasks(client, auth_headers):
+    """Tasks round-trip through the async endpoints with nested subtasks."""
+    response = client.post(
+        "/api/v1/tasks/",
+        json={"name": "Write report", "subtasks": [{"name": "Outline"}, {"name": "Draft", "order": 1}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    task = response.json()
+    assert [s["name"] for s in task["subtasks"]] == ["Outline", "Draft"]
+
+    response = client.patch(f"/api/v1/tasks/{task['id']}", json={"status": "done"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+    assert len(response.json()["subtasks"]) == 2
+
+    response = client.get("/api/v1/tasks/", headers=auth_headers)
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()] == [task["id"]]
+
+    response = client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/tasks/{task['id']}", headers=auth_headers).status_code == 404
+
+
+def test_tasks_require_authentication(client):
+    """Requests without credentials are rejected."""
+    assert client.get("/api/v1/tasks/").status_code == 401
+
+
+def test_board_with_groups(client, auth_headers):
+    """Boards are returned with their groups loaded eagerly."""
+    board = client.post("/api/v1/boards/", json={"name": "Sprint"}, headers=auth_headers).json()
+    assert board["groups"] == []
+
+    response = client.post(
+        f"/api/v1/boards/{board['id']}/groups",
+        json={"name": "To Do", "order": 0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+
+    response = client.get(f"/api/v1/boards/{board['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert [g["name"] for g in response.json()["groups"]] == ["To Do"]
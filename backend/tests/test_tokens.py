@@ -0,0 +1,143 @@
+import uuid
+
+from jose import jwt
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.principals import principal_cache
+from app.core.security import create_access_token
+from app.models.user import User
+
+
+def _claims(token: str) -> dict:
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def _signup_and_login(client) -> dict:
+    email = f"claims-{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/api/v1/auth/signup", json={"email": email, "password": "secret-pw"})
+    response = client.post("/api/v1/auth/login/json", json={"email": email, "password": "secret-pw"})
+    assert response.status_code == 200
+    return response.json()
+
+
+class _Statements:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+def test_login_issues_short_lived_token_with_claims(client):
+    tokens = _signup_and_login(client)
+
+    claims = _claims(tokens["access_token"])
+    assert claims["type"] == "access"
+    assert claims["active"] is True
+    assert claims["su"] is False
+    assert claims["teams"] == {}
+    assert tokens["expires_in"] == settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    assert _claims(tokens["refresh_token"])["type"] == "refresh"
+
+
+def test_team_roles_come_from_claims_after_refresh(client):
+    tokens = _signup_and_login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    team_id = client.post("/api/v1/teams/", json={"name": "Claims"}, headers=headers).json()["id"]
+
+    # Not in the token yet: the membership is looked up in the database
+    assert client.get(f"/api/v1/teams/{team_id}", headers=headers).status_code == 200
+
+    refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+    assert _claims(refreshed["access_token"])["teams"] == {str(team_id): "owner"}
+
+    statements = _Statements()
+    event.listen(engine, "before_cursor_execute", statements)
+    try:
+        headers = {"Authorization": f"Bearer {refreshed['access_token']}"}
+        assert client.get(f"/api/v1/teams/{team_id}", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", statements)
+    # No membership check: only the team itself (and its members for the response) are read
+    assert not any(s.startswith("SELECT team_members.role") for s in statements.statements)
+
+
+def test_missing_team_is_not_found(client, auth_headers):
+    tokens = _signup_and_login(client)
+    for headers in (auth_headers, {"Authorization": f"Bearer {tokens['access_token']}"}):
+        assert client.get("/api/v1/teams/999999", headers=headers).status_code == 404
+        response = client.post("/api/v1/teams/999999/members", json={"email": "x@example.com"}, headers=headers)
+        assert response.status_code == 404
+
+
+def test_managing_a_team_ignores_stale_claims(client, user):
+    tokens = _signup_and_login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    team_id = client.post("/api/v1/teams/", json={"name": "Stale"}, headers=headers).json()["id"]
+
+    # A token issued while `user` was still the team's owner
+    token = create_access_token(data={"sub": str(user.id), "active": True, "su": False, "teams": {str(team_id): "owner"}})
+    stale = {"Authorization": f"Bearer {token}"}
+    assert client.get(f"/api/v1/teams/{team_id}", headers=stale).status_code == 200
+    response = client.post(f"/api/v1/teams/{team_id}/members", json={"email": user.email}, headers=stale)
+    assert response.status_code == 403
+
+
+def test_inactive_claim_is_rejected_without_a_lookup(client, user):
+    token = create_access_token(data={"sub": str(user.id), "active": False, "su": False, "teams": {}})
+    response = client.get("/api/v1/tasks/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+def test_refresh_token_is_not_an_access_token(client):
+    tokens = _signup_and_login(client)
+    response = client.get("/api/v1/tasks/", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 401
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["access_token"]})
+    assert response.status_code == 401
+
+
+def test_password_reset_revokes_tokens(client):
+    tokens = _signup_and_login(client)
+    user_id = int(_claims(tokens["access_token"])["sub"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/v1/tasks/", headers=headers).status_code == 200
+
+    db = SessionLocal()
+    db.get(User, user_id).reset_token = f"reset-{user_id}"
+    db.commit()
+    db.close()
+    response = client.post(
+        "/api/v1/auth/reset-password",
+        json={"token": f"reset-{user_id}", "new_password": "another-pw"},
+    )
+    assert response.status_code == 200
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    # The access token goes too, not only at its expiry
+    assert client.get("/api/v1/tasks/", headers=headers).status_code == 401
+
+
+def test_deactivation_ends_access_tokens(client):
+    tokens = _signup_and_login(client)
+    user_id = int(_claims(tokens["access_token"])["sub"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/v1/tasks/", headers=headers).status_code == 200
+
+    db = SessionLocal()
+    db.get(User, user_id).is_active = False
+    db.commit()
+    db.close()
+    principal_cache.invalidate(user_id)
+    assert client.get("/api/v1/tasks/", headers=headers).status_code == 403
+
+
+def test_profile_endpoint_loads_the_user(client):
+    tokens = _signup_and_login(client)
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 200
+    assert response.json()["email"].startswith("claims-")
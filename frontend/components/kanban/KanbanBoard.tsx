@@ -140,7 +140,7 @@ export default function KanbanBoard() {
         try {
             await dispatch(createGroup({
                 boardId: currentBoard.id,
-                data: { name: newGroupName, order: groups.length }
+                data: { name: newGroupName }
             })).unwrap();
 
             setNewGroupName('');
@@ -102,7 +102,7 @@ export default function PolishedKanbanBoard() {
         try {
             await dispatch(createGroup({
                 boardId: currentBoard.id,
-                data: { name: newGroupName, order: groups.length }
+                data: { name: newGroupName }
             })).unwrap();
             setNewGroupName('');
             setIsNewGroupDialogOpen(false);
@@ -1,4 +1,4 @@
-import axios, { AxiosInstance, AxiosError } from 'axios';
+import axios, { AxiosInstance, AxiosError, InternalAxiosRequestConfig } from 'axios';
 import type {
     User,
     Token,
@@ -18,6 +18,7 @@ const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
 class ApiClient {
     private client: AxiosInstance;
+    private refreshing: Promise<string | null> | null = null;
 
     constructor() {
         this.client = axios.create({
@@ -42,7 +43,23 @@ class ApiClient {
         // Add response interceptor for error handling
         this.client.interceptors.response.use(
             (response) => response,
-            (error: AxiosError) => {
+            async (error: AxiosError) => {
+                const original = error.config as (InternalAxiosRequestConfig & { _retried?: boolean }) | undefined;
+                // Access tokens are short-lived: refresh once and replay the request
+                if (
+                    error.response?.status === 401 &&
+                    original &&
+                    !original._retried &&
+                    !original.url?.startsWith('/auth/login') &&
+                    !original.url?.startsWith('/auth/refresh')
+                ) {
+                    original._retried = true;
+                    const token = await this.refreshAccessToken();
+                    if (token) {
+                        original.headers.Authorization = `Bearer ${token}`;
+                        return this.client(original);
+                    }
+                }
                 // Don't automatically redirect on 401 - let components handle it
                 // This prevents race conditions during auth initialization
                 if (error.response?.status === 401) {
@@ -60,16 +77,41 @@ class ApiClient {
         return localStorage.getItem('access_token');
     }
 
-    setToken(token: string): void {
+    setToken(token: string, refreshToken?: string): void {
         if (typeof window !== 'undefined') {
             localStorage.setItem('access_token', token);
+            if (refreshToken) {
+                localStorage.setItem('refresh_token', refreshToken);
+            }
         }
     }
 
     clearToken(): void {
         if (typeof window !== 'undefined') {
             localStorage.removeItem('access_token');
+            localStorage.removeItem('refresh_token');
+        }
+    }
+
+    // Exchange the stored refresh token; concurrent 401s share one request
+    private refreshAccessToken(): Promise<string | null> {
+        if (typeof window === 'undefined') return Promise.resolve(null);
+        const refreshToken = localStorage.getItem('refresh_token');
+        if (!refreshToken) return Promise.resolve(null);
+
+        if (!this.refreshing) {
+            this.refreshing = this.client
+                .post<Token>('/auth/refresh', { refresh_token: refreshToken })
+                .then((response) => {
+                    this.setToken(response.data.access_token, response.data.refresh_token);
+                    return response.data.access_token;
+                })
+                .catch(() => null)
+                .finally(() => {
+                    this.refreshing = null;
+                });
         }
+        return this.refreshing;
     }
 
     // Auth endpoints
@@ -89,7 +131,7 @@ class ApiClient {
             },
         });
 
-        this.setToken(response.data.access_token);
+        this.setToken(response.data.access_token, response.data.refresh_token);
         return response.data;
     }
 
@@ -17,6 +17,8 @@ export interface User {
 export interface Token {
     access_token: string;
     token_type: string;
+    refresh_token?: string;
+    expires_in?: number;
 }
 
 export interface Subtask {
@@ -38,6 +40,7 @@ export interface Task {
     date?: string;
     user_id: number;
     group_id?: number;
+    position?: string;  // order within the group; compare as plain strings
     // Gamification fields
     estimated_time?: number;  // in minutes
     actual_time?: number;  // in minutes
@@ -52,7 +55,7 @@ export interface Group {
     id: number;
     name: string;
     color: string;
-    order: number;
+    position: string;  // order within the board; compare as plain strings
     board_id: number;
     created_at: string;
     updated_at: string;
@@ -122,7 +125,6 @@ export interface BoardCreateRequest {
 export interface GroupCreateRequest {
     name: string;
     color?: string;
-    order?: number;
 }
 
 export interface PlanCreateRequest {